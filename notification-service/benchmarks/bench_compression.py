@@ -0,0 +1,119 @@
+"""
+Бенчмарк сжатия ответов истории уведомлений
+
+Строит тело NotificationListResponse заданного размера и для каждого
+доступного алгоритма и уровня сжатия выводит размер, степень сжатия
+и процессорное время на одно тело. Показывает, сколько CPU стоит
+каждый сэкономленный байт и с какого размера ответа сжатие окупается
+(COMPRESSION_MIN_SIZE), а также сколько длится сжатие в event loop
+(COMPRESSION_OFFLOAD_SIZE). zstd и br измеряются, если установлены
+zstandard и brotli.
+
+Запуск:
+    python benchmarks/bench_compression.py --sizes 5 50 500 --repeat 200
+"""
+import argparse
+import gzip
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.compression import brotli, zstandard  # noqa: E402
+from models.notification import NotificationStatus, NotificationType  # noqa: E402
+from schemas.notification import (  # noqa: E402
+    NotificationListResponse,
+    NotificationResponse
+)
+
+
+def build_body(notifications: int, seed: int) -> bytes:
+    """JSON тело истории пользователя из notifications записей"""
+    rng = random.Random(seed)
+    created_at = datetime(2024, 1, 1, 12, 0, 0)
+    items = []
+    for index in range(notifications):
+        timestamp = created_at + timedelta(seconds=rng.randint(0, 86400 * 30))
+        items.append(NotificationResponse(
+            id=index + 1,
+            user_id=123,
+            message=f"Ваш код подтверждения: {rng.randint(1000, 9999)}",
+            type=rng.choice(list(NotificationType)),
+            status=rng.choice(list(NotificationStatus)),
+            created_at=timestamp,
+            updated_at=timestamp,
+            attempts=rng.randint(0, 3)
+        ))
+    return NotificationListResponse(
+        notifications=items, total=notifications
+    ).model_dump_json().encode()
+
+
+def codecs():
+    """Алгоритмы и уровни для сравнения"""
+    variants = [
+        (f"gzip-{level}", lambda data, level=level: gzip.compress(
+            data, compresslevel=level, mtime=0
+        ))
+        for level in (1, 6, 9)
+    ]
+    if zstandard is not None:
+        variants += [
+            (f"zstd-{level}", zstandard.ZstdCompressor(level=level).compress)
+            for level in (1, 3, 9)
+        ]
+    if brotli is not None:
+        variants += [
+            (f"br-{quality}", lambda data, quality=quality: brotli.compress(
+                data, quality=quality
+            ))
+            for quality in (1, 4, 9)
+        ]
+    return variants
+
+
+def cpu_per_call(compress, body: bytes, repeat: int) -> float:
+    """Процессорное время одного сжатия в микросекундах"""
+    start = time.process_time()
+    for _ in range(repeat):
+        compress(body)
+    return (time.process_time() - start) / repeat * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[5, 50, 500],
+        help="Количество уведомлений в ответе"
+    )
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if zstandard is None or brotli is None:
+        print("zstandard/brotli not installed: pip install .[compression]\n")
+
+    header = (
+        f"{'notifications':>13}{'codec':>9}{'bytes':>10}{'ratio':>8}"
+        f"{'cpu us':>10}{'MB/s':>9}{'us/KB saved':>13}"
+    )
+    print(header)
+    for notifications in args.sizes:
+        body = build_body(notifications, args.seed)
+        print(f"{notifications:>13}{'none':>9}{len(body):>10}{1.0:>8.2f}")
+        for name, compress in codecs():
+            compressed = len(compress(body))
+            cpu_us = cpu_per_call(compress, body, args.repeat)
+            saved_kb = (len(body) - compressed) / 1024
+            print(
+                f"{'':>13}{name:>9}{compressed:>10}{len(body) / compressed:>8.2f}"
+                f"{cpu_us:>10.1f}{len(body) / cpu_us:>9.1f}"
+                f"{cpu_us / saved_kb if saved_kb > 0 else float('inf'):>13.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Бенчмарк групповой фиксации (GROUP_COMMIT_ENABLED) создания уведомлений
+
+Конкурентные клиенты создают уведомления двумя способами: отдельной
+транзакцией с refresh на каждое (как POST /api/notifications по
+умолчанию) и через GroupCommitter. Транзакции выполняются в пуле
+потоков, как в обработчиках FastAPI. По умолчанию используется
+временная SQLite база; для PostgreSQL передайте --database-url.
+
+Запуск:
+    python benchmarks/bench_group_commit.py --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.settings import settings  # noqa: E402
+from core.database import db_manager  # noqa: E402
+from core.group_commit import GroupCommitter  # noqa: E402
+from models.notification import NotificationType  # noqa: E402
+from schemas.notification import NotificationCreate  # noqa: E402
+from services.notification_service import NotificationService  # noqa: E402
+from logger import logger  # noqa: E402
+
+
+def create_single(notification_data: NotificationCreate) -> int:
+    """Создание уведомления отдельной транзакцией"""
+    with db_manager.get_session() as session:
+        return NotificationService.create_notification(notification_data, session).id
+
+
+async def run_clients(create, requests: int, concurrency: int) -> float:
+    """Количество созданных уведомлений в секунду"""
+    queue = asyncio.Queue()
+    for index in range(requests):
+        queue.put_nowait(NotificationCreate(
+            user_id=index % 1000 + 1,
+            message=f"bench {index}",
+            type=NotificationType.TELEGRAM
+        ))
+
+    async def client() -> None:
+        while not queue.empty():
+            await create(queue.get_nowait())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def per_request(requests: int, concurrency: int) -> float:
+    async def create(notification_data: NotificationCreate) -> None:
+        await asyncio.to_thread(create_single, notification_data)
+
+    return await run_clients(create, requests, concurrency)
+
+
+async def grouped(requests: int, concurrency: int, max_delay: float) -> float:
+    committer = GroupCommitter(
+        NotificationService.create_notifications_batch,
+        max_delay=max_delay,
+        max_batch=settings.GROUP_COMMIT_MAX_BATCH
+    )
+    return await run_clients(committer.submit, requests, concurrency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-delay", type=float, default=settings.GROUP_COMMIT_MAX_DELAY)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+    if args.database_url:
+        settings.DATABASE_URL = args.database_url
+    else:
+        directory = tempfile.mkdtemp()
+        settings.SQLITE_DEFAULT_PATH = f"sqlite:///{directory}/bench.db"
+    db_manager.init()
+
+    print(f"{'variant':<28}{'creates/s':>12}")
+    for title, scenario in (
+        ("commit per request", per_request(args.requests, args.concurrency)),
+        (
+            f"group commit ({args.max_delay * 1000:g} ms)",
+            grouped(args.requests, args.concurrency, args.max_delay)
+        ),
+    ):
+        print(f"{title:<28}{asyncio.run(scenario):>12.0f}")
+    db_manager.close()
+
+
+if __name__ == "__main__":
+    main()
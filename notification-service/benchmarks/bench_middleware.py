@@ -0,0 +1,102 @@
+"""
+Бенчмарк накладных расходов middleware логирования запросов
+
+Сравнивает приложение без middleware, прежний вариант на
+@app.middleware("http") (BaseHTTPMiddleware) и RequestLoggingMiddleware
+с разной долей сэмплирования. Логи пишутся в /dev/null, чтобы измерять
+стоимость middleware, а не вывода.
+
+Запуск:
+    python benchmarks/bench_middleware.py --requests 5000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+
+from core.settings import settings  # noqa: E402
+from core.middleware import RequestLoggingMiddleware  # noqa: E402
+from logger import logger  # noqa: E402
+
+
+def build_app(variant: str) -> FastAPI:
+    """Создание тестового приложения с выбранным вариантом middleware"""
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if variant == "legacy":
+        @app.middleware("http")
+        async def log_requests(request: Request, call_next):
+            start_time = time.time()
+            logger.info(
+                f"Incoming request: {request.method} {request.url.path}",
+                extra={"method": request.method, "path": request.url.path}
+            )
+            response = await call_next(request)
+            process_time = time.time() - start_time
+            time_format = f".{settings.TIME_FORMAT_DECIMAL_PLACES}f"
+            logger.info(
+                f"Request completed: {request.method} {request.url.path} - "
+                f"Status: {response.status_code} - "
+                f"Time: {format(process_time, time_format)}s",
+                extra={"status_code": response.status_code}
+            )
+            return response
+    elif variant == "asgi":
+        app.add_middleware(RequestLoggingMiddleware)
+
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    """Среднее время обработки запроса в микросекундах"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(requests, 200)):
+            await client.get("/ping")
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/ping")
+        return (time.perf_counter() - start) / requests * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    for handler in logger.handlers:
+        if isinstance(handler, logging.StreamHandler):
+            handler.setStream(devnull)
+    logger.propagate = False
+
+    variants = [
+        ("no middleware", "none", 1.0),
+        ("legacy @app.middleware", "legacy", 1.0),
+        ("ASGI, sample=1.0", "asgi", 1.0),
+        ("ASGI, sample=0.01", "asgi", 0.01),
+    ]
+
+    baseline = None
+    print(f"{'variant':<28}{'us/request':>12}{'overhead us':>14}")
+    for title, variant, sample_rate in variants:
+        settings.LOG_REQUESTS_SAMPLE_RATE = sample_rate
+        per_request = asyncio.run(measure(build_app(variant), args.requests))
+        if baseline is None:
+            baseline = per_request
+        print(f"{title:<28}{per_request:>12.1f}{per_request - baseline:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Офлайн-прогон доставки уведомлений через симулятор провайдера
+
+Моделирует отправку N уведомлений пулом из C параллельных отправителей
+с retry политикой сервиса на виртуальных часах, без ожидания и без БД.
+При одинаковом --seed результат воспроизводится полностью, поэтому
+скрипт подходит для подбора параллелизма и количества попыток.
+
+Запуск:
+    python benchmarks/simulate_delivery.py --channel telegram --notifications 10000 \\
+        --concurrency 50 --seed 42 --distribution percentiles \\
+        --outage-probability 0.001 --outage-length 200 --rate-limit 300
+"""
+import argparse
+import heapq
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.settings import settings  # noqa: E402
+from models.notification import NotificationType  # noqa: E402
+from services.provider_simulator import (  # noqa: E402
+    LatencyDistribution,
+    ProviderSimulator,
+    SendOutcome
+)
+
+
+class VirtualClock:
+    """Виртуальные часы симуляции"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Перцентиль по отсортированному списку"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--channel", choices=[t.value for t in NotificationType],
+                        default="telegram")
+    parser.add_argument("--notifications", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--max-attempts", type=int, default=settings.RETRY_MAX_ATTEMPTS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--distribution", default="lognormal",
+                        choices=[d.value for d in LatencyDistribution])
+    parser.add_argument("--sigma", type=float, default=settings.PROVIDER_LATENCY_SIGMA)
+    parser.add_argument("--error-probability", type=float,
+                        default=settings.ERROR_PROBABILITY)
+    parser.add_argument("--outage-probability", type=float, default=0.0)
+    parser.add_argument("--outage-length", type=int, default=settings.PROVIDER_OUTAGE_LENGTH)
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="Лимит провайдера, запросов в секунду")
+    args = parser.parse_args()
+
+    notification_type = NotificationType(args.channel)
+    median_latency = (
+        settings.EMAIL_DELAY if notification_type == NotificationType.EMAIL
+        else settings.TELEGRAM_DELAY
+    )
+    clock = VirtualClock()
+    provider = ProviderSimulator(
+        name=args.channel,
+        median_latency=median_latency,
+        error_probability=args.error_probability,
+        distribution=LatencyDistribution(args.distribution),
+        latency_sigma=args.sigma,
+        tail_factors=(
+            settings.PROVIDER_LATENCY_P90_FACTOR,
+            settings.PROVIDER_LATENCY_P99_FACTOR,
+            settings.PROVIDER_LATENCY_P999_FACTOR,
+        ),
+        outage_probability=args.outage_probability,
+        outage_length=args.outage_length,
+        rate_limit_per_second=args.rate_limit,
+        rate_limit_retry_after=settings.PROVIDER_RATE_LIMIT_RETRY_AFTER,
+        seed=args.seed,
+        clock=clock
+    )
+
+    # Все уведомления поступают в момент 0, отправители берут их по очереди
+    workers = [0.0] * args.concurrency
+    heapq.heapify(workers)
+    completion_times = []
+    outcomes = {outcome: 0 for outcome in SendOutcome}
+    attempts_total = 0
+    delivered = 0
+
+    for _ in range(args.notifications):
+        now = heapq.heappop(workers)
+        for attempt in range(1, args.max_attempts + 1):
+            clock.now = now
+            result = provider.send()
+            outcomes[result.outcome] += 1
+            attempts_total += 1
+            now += result.latency + result.retry_after
+            if result.outcome == SendOutcome.DELIVERED:
+                delivered += 1
+                break
+        completion_times.append(now)
+        heapq.heappush(workers, now)
+
+    completion_times.sort()
+    makespan = max(workers)
+    print(f"channel={args.channel} notifications={args.notifications} "
+          f"concurrency={args.concurrency} seed={args.seed}")
+    print(f"delivered:          {delivered / args.notifications:.2%}")
+    print(f"provider calls:     {attempts_total} "
+          + " ".join(f"{o.value}={n}" for o, n in outcomes.items()))
+    print(f"attempts/notif:     {attempts_total / args.notifications:.3f}")
+    print(f"throughput:         {args.notifications / makespan:.1f} notif/s (virtual)")
+    print(f"completion time:    mean={statistics.fmean(completion_times):.3f}s "
+          f"p50={percentile(completion_times, 0.5):.3f}s "
+          f"p99={percentile(completion_times, 0.99):.3f}s "
+          f"max={completion_times[-1]:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Circuit breaker для каналов доставки уведомлений"""
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List
+
+from core.settings import settings
+from logger import logger
+
+
+class BreakerState(str, Enum):
+    """Состояние circuit breaker"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker на основе доли ошибок в скользящем окне
+
+    Окно разбито на корзины фиксированной длины, поэтому учет результата
+    и расчет доли ошибок выполняются за O(количество корзин) по памяти
+    и времени. В состоянии OPEN запросы не пропускаются, после
+    open_timeout breaker переходит в HALF_OPEN и пропускает ограниченное
+    число пробных запросов.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float,
+        minimum_calls: int,
+        window_seconds: float,
+        window_buckets: int,
+        open_timeout: float,
+        half_open_max_calls: int,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.bucket_width = window_seconds / window_buckets
+        self.window_buckets = window_buckets
+        self.open_timeout = open_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        # Корзины: [номер корзины, успехи, ошибки]
+        self._buckets: Deque[List[int]] = deque()
+
+    @classmethod
+    def from_settings(cls, name: str) -> "CircuitBreaker":
+        """Создание breaker с параметрами из настроек"""
+        return cls(
+            name=name,
+            failure_rate_threshold=settings.BREAKER_FAILURE_RATE_THRESHOLD,
+            minimum_calls=settings.BREAKER_MINIMUM_CALLS,
+            window_seconds=settings.BREAKER_WINDOW_SECONDS,
+            window_buckets=settings.BREAKER_WINDOW_BUCKETS,
+            open_timeout=settings.BREAKER_OPEN_TIMEOUT,
+            half_open_max_calls=settings.BREAKER_HALF_OPEN_MAX_CALLS
+        )
+
+    @property
+    def state(self) -> BreakerState:
+        """Текущее состояние с учетом истечения open_timeout"""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> BreakerState:
+        if (
+            self._state == BreakerState.OPEN
+            and self._clock() - self._opened_at >= self.open_timeout
+        ):
+            self._transition(BreakerState.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: BreakerState) -> None:
+        if state == self._state:
+            return
+        logger.warning(
+            f"Circuit breaker '{self.name}' changed state: "
+            f"{self._state.value} -> {state.value}"
+        )
+        self._state = state
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        if state == BreakerState.OPEN:
+            self._opened_at = self._clock()
+        elif state == BreakerState.CLOSED:
+            self._buckets.clear()
+
+    def _current_bucket(self) -> List[int]:
+        bucket_number = int(self._clock() // self.bucket_width)
+        oldest_allowed = bucket_number - self.window_buckets + 1
+        while self._buckets and self._buckets[0][0] < oldest_allowed:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != bucket_number:
+            self._buckets.append([bucket_number, 0, 0])
+        return self._buckets[-1]
+
+    def _window_totals(self) -> Dict[str, int]:
+        self._current_bucket()
+        successes = sum(bucket[1] for bucket in self._buckets)
+        failures = sum(bucket[2] for bucket in self._buckets)
+        return {"successes": successes, "failures": failures}
+
+    def allow_request(self) -> bool:
+        """
+        Проверка, можно ли выполнить попытку отправки
+
+        Returns:
+            True, если попытку можно выполнить
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == BreakerState.CLOSED:
+                return True
+            if state == BreakerState.OPEN:
+                return False
+            if self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+            return False
+
+    def release(self) -> None:
+        """Освобождение попытки, результат которой не учитывается"""
+        with self._lock:
+            if self._half_open_in_flight > 0:
+                self._half_open_in_flight -= 1
+
+    def record_success(self) -> None:
+        """Учет успешной попытки"""
+        with self._lock:
+            state = self._current_state()
+            if state == BreakerState.HALF_OPEN:
+                self._half_open_successes += 1
+                if self._half_open_successes >= self.half_open_max_calls:
+                    self._transition(BreakerState.CLOSED)
+                return
+            self._current_bucket()[1] += 1
+
+    def record_failure(self) -> None:
+        """Учет неудачной попытки"""
+        with self._lock:
+            state = self._current_state()
+            if state == BreakerState.HALF_OPEN:
+                self._transition(BreakerState.OPEN)
+                return
+            self._current_bucket()[2] += 1
+            if state == BreakerState.CLOSED:
+                totals = self._window_totals()
+                calls = totals["successes"] + totals["failures"]
+                if (
+                    calls >= self.minimum_calls
+                    and totals["failures"] / calls >= self.failure_rate_threshold
+                ):
+                    self._transition(BreakerState.OPEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Состояние breaker для мониторинга"""
+        with self._lock:
+            state = self._current_state()
+            totals = self._window_totals()
+            calls = totals["successes"] + totals["failures"]
+            return {
+                "name": self.name,
+                "state": state.value,
+                "window_calls": calls,
+                "window_failures": totals["failures"],
+                "failure_rate": totals["failures"] / calls if calls else 0.0,
+                "half_open_in_flight": self._half_open_in_flight,
+            }
+
+
+class CircuitBreakerRegistry:
+    """Реестр circuit breaker по имени канала"""
+
+    def __init__(self) -> None:
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        """Получение (или создание) breaker канала"""
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    name, CircuitBreaker.from_settings(name)
+                )
+        return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Состояние всех breaker"""
+        return {
+            name: breaker.snapshot()
+            for name, breaker in sorted(self._breakers.items())
+        }
+
+
+circuit_breakers = CircuitBreakerRegistry()
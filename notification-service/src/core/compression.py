@@ -0,0 +1,209 @@
+"""Сжатие ответов с согласованием Content-Encoding"""
+import asyncio
+import gzip
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.settings import settings
+
+# Необязательные зависимости (pip install .[compression])
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Типы содержимого, которые имеет смысл сжимать
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+# Потоковые ответы (SSE) не буферизуются и не сжимаются
+STREAMING_CONTENT_TYPES = ("text/event-stream",)
+
+
+class Codec(NamedTuple):
+    """Алгоритм сжатия: имя Content-Encoding и функция сжатия"""
+    name: str
+    compress: Callable[[bytes], bytes]
+
+
+def _gzip_compress(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(data)
+
+
+def _brotli_compress(data: bytes) -> bytes:
+    return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+
+def available_codecs() -> Dict[str, Codec]:
+    """Алгоритмы, доступные в окружении (zstd и br - при установленных библиотеках)"""
+    codecs = {"gzip": Codec("gzip", _gzip_compress)}
+    if zstandard is not None:
+        codecs["zstd"] = Codec("zstd", _zstd_compress)
+    if brotli is not None:
+        codecs["br"] = Codec("br", _brotli_compress)
+    return codecs
+
+
+def server_preference() -> List[str]:
+    """Порядок предпочтения алгоритмов из COMPRESSION_ENCODINGS"""
+    return [
+        name.strip().lower()
+        for name in settings.COMPRESSION_ENCODINGS.split(",")
+        if name.strip()
+    ]
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Разбор заголовка Accept-Encoding
+
+    Returns:
+        Вес (q) каждого указанного алгоритма, включая "*"
+    """
+    weights = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+    return weights
+
+
+def negotiate(
+    accept_encoding: Optional[str],
+    codecs: Dict[str, Codec],
+    preference: List[str]
+) -> Optional[Codec]:
+    """
+    Выбор алгоритма сжатия для клиента
+
+    Выбирается алгоритм с наибольшим весом q у клиента, при равных весах -
+    первый в порядке предпочтения сервера. Недоступные алгоритмы пропускаются.
+
+    Args:
+        accept_encoding: Значение заголовка Accept-Encoding
+        codecs: Доступные алгоритмы
+        preference: Порядок предпочтения сервера
+
+    Returns:
+        Алгоритм или None, если ответ отправляется без сжатия
+    """
+    if not accept_encoding:
+        return None
+    weights = parse_accept_encoding(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+
+    best: Optional[Codec] = None
+    best_weight = 0.0
+    for name in preference:
+        codec = codecs.get(name)
+        if codec is None:
+            continue
+        weight = weights.get(name, wildcard)
+        if weight > best_weight:
+            best, best_weight = codec, weight
+    return best
+
+
+def is_compressible(headers: Headers) -> bool:
+    """Можно ли сжимать ответ с такими заголовками"""
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    if content_type.startswith(STREAMING_CONTENT_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов по Accept-Encoding
+
+    Сжимаются ответы с телом одним сообщением не меньше COMPRESSION_MIN_SIZE
+    байт: для маленьких ответов выигрыш в размере не окупает затрат CPU.
+    Тела от COMPRESSION_OFFLOAD_SIZE байт сжимаются в пуле потоков, чтобы
+    не блокировать event loop. Потоковые ответы (SSE, StreamingResponse)
+    передаются без изменений. Если сжатие не уменьшило тело, отправляется
+    исходное.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.codecs = available_codecs()
+        self.preference = server_preference()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codec = negotiate(
+            Headers(scope=scope).get("accept-encoding"), self.codecs, self.preference
+        )
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                if is_compressible(Headers(raw=message["headers"])):
+                    start_message = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if message.get("more_body", False):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            headers.add_vary_header("Accept-Encoding")
+            body = message.get("body", b"")
+            if len(body) >= settings.COMPRESSION_MIN_SIZE:
+                if len(body) >= settings.COMPRESSION_OFFLOAD_SIZE:
+                    compressed = await asyncio.to_thread(codec.compress, body)
+                else:
+                    compressed = codec.compress(body)
+                if len(compressed) < len(body):
+                    headers["Content-Encoding"] = codec.name
+                    headers["Content-Length"] = str(len(compressed))
+                    message = {**message, "body": compressed}
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -1,7 +1,19 @@
 """Константы приложения - только истинные константы, которые не должны меняться"""
 
 # HTTP статус коды (стандартные значения HTTP)
+HTTP_STATUS_NOT_MODIFIED = 304
+HTTP_STATUS_BAD_REQUEST = 400
+HTTP_STATUS_FORBIDDEN = 403
+HTTP_STATUS_NOT_FOUND = 404
+HTTP_STATUS_CONFLICT = 409
+HTTP_STATUS_TOO_MANY_REQUESTS = 429
 HTTP_STATUS_INTERNAL_SERVER_ERROR = 500
+HTTP_STATUS_SERVICE_UNAVAILABLE = 503
+
+# Заголовки профилирования
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+PROFILE_REQUEST_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
 
 # Коды выхода (стандартные коды выхода Unix)
 EXIT_CODE_SUCCESS = 0
@@ -18,3 +30,12 @@ TEST_MESSAGE_CODE = "1111"  # Тестовый код в сообщении
 TEST_NOTIFICATION_ID = 1  # Тестовый ID уведомления
 TEST_EMPTY_NOTIFICATIONS_COUNT = 0  # Ожидаемое количество уведомлений для пустого списка
 TEST_MIN_NOTIFICATIONS_COUNT = 1  # Минимальное ожидаемое количество уведомлений
+TEST_USER_ID_STATS = 777  # user_id для тестов статистики
+TEST_USER_ID_RETENTION = 778  # user_id для тестов очистки истории
+TEST_USER_ID_ETAG = 779  # user_id для тестов условных запросов
+TEST_USER_ID_RATE_LIMIT = 780  # user_id для тестов ограничения частоты
+TEST_USER_ID_COALESCE = 781  # user_id для тестов подавления дублей
+TEST_USER_ID_CAMPAIGN = 782  # Первый user_id для тестов кампаний
+TEST_USER_ID_IMPORT = 800  # user_id для тестов импорта из файла
+TEST_USER_ID_BREAKER = 802  # user_id для тестов отложенных уведомлений
+TEST_USER_ID_EVENTS = 803  # user_id для тестов потока событий
@@ -1,7 +1,13 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from contextlib import contextmanager
-from typing import Generator
+from typing import Callable, Generator, Iterable, List, Optional
+from fastapi import Request
 
 from core.settings import settings
 from logger import logger
@@ -11,10 +17,25 @@ Base = declarative_base()
 
 
 class DatabaseManager:
-    """Менеджер подключений к базе данных"""
-    def __init__(self):
+    """
+    Менеджер подключений к базе данных
+
+    Помимо основной БД может использовать реплики для чтения
+    (DATABASE_REPLICA_URLS). Чтения пользователя направляются на основную
+    БД в течение DATABASE_READ_YOUR_WRITES_WINDOW секунд после изменения
+    его уведомлений, а также если нет доступных реплик.
+    """
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
         self._engine = None
         self._session_factory = None
+        self._replica_engines: List[Engine] = []
+        self._replica_session_factories: List[sessionmaker] = []
+        self._replica_healthy: List[bool] = []
+        self._replica_cursor = 0
+        # user_id -> момент последнего изменения, в порядке изменения
+        self._recent_writes: "OrderedDict[int, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._clock = clock
 
     def init(self) -> None:
         """Инициализация подключения к базе данных"""
@@ -56,6 +77,131 @@ class DatabaseManager:
         )
 
         self.create_tables()
+        self.init_replicas()
+
+    def init_replicas(self) -> None:
+        """Создание движков и пулов подключений к репликам для чтения"""
+        urls = [
+            url.strip()
+            for url in (settings.DATABASE_REPLICA_URLS or "").split(",")
+            if url.strip()
+        ]
+        for url in urls:
+            connect_args = {}
+            if url.startswith("postgresql"):
+                connect_args["connect_timeout"] = settings.DATABASE_CONNECT_TIMEOUT
+            engine = create_engine(
+                url,
+                pool_pre_ping=True,
+                echo=False,
+                connect_args=connect_args
+            )
+            self._replica_engines.append(engine)
+            self._replica_session_factories.append(sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=engine
+            ))
+            self._replica_healthy.append(False)
+
+        if urls:
+            logger.info(f"Configured {len(urls)} read replica(s)")
+            self.check_replicas()
+
+    def check_replicas(self) -> List[bool]:
+        """
+        Проверка доступности реплик запросом DATABASE_HEALTH_CHECK_QUERY
+
+        Returns:
+            Доступность каждой реплики
+        """
+        for index, engine in enumerate(self._replica_engines):
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text(settings.DATABASE_HEALTH_CHECK_QUERY))
+                healthy = True
+            except Exception as e:
+                healthy = False
+                if self._replica_healthy[index]:
+                    logger.warning(f"Read replica {index} is unavailable: {e}")
+            if healthy and not self._replica_healthy[index]:
+                logger.info(f"Read replica {index} is available")
+            self._replica_healthy[index] = healthy
+        return list(self._replica_healthy)
+
+    async def run_replica_health_checks(self) -> None:
+        """Периодическая проверка реплик (фоновая задача)"""
+        while True:
+            await asyncio.sleep(settings.DATABASE_REPLICA_HEALTH_INTERVAL)
+            await asyncio.to_thread(self.check_replicas)
+
+    def mark_writes(self, user_ids: Iterable[int]) -> None:
+        """
+        Отметка изменения уведомлений пользователей
+
+        Следующие DATABASE_READ_YOUR_WRITES_WINDOW секунд чтения этих
+        пользователей выполняются на основной БД.
+        """
+        if not self._replica_engines:
+            return
+        now = self._clock()
+        with self._lock:
+            for user_id in user_ids:
+                self._recent_writes.pop(user_id, None)
+                self._recent_writes[user_id] = now
+            self._expire_writes(now)
+
+    def _expire_writes(self, now: float) -> None:
+        window = settings.DATABASE_READ_YOUR_WRITES_WINDOW
+        while self._recent_writes:
+            written_at = next(iter(self._recent_writes.values()))
+            if now - written_at < window:
+                break
+            self._recent_writes.popitem(last=False)
+
+    def _read_session_factory(self, user_id: Optional[int]) -> Optional[sessionmaker]:
+        """Выбор реплики для чтения или None, если читать нужно с основной БД"""
+        if not self._replica_engines:
+            return None
+        with self._lock:
+            if user_id is not None:
+                self._expire_writes(self._clock())
+                if user_id in self._recent_writes:
+                    return None
+            for _ in range(len(self._replica_engines)):
+                index = self._replica_cursor % len(self._replica_engines)
+                self._replica_cursor += 1
+                if self._replica_healthy[index]:
+                    return self._replica_session_factories[index]
+        return None
+
+    @contextmanager
+    def get_read_session(
+        self,
+        user_id: Optional[int] = None
+    ) -> Generator[Session, None, None]:
+        """
+        Контекстный менеджер сессии только для чтения
+
+        Args:
+            user_id: Пользователь, чьи данные читаются (для read-your-writes)
+        """
+        factory = self._read_session_factory(user_id)
+        if factory is None:
+            with self.get_session() as session:
+                yield session
+            return
+
+        session: Session = factory()
+        try:
+            yield session
+        finally:
+            session.rollback()
+            session.close()
+
+    def is_replica_session(self, session: Session) -> bool:
+        """Проверка, что сессия работает с репликой"""
+        return session.get_bind() is not self._engine
 
     def create_tables(self) -> None:
         """Создание таблиц в базе данных"""
@@ -88,6 +234,11 @@ class DatabaseManager:
         if self._engine:
             self._engine.dispose()
             logger.info("Database connections closed")
+        for engine in self._replica_engines:
+            engine.dispose()
+        self._replica_engines = []
+        self._replica_session_factories = []
+        self._replica_healthy = []
 
 
 db_manager = DatabaseManager()
@@ -97,3 +248,18 @@ def get_db() -> Generator[Session, None, None]:
     """Зависимость для получения сессии БД (используется в FastAPI)"""
     with db_manager.get_session() as session:
         yield session
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Зависимость для получения сессии чтения (реплика, если доступна)
+
+    user_id берется из пути запроса, чтобы пользователь видел свои
+    недавние изменения.
+    """
+    try:
+        user_id = int(request.path_params["user_id"])
+    except (KeyError, ValueError):
+        user_id = None
+    with db_manager.get_read_session(user_id) as session:
+        yield session
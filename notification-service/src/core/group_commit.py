@@ -0,0 +1,116 @@
+"""Групповая фиксация (group commit) одиночных записей"""
+import asyncio
+from typing import Callable, Generic, List, Optional, Set, Tuple, TypeVar
+
+from logger import logger
+
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+
+class GroupCommitter(Generic[ItemT, ResultT]):
+    """
+    Объединение конкурентных записей в одну транзакцию
+
+    submit() ставит запись в очередь и ждет ее фиксации. Очередь
+    записывается одной транзакцией через max_delay после первой записи
+    или сразу при накоплении max_batch записей. Пока транзакция
+    выполняется, новые записи копятся и фиксируются следующей пачкой
+    сразу после нее, поэтому при высокой нагрузке пачки растут сами.
+
+    commit_batch - синхронная функция, которая записывает пачку в одной
+    транзакции и возвращает результаты в порядке записей; выполняется
+    в пуле потоков. Если пачка не записалась, записи повторяются по
+    одной, чтобы ошибка одной записи не отклоняла остальные.
+    Ответ вызывающему отправляется только после фиксации, поэтому
+    надежность записи не меняется.
+    """
+
+    def __init__(
+        self,
+        commit_batch: Callable[[List[ItemT]], List[ResultT]],
+        max_delay: float,
+        max_batch: int
+    ) -> None:
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._commit_batch = commit_batch
+        self._pending: List[Tuple[ItemT, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._committing = False
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: ItemT) -> ResultT:
+        """
+        Запись в составе ближайшей пачки
+
+        Returns:
+            Результат commit_batch для этой записи
+
+        Raises:
+            Exception: Ошибка записи этой записи
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if not self._committing:
+            if len(self._pending) >= self.max_batch:
+                self._start_commit()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.max_delay, self._start_commit)
+        return await future
+
+    def _start_commit(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._committing or not self._pending:
+            return
+        batch = self._pending[:self.max_batch]
+        del self._pending[:self.max_batch]
+        self._committing = True
+        task = asyncio.create_task(self._commit(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _commit(self, batch: List[Tuple[ItemT, asyncio.Future]]) -> None:
+        try:
+            items = [item for item, _ in batch]
+            try:
+                results = await asyncio.to_thread(self._commit_batch, items)
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                if len(batch) == 1:
+                    raise
+                logger.warning(
+                    f"Group commit of {len(batch)} records failed, "
+                    f"retrying one by one: {e}"
+                )
+                for item, future in batch:
+                    try:
+                        [result] = await asyncio.to_thread(self._commit_batch, [item])
+                    except Exception as item_error:
+                        if not future.done():
+                            future.set_exception(item_error)
+                    else:
+                        if not future.done():
+                            future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # При отмене задачи (остановка сервиса) ожидающие записи не
+            # должны зависнуть: результат транзакции для них неизвестен
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(
+                        RuntimeError("Group commit was cancelled")
+                    )
+            self._committing = False
+            # Записи, пришедшие во время транзакции, уже подождали - без задержки
+            if self._pending:
+                self._start_commit()
@@ -0,0 +1,209 @@
+"""Мониторинг задержки event loop и обнаружение блокирующих вызовов"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from core.settings import settings
+from logger import logger
+
+
+# Верхние границы корзин гистограммы задержки (миллисекунды)
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Количество кадров стека в отчете о блокировке
+BLOCKING_STACK_LIMIT = 30
+
+
+class LoopMonitor:
+    """
+    Монитор задержки планирования event loop
+
+    Задача run() засыпает на interval и измеряет, насколько позже
+    запланированного она была разбужена. Задержка показывает, сколько
+    ждали все готовые к выполнению задачи, и накапливается в гистограмме.
+
+    Детектор блокировок - отдельный поток (watchdog). Если очередной тик
+    монитора запаздывает больше чем на blocking_threshold, поток снимает
+    стек потока event loop, то есть место, где loop заблокирован прямо
+    сейчас, и сохраняет отчет. Длительность блокировки уточняется, когда
+    loop снова выполняет монитор.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        blocking_threshold: float,
+        max_reports: int,
+        clock: Callable[[], float] = time.perf_counter
+    ) -> None:
+        self.interval = interval
+        self.blocking_threshold = blocking_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._bucket_counts = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._last = 0.0
+
+        self._tick = 0
+        self._last_tick_at: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+        self._reported_tick = -1
+        self._pending_report: Optional[Dict[str, Any]] = None
+        self._reports: Deque[Dict[str, Any]] = deque(maxlen=max_reports)
+        self._blocking_count = 0
+
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def record_lag(self, lag: float) -> None:
+        """Учет измеренной задержки и отметка тика монитора"""
+        lag_ms = lag * 1000
+        index = len(LAG_BUCKETS_MS)
+        for position, bound in enumerate(LAG_BUCKETS_MS):
+            if lag_ms <= bound:
+                index = position
+                break
+
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self._count += 1
+            self._sum += lag
+            self._max = max(self._max, lag)
+            self._last = lag
+            self._tick += 1
+            self._last_tick_at = self._clock()
+            if self._pending_report is not None:
+                self._pending_report["duration_ms"] = round(lag_ms, 1)
+                self._pending_report = None
+
+    async def run(self) -> None:
+        """Периодическое измерение задержки (фоновая задача event loop)"""
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        with self._lock:
+            self._last_tick_at = self._clock()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record_lag(max(0.0, loop.time() - expected))
+
+    def check_blocking(self) -> Optional[Dict[str, Any]]:
+        """
+        Проверка, не заблокирован ли event loop
+
+        Вызывается из потока watchdog. Об одной блокировке сообщается один раз.
+
+        Returns:
+            Отчет о новой блокировке или None
+        """
+        with self._lock:
+            if self._last_tick_at is None or self._loop_thread_id is None:
+                return None
+            overdue = self._clock() - self._last_tick_at - self.interval
+            if overdue < self.blocking_threshold or self._reported_tick == self._tick:
+                return None
+            self._reported_tick = self._tick
+
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame, limit=BLOCKING_STACK_LIMIT) if frame else []
+        report = {
+            "detected_at": datetime.now().isoformat(),
+            "blocked_for_ms": round(overdue * 1000, 1),
+            "duration_ms": None,
+            "stack": [line.rstrip() for line in stack],
+        }
+        with self._lock:
+            self._reports.append(report)
+            self._blocking_count += 1
+            self._pending_report = report
+
+        logger.warning(
+            f"Event loop blocked for more than {overdue * 1000:.0f} ms:\n"
+            + "".join(stack)
+        )
+        return report
+
+    def _watch(self) -> None:
+        check_interval = max(self.blocking_threshold / 2, 0.01)
+        while not self._stop.wait(check_interval):
+            try:
+                self.check_blocking()
+            except Exception as e:
+                logger.error(f"Blocking detector error: {e}")
+
+    def start_watchdog(self) -> None:
+        """Запуск потока обнаружения блокировок"""
+        if self._watchdog is not None:
+            return
+        self._stop.clear()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-blocking-detector", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop_watchdog(self) -> None:
+        """Остановка потока обнаружения блокировок"""
+        if self._watchdog is None:
+            return
+        self._stop.set()
+        self._watchdog.join()
+        self._watchdog = None
+
+    def _percentile_ms(self, fraction: float) -> Optional[float]:
+        """Оценка перцентиля по гистограмме (верхняя граница корзины)"""
+        if not self._count:
+            return None
+        threshold = fraction * self._count
+        cumulative = 0
+        for index, count in enumerate(self._bucket_counts):
+            cumulative += count
+            if cumulative >= threshold:
+                if index < len(LAG_BUCKETS_MS):
+                    return float(LAG_BUCKETS_MS[index])
+                return round(self._max * 1000, 1)
+        return round(self._max * 1000, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Метрики задержки и блокировок для мониторинга"""
+        with self._lock:
+            buckets = {
+                f"le_{bound}ms": count
+                for bound, count in zip(LAG_BUCKETS_MS, self._bucket_counts)
+            }
+            buckets["inf"] = self._bucket_counts[-1]
+            reports: List[Dict[str, Any]] = [dict(report) for report in self._reports]
+            return {
+                "lag": {
+                    "interval_ms": self.interval * 1000,
+                    "samples": self._count,
+                    "last_ms": round(self._last * 1000, 3),
+                    "mean_ms": (
+                        round(self._sum / self._count * 1000, 3) if self._count else None
+                    ),
+                    "max_ms": round(self._max * 1000, 3),
+                    "p50_ms": self._percentile_ms(0.5),
+                    "p99_ms": self._percentile_ms(0.99),
+                    "buckets": buckets,
+                },
+                "blocking": {
+                    "enabled": self._watchdog is not None,
+                    "threshold_ms": self.blocking_threshold * 1000,
+                    "count": self._blocking_count,
+                    "recent": reports,
+                },
+            }
+
+
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL,
+    blocking_threshold=settings.LOOP_BLOCKING_THRESHOLD,
+    max_reports=settings.LOOP_BLOCKING_MAX_REPORTS
+)
@@ -0,0 +1,105 @@
+"""ASGI middleware приложения"""
+import logging
+import random
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.settings import settings
+from core.constants import HTTP_STATUS_INTERNAL_SERVER_ERROR
+from logger import logger
+
+
+class RequestLoggingMiddleware:
+    """
+    Middleware для логирования HTTP запросов
+
+    Работает на уровне ASGI и не оборачивает тело ответа, а только
+    перехватывает сообщение со статусом. Ошибки и медленные запросы
+    логируются всегда, успешные - с вероятностью LOG_REQUESTS_SAMPLE_RATE.
+    Сообщения форматируются лениво, только если запись действительно пишется.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = HTTP_STATUS_INTERNAL_SERVER_ERROR
+        process_time = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, process_time
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif (
+                message["type"] == "http.response.body"
+                and not message.get("more_body", False)
+            ):
+                process_time = time.perf_counter() - start_time
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            self._log_failure(scope, e, time.perf_counter() - start_time)
+            raise
+
+        if process_time is None:
+            process_time = time.perf_counter() - start_time
+        self._log_completion(scope, status_code, process_time)
+
+    @staticmethod
+    def _log_completion(scope: Scope, status_code: int, process_time: float) -> None:
+        """Логирование завершенного запроса с учетом сэмплирования"""
+        if status_code >= HTTP_STATUS_INTERNAL_SERVER_ERROR:
+            level = logging.ERROR
+        elif process_time >= settings.LOG_SLOW_REQUEST_THRESHOLD:
+            level = logging.WARNING
+        elif random.random() < settings.LOG_REQUESTS_SAMPLE_RATE:
+            level = logging.INFO
+        else:
+            return
+
+        if not logger.isEnabledFor(level):
+            return
+
+        logger.log(
+            level,
+            "Request completed: %s %s - Status: %s - Time: %.*fs",
+            scope["method"],
+            scope["path"],
+            status_code,
+            settings.TIME_FORMAT_DECIMAL_PLACES,
+            process_time,
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "client": scope["client"][0] if scope.get("client") else None,
+                "status_code": status_code,
+                "process_time": process_time
+            }
+        )
+
+    @staticmethod
+    def _log_failure(scope: Scope, error: Exception, process_time: float) -> None:
+        """Логирование запроса, завершившегося исключением"""
+        logger.error(
+            "Request failed: %s %s - Error: %s - Time: %.*fs",
+            scope["method"],
+            scope["path"],
+            error,
+            settings.TIME_FORMAT_DECIMAL_PLACES,
+            process_time,
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "error": str(error),
+                "process_time": process_time
+            },
+            exc_info=True
+        )
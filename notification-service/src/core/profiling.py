@@ -0,0 +1,349 @@
+"""Профилирование запросов и процесса по требованию"""
+import asyncio
+import cProfile
+import functools
+import hmac
+import io
+import itertools
+import marshal
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.constants import PROFILE_ID_HEADER, PROFILE_REQUEST_HEADER, ADMIN_TOKEN_HEADER
+from core.settings import settings
+from logger import logger
+
+
+# Имена заголовков в виде, в котором они передаются в ASGI scope
+_PROFILE_REQUEST_KEY = PROFILE_REQUEST_HEADER.lower().encode()
+_ADMIN_TOKEN_KEY = ADMIN_TOKEN_HEADER.lower().encode()
+_PROFILE_ID_KEY = PROFILE_ID_HEADER.lower().encode()
+
+# Профиль текущего запроса; задан только в запросах с заголовком профилирования
+_active_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "active_profile", default=None
+)
+
+
+class RequestProfile:
+    """
+    Профиль одного запроса
+
+    cProfile работает в пределах одного потока, поэтому для кода, который
+    FastAPI выполняет в пуле потоков (синхронные обработчики и обращения
+    к БД в них), создаются отдельные профили, которые объединяются
+    при завершении запроса.
+    """
+
+    def __init__(self, profile_id: str, method: str, path: str) -> None:
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.created_at = time.time()
+        self.duration = 0.0
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._stats: Optional[pstats.Stats] = None
+
+    def add(self, profile: cProfile.Profile) -> None:
+        """Добавление профиля фрагмента запроса"""
+        with self._lock:
+            self._profiles.append(profile)
+
+    def finish(self, duration: float) -> None:
+        """Объединение профилей после завершения запроса"""
+        self.duration = duration
+        with self._lock:
+            profiles, self._profiles = self._profiles, []
+        stats = None
+        for profile in profiles:
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        self._stats = stats
+
+    def dump_pstats(self) -> bytes:
+        """Статистика в формате pstats (marshal, как у cProfile.dump_stats)"""
+        return marshal.dumps(self._stats.stats if self._stats else {})
+
+    def render_text(self, sort: str = "cumulative", limit: int = 50) -> str:
+        """Текстовый отчет pstats"""
+        if self._stats is None:
+            return ""
+        stream = io.StringIO()
+        self._stats.stream = stream
+        self._stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def summary(self) -> Dict[str, Any]:
+        """Краткое описание профиля"""
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "created_at": self.created_at,
+            "duration": self.duration,
+        }
+
+
+class ProfileStore:
+    """Ограниченное хранилище последних профилей запросов"""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.capacity:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._profiles.values())]
+
+
+profile_store = ProfileStore(settings.PROFILING_MAX_STORED)
+
+
+def profile_call(func: Callable) -> Callable:
+    """
+    Обертка синхронной функции для профилирования в рабочем потоке
+
+    Вне профилируемого запроса стоимость обертки - одно чтение ContextVar.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        request_profile = _active_profile.get()
+        if request_profile is None or sys.getprofile() is not None:
+            return func(*args, **kwargs)
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            request_profile.add(profile)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Маршрут, синхронный обработчик которого профилируется в пуле потоков
+
+    При выключенном PROFILING_ENABLED обработчик не оборачивается.
+    Асинхронные обработчики выполняются в потоке event loop и попадают
+    в профиль ProfilingMiddleware.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any) -> None:
+        if settings.PROFILING_ENABLED and not asyncio.iscoroutinefunction(endpoint):
+            endpoint = profile_call(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """Проверка административного токена"""
+    expected = settings.PROFILING_ADMIN_TOKEN
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode(), expected.encode())
+
+
+class ProfilingMiddleware:
+    """
+    Профилирование отдельных запросов через cProfile
+
+    Запрос профилируется, если передан заголовок X-Profile и верный
+    X-Admin-Token. В ответ добавляется заголовок X-Profile-Id, профиль
+    доступен через GET /api/admin/profiles/{id}.
+
+    Профиль потока event loop включает работу других задач, выполнявшихся
+    в это время, поэтому одновременно профилируется не более одного
+    запроса. Middleware подключается только при PROFILING_ENABLED.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if _PROFILE_REQUEST_KEY not in headers:
+            await self.app(scope, receive, send)
+            return
+
+        token = headers.get(_ADMIN_TOKEN_KEY, b"").decode("latin-1")
+        if not is_admin(token) or self._busy:
+            if self._busy:
+                logger.warning("Profiling already in progress, request not profiled")
+            await self.app(scope, receive, send)
+            return
+
+        request_profile = RequestProfile(
+            uuid.uuid4().hex, scope["method"], scope["path"]
+        )
+        profile_header = (_PROFILE_ID_KEY, request_profile.id.encode())
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), profile_header]
+            await send(message)
+
+        self._busy = True
+        token_var = _active_profile.set(request_profile)
+        loop_profile = cProfile.Profile()
+        started_at = time.perf_counter()
+        loop_profile.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            loop_profile.disable()
+            _active_profile.reset(token_var)
+            self._busy = False
+            request_profile.add(loop_profile)
+            request_profile.finish(time.perf_counter() - started_at)
+            profile_store.add(request_profile)
+
+
+FrameKey = Tuple[str, int, str]
+
+
+class SamplingProfiler:
+    """
+    Статистический профилировщик всего процесса
+
+    Отдельный поток с интервалом interval снимает стеки всех потоков
+    через sys._current_frames(). Накладные расходы есть только во время
+    сэмплирования, одновременно работает не более одного сеанса.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def sample(self, duration: float, interval: float) -> Optional["SampleResult"]:
+        """
+        Сэмплирование стеков в течение duration секунд
+
+        Блокирует вызывающий поток, вызывается через asyncio.to_thread.
+
+        Returns:
+            Результат или None, если уже идет другой сеанс
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            own_thread = threading.get_ident()
+            thread_names = {
+                thread.ident: thread.name for thread in threading.enumerate()
+            }
+            stacks: Counter = Counter()
+            samples = 0
+            deadline = time.perf_counter() + duration
+            while time.perf_counter() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                        frame = frame.f_back
+                    stack.reverse()
+                    thread_name = thread_names.get(thread_id, str(thread_id))
+                    stacks[(thread_name, tuple(stack))] += 1
+                samples += 1
+                time.sleep(interval)
+            return SampleResult(stacks, samples, interval)
+        finally:
+            self._lock.release()
+
+
+class SampleResult:
+    """Результат сэмплирования: количество наблюдений каждого стека"""
+
+    def __init__(
+        self,
+        stacks: Counter,
+        samples: int,
+        interval: float
+    ) -> None:
+        self.stacks = stacks
+        self.samples = samples
+        self.interval = interval
+
+    def collapsed(self) -> str:
+        """Стеки в формате collapsed (flamegraph.pl, speedscope)"""
+        lines = []
+        for (thread_name, stack), count in self.stacks.most_common():
+            frames = itertools.chain(
+                [thread_name],
+                (f"{name} ({filename}:{line})" for filename, line, name in stack)
+            )
+            lines.append(f"{';'.join(frames)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def dump_pstats(self) -> bytes:
+        """
+        Статистика в формате pstats
+
+        Время функции оценивается как количество наблюдений, умноженное на
+        интервал; nc - количество наблюдений, в которых функция была в стеке.
+        """
+        # key -> [cc, nc, tt, ct, callers]
+        stats: Dict[FrameKey, List[Any]] = {}
+        for (_, stack), count in self.stacks.items():
+            seen = set()
+            weight = count * self.interval
+            for index, key in enumerate(stack):
+                entry = stats.setdefault(key, [0, 0, 0.0, 0.0, {}])
+                if key not in seen:
+                    seen.add(key)
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += weight
+                if index == len(stack) - 1:
+                    entry[2] += weight
+                if index > 0:
+                    caller = stack[index - 1]
+                    edge = entry[4].setdefault(caller, [0, 0, 0.0, 0.0])
+                    edge[0] += count
+                    edge[1] += count
+                    edge[3] += weight
+                    if index == len(stack) - 1:
+                        edge[2] += weight
+        return marshal.dumps({
+            key: (cc, nc, tt, ct, {
+                caller: tuple(edge) for caller, edge in callers.items()
+            })
+            for key, (cc, nc, tt, ct, callers) in stats.items()
+        })
+
+
+sampling_profiler = SamplingProfiler()
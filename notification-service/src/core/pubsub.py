@@ -0,0 +1,151 @@
+"""Внутрипроцессная шина событий для push-уведомлений клиентов"""
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Set
+
+from core.settings import settings
+from logger import logger
+
+
+class Subscription:
+    """
+    Подписка на события одного пользователя
+
+    Буфер подписки ограничен. Если клиент не успевает читать события,
+    самые старые из них отбрасываются, а счетчик dropped увеличивается,
+    чтобы клиент мог перечитать историю.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        maxsize: int,
+        loop: asyncio.AbstractEventLoop
+    ) -> None:
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._loop = loop
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        """Помещение события в буфер (только в потоке event loop подписки)"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Ожидание следующего события
+
+        Args:
+            timeout: Максимальное время ожидания в секундах
+
+        Returns:
+            Событие или None, если за timeout событий не было
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """
+    Шина событий с fan-out по user_id
+
+    Подписки создаются и удаляются в event loop, а публикация возможна
+    из потоков пула (синхронные обработчики и asyncio.to_thread), поэтому
+    реестр подписок защищен блокировкой. Под ней только снимается копия
+    подписок пользователя, доставка выполняется без блокировки.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        """Текущее количество подписок"""
+        return self._count
+
+    def subscribe(
+        self,
+        user_id: int,
+        maxsize: Optional[int] = None
+    ) -> Optional[Subscription]:
+        """
+        Создание подписки на события пользователя
+
+        Должна вызываться из работающего event loop.
+
+        Args:
+            user_id: ID пользователя
+            maxsize: Размер буфера (по умолчанию SSE_SUBSCRIBER_BUFFER_SIZE)
+
+        Returns:
+            Подписка или None, если достигнут лимит SSE_MAX_SUBSCRIBERS
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._count < settings.SSE_MAX_SUBSCRIBERS:
+                subscription = Subscription(
+                    user_id, maxsize or settings.SSE_SUBSCRIBER_BUFFER_SIZE, loop
+                )
+                self._subscribers.setdefault(user_id, set()).add(subscription)
+                self._count += 1
+                return subscription
+
+        logger.warning(
+            f"Subscriber limit reached, rejecting subscription for "
+            f"user {user_id}"
+        )
+        return None
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Удаление подписки"""
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if not subscriptions or subscription not in subscriptions:
+                return
+            subscriptions.discard(subscription)
+            self._count -= 1
+            if not subscriptions:
+                del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: int, event: Dict[str, Any]) -> int:
+        """
+        Публикация события всем подписчикам пользователя
+
+        Никогда не блокирует издателя: события доставляются в ограниченные
+        буферы подписок. Безопасна для вызова из других потоков.
+
+        Args:
+            user_id: ID пользователя
+            event: Данные события
+
+        Returns:
+            Количество подписок, которым отправлено событие
+        """
+        with self._lock:
+            subscriptions = tuple(self._subscribers.get(user_id, ()))
+        if not subscriptions:
+            return 0
+
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        for subscription in subscriptions:
+            if subscription._loop is current_loop:
+                subscription._deliver(event)
+            else:
+                subscription._loop.call_soon_threadsafe(
+                    subscription._deliver, event
+                )
+        return len(subscriptions)
+
+
+event_bus = EventBus()
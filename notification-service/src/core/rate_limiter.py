@@ -0,0 +1,95 @@
+"""Ограничение частоты запросов по ключу"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Tuple
+
+from core.settings import settings
+
+
+class SlidingWindowRateLimiter:
+    """
+    Приближенный sliding window счетчик с ограниченной памятью
+
+    Для каждого ключа хранятся только номер текущего окна и счетчики
+    текущего и предыдущего окон. Оценка числа запросов за последние
+    window_seconds равна previous * (1 - доля прошедшего окна) + current.
+
+    Ключи распределены по шардам, у каждого своя блокировка и
+    ограничение размера. При переполнении шарда вытесняется ключ,
+    к которому дольше всего не обращались (LRU), поэтому объем памяти
+    не зависит от количества пользователей.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        max_keys: int,
+        shards: int,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._shard_capacity = max(1, max_keys // shards)
+        # Значение: [номер окна, счетчик текущего окна, счетчик предыдущего]
+        self._shards: List[OrderedDict] = [OrderedDict() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def reset(self) -> None:
+        """Сброс счетчиков всех ключей"""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def hit(self, key: Hashable, limit: int) -> Tuple[bool, float]:
+        """
+        Учет запроса по ключу
+
+        Отклоненные запросы не учитываются в счетчике.
+
+        Args:
+            key: Ключ ограничения (например, (user_id, type))
+            limit: Максимальное количество запросов за окно
+
+        Returns:
+            Признак, что запрос разрешен, и рекомендуемая пауза в секундах
+        """
+        index = hash(key) % len(self._shards)
+        shard = self._shards[index]
+
+        now = self._clock()
+        window = int(now // self.window_seconds)
+        elapsed_fraction = (now % self.window_seconds) / self.window_seconds
+
+        with self._locks[index]:
+            entry = shard.get(key)
+            if entry is None:
+                entry = [window, 0, 0]
+                shard[key] = entry
+                if len(shard) > self._shard_capacity:
+                    shard.popitem(last=False)
+            else:
+                shard.move_to_end(key)
+
+            if entry[0] != window:
+                entry[2] = entry[1] if entry[0] == window - 1 else 0
+                entry[1] = 0
+                entry[0] = window
+
+            estimate = entry[2] * (1 - elapsed_fraction) + entry[1]
+            if estimate + 1 > limit:
+                retry_after = (1 - elapsed_fraction) * self.window_seconds
+                return False, retry_after
+
+            entry[1] += 1
+            return True, 0.0
+
+
+rate_limiter = SlidingWindowRateLimiter(
+    window_seconds=settings.RATE_LIMIT_WINDOW_SECONDS,
+    max_keys=settings.RATE_LIMIT_MAX_KEYS,
+    shards=settings.RATE_LIMIT_SHARDS
+)
@@ -1,7 +1,7 @@
 """Сервис начальных настроек """
 from pydantic_settings import BaseSettings
 from pydantic import Field, PostgresDsn
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -37,6 +37,61 @@ class Settings(BaseSettings):
         default=0.1, description="Вероятность ошибки отправки"
     )
 
+    LOG_REQUESTS_SAMPLE_RATE: float = Field(
+        default=1.0,
+        description="Доля успешных запросов, попадающих в лог (0.0-1.0)"
+    )
+    LOG_SLOW_REQUEST_THRESHOLD: float = Field(
+        default=1.0,
+        description="Порог в секундах, после которого запрос логируется всегда"
+    )
+
+    # Симулятор провайдеров
+    PROVIDER_SIMULATOR_ENABLED: bool = Field(
+        default=False,
+        description="Включить симулятор провайдеров вместо фиксированной задержки"
+    )
+    PROVIDER_SIMULATOR_SEED: Optional[int] = Field(
+        default=None,
+        description="Seed генератора случайных чисел симулятора"
+    )
+    PROVIDER_LATENCY_DISTRIBUTION: str = Field(
+        default="lognormal",
+        description="Распределение задержки: fixed, lognormal или percentiles"
+    )
+    PROVIDER_LATENCY_SIGMA: float = Field(
+        default=0.5,
+        description="Параметр sigma логнормального распределения задержки"
+    )
+    PROVIDER_LATENCY_P90_FACTOR: float = Field(
+        default=2.0,
+        description="Отношение p90 задержки к медиане (распределение percentiles)"
+    )
+    PROVIDER_LATENCY_P99_FACTOR: float = Field(
+        default=5.0,
+        description="Отношение p99 задержки к медиане (распределение percentiles)"
+    )
+    PROVIDER_LATENCY_P999_FACTOR: float = Field(
+        default=20.0,
+        description="Отношение p99.9 задержки к медиане (распределение percentiles)"
+    )
+    PROVIDER_OUTAGE_PROBABILITY: float = Field(
+        default=0.0,
+        description="Вероятность начала серии отказов при вызове провайдера"
+    )
+    PROVIDER_OUTAGE_LENGTH: int = Field(
+        default=50,
+        description="Длина серии отказов в вызовах провайдера"
+    )
+    PROVIDER_RATE_LIMIT_PER_SECOND: float = Field(
+        default=0.0,
+        description="Лимит запросов к провайдеру в секунду (0 - без лимита)"
+    )
+    PROVIDER_RATE_LIMIT_RETRY_AFTER: float = Field(
+        default=1.0,
+        description="Пауза после ответа rate_limited в секундах"
+    )
+
     # Форматирование времени
     TIME_FORMAT_DECIMAL_PLACES: int = Field(
         default=3, description="Количество знаков после запятой для времени"
@@ -69,6 +124,22 @@ class Settings(BaseSettings):
         description="SQL запрос для проверки подключения к БД"
     )
 
+    DATABASE_REPLICA_URLS: Optional[str] = Field(
+        default=None,
+        description="URL реплик для чтения через запятую"
+    )
+    DATABASE_READ_YOUR_WRITES_WINDOW: float = Field(
+        default=5.0,
+        description=(
+            "Сколько секунд после изменения уведомлений пользователя его "
+            "чтения выполняются на основной БД"
+        )
+    )
+    DATABASE_REPLICA_HEALTH_INTERVAL: float = Field(
+        default=10.0,
+        description="Интервал проверки доступности реплик в секундах"
+    )
+
     # Уведомления
     NOTIFICATION_INITIAL_ATTEMPTS: int = Field(
         default=0,
@@ -78,6 +149,284 @@ class Settings(BaseSettings):
         default=1,
         description="Начальное значение для счетчика попыток"
     )
+    GROUP_COMMIT_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Записывать конкурентно создаваемые уведомления общей транзакцией"
+        )
+    )
+    GROUP_COMMIT_MAX_DELAY: float = Field(
+        default=0.002,
+        description="Максимальное ожидание пачки перед записью в секундах"
+    )
+    GROUP_COMMIT_MAX_BATCH: int = Field(
+        default=500,
+        description="Максимальное количество уведомлений в одной транзакции"
+    )
+
+    # Ограничение частоты создания уведомлений
+    RATE_LIMIT_ENABLED: bool = Field(
+        default=False,
+        description="Включить ограничение частоты создания уведомлений"
+    )
+    RATE_LIMIT_WINDOW_SECONDS: float = Field(
+        default=60.0,
+        description="Длина окна ограничения частоты в секундах"
+    )
+    RATE_LIMIT_EMAIL_PER_WINDOW: int = Field(
+        default=30,
+        description="Максимум email уведомлений пользователя за окно"
+    )
+    RATE_LIMIT_TELEGRAM_PER_WINDOW: int = Field(
+        default=60,
+        description="Максимум telegram уведомлений пользователя за окно"
+    )
+    RATE_LIMIT_MAX_KEYS: int = Field(
+        default=100000,
+        description="Максимальное количество отслеживаемых пар (user_id, type)"
+    )
+    RATE_LIMIT_SHARDS: int = Field(
+        default=16,
+        description="Количество шардов счетчиков ограничения частоты"
+    )
+
+    # Подавление дублей и дайджесты
+    COALESCE_MODE: Literal["off", "dedupe", "digest"] = Field(
+        default="off",
+        description=(
+            "Обработка повторяющихся уведомлений: off, dedupe (отбрасывать "
+            "дубли) или digest (объединять сообщения окна в одно)"
+        )
+    )
+    COALESCE_WINDOW_SECONDS: float = Field(
+        default=10.0,
+        description="Окно подавления дублей и накопления дайджеста в секундах"
+    )
+    COALESCE_MAX_KEYS: int = Field(
+        default=100000,
+        description="Максимальное количество записей в индексе недавних уведомлений"
+    )
+    COALESCE_DIGEST_MAX_MESSAGES: int = Field(
+        default=20,
+        description="Максимальное количество сообщений в одном дайджесте"
+    )
+
+    # Circuit breaker каналов доставки
+    BREAKER_ENABLED: bool = Field(
+        default=True,
+        description="Включить circuit breaker для каналов доставки"
+    )
+    BREAKER_FAILURE_RATE_THRESHOLD: float = Field(
+        default=0.5,
+        description="Доля ошибок в окне, при которой breaker размыкается"
+    )
+    BREAKER_MINIMUM_CALLS: int = Field(
+        default=20,
+        description="Минимальное количество попыток в окне для оценки доли ошибок"
+    )
+    BREAKER_WINDOW_SECONDS: float = Field(
+        default=30.0,
+        description="Длина скользящего окна в секундах"
+    )
+    BREAKER_WINDOW_BUCKETS: int = Field(
+        default=10,
+        description="Количество корзин скользящего окна"
+    )
+    BREAKER_OPEN_TIMEOUT: float = Field(
+        default=10.0,
+        description="Время в состоянии open до пробных попыток (секунды)"
+    )
+    BREAKER_HALF_OPEN_MAX_CALLS: int = Field(
+        default=3,
+        description="Количество пробных попыток в состоянии half-open"
+    )
+    BREAKER_PARKING_CAPACITY: int = Field(
+        default=10000,
+        description="Максимум отложенных уведомлений на канал"
+    )
+    BREAKER_DRAIN_INTERVAL: float = Field(
+        default=1.0,
+        description="Интервал повторной отправки отложенных уведомлений (секунды)"
+    )
+    BREAKER_DRAIN_BATCH_SIZE: int = Field(
+        default=100,
+        description="Количество отложенных уведомлений, отправляемых за один проход"
+    )
+
+    BULK_LOOKUP_MAX_IDS: int = Field(
+        default=1000,
+        description="Максимальное количество ID в одном запросе статусов"
+    )
+
+    # Хранение истории
+    RETENTION_ENABLED: bool = Field(
+        default=False,
+        description="Включить периодическую очистку старых уведомлений"
+    )
+    RETENTION_DAYS: int = Field(
+        default=30,
+        description="Возраст (в днях) завершенных уведомлений для очистки"
+    )
+    RETENTION_BATCH_SIZE: int = Field(
+        default=500,
+        description="Количество строк, удаляемых одной транзакцией"
+    )
+    RETENTION_INTERVAL: float = Field(
+        default=3600.0,
+        description="Интервал запуска очистки в секундах"
+    )
+    RETENTION_ARCHIVE_ENABLED: bool = Field(
+        default=True,
+        description="Сохранять удаляемые уведомления в архив на диске"
+    )
+    RETENTION_ARCHIVE_DIR: str = Field(
+        default="./archive",
+        description="Каталог архива уведомлений"
+    )
+    RETENTION_ARCHIVE_BUCKETS: int = Field(
+        default=64,
+        description="Количество партиций архива по user_id"
+    )
+
+    # Server-Sent Events
+    SSE_SUBSCRIBER_BUFFER_SIZE: int = Field(
+        default=32,
+        description="Размер буфера событий одной подписки"
+    )
+    SSE_MAX_SUBSCRIBERS: int = Field(
+        default=50000,
+        description="Максимальное количество одновременных подписок"
+    )
+    SSE_HEARTBEAT_INTERVAL: float = Field(
+        default=15.0,
+        description="Интервал keep-alive комментариев в потоке событий (секунды)"
+    )
+
+    # Сжатие ответов
+    COMPRESSION_ENABLED: bool = Field(
+        default=True,
+        description="Сжимать ответы по заголовку Accept-Encoding"
+    )
+    COMPRESSION_ENCODINGS: str = Field(
+        default="zstd,br,gzip",
+        description=(
+            "Алгоритмы сжатия в порядке предпочтения через запятую; zstd и br "
+            "используются, если установлены zstandard и brotli"
+        )
+    )
+    COMPRESSION_MIN_SIZE: int = Field(
+        default=1024,
+        description="Минимальный размер тела ответа для сжатия в байтах"
+    )
+    COMPRESSION_OFFLOAD_SIZE: int = Field(
+        default=65536,
+        description=(
+            "Размер тела в байтах, начиная с которого сжатие выполняется "
+            "в пуле потоков"
+        )
+    )
+    COMPRESSION_GZIP_LEVEL: int = Field(
+        default=6,
+        description="Уровень сжатия gzip"
+    )
+    COMPRESSION_ZSTD_LEVEL: int = Field(
+        default=3,
+        description="Уровень сжатия zstd"
+    )
+    COMPRESSION_BROTLI_QUALITY: int = Field(
+        default=4,
+        description="Качество сжатия brotli"
+    )
+
+    # Импорт уведомлений из файла (src/import_notifications.py)
+    IMPORT_CHUNK_SIZE: int = Field(
+        default=1000,
+        description="Количество строк в одной транзакции импорта"
+    )
+    IMPORT_SEND_CONCURRENCY: int = Field(
+        default=100,
+        description="Максимум одновременных отправок при импорте с --send"
+    )
+    IMPORT_PROGRESS_INTERVAL: float = Field(
+        default=2.0,
+        description="Интервал вывода прогресса импорта в секундах"
+    )
+
+    # Кампании
+    CAMPAIGN_MAX_INLINE_RECIPIENTS: int = Field(
+        default=10000,
+        description="Максимум получателей в теле запроса создания кампании"
+    )
+    CAMPAIGN_STAGING_CHUNK_SIZE: int = Field(
+        default=5000,
+        description="Количество получателей в одной вставке в промежуточную таблицу"
+    )
+    CAMPAIGN_INSERT_CHUNK_SIZE: int = Field(
+        default=1000,
+        description="Количество уведомлений, создаваемых одним INSERT ... SELECT"
+    )
+    CAMPAIGN_DISPATCH_CONCURRENCY: int = Field(
+        default=100,
+        description="Максимум одновременных отправок одной кампании"
+    )
+
+    # Время доставки
+    LATENCY_WINDOW_MINUTES: int = Field(
+        default=60,
+        description="Окно по умолчанию для перцентилей времени доставки (минуты)"
+    )
+    LATENCY_SLO_THRESHOLD_MS: int = Field(
+        default=2000,
+        description="Порог SLO времени доставки по умолчанию (миллисекунды)"
+    )
+    LATENCY_SAMPLE_SIZE: int = Field(
+        default=10000,
+        description="Количество последних записей канала для расчета перцентилей"
+    )
+
+    # Мониторинг event loop
+    LOOP_MONITOR_ENABLED: bool = Field(
+        default=True,
+        description="Измерять задержку планирования event loop"
+    )
+    LOOP_MONITOR_INTERVAL: float = Field(
+        default=0.1,
+        description="Интервал измерения задержки event loop в секундах"
+    )
+    LOOP_BLOCKING_DETECTOR_ENABLED: bool = Field(
+        default=False,
+        description="Отладочный режим: сообщать о блокировках event loop со стеком"
+    )
+    LOOP_BLOCKING_THRESHOLD: float = Field(
+        default=0.1,
+        description="Длительность блокировки event loop для отчета в секундах"
+    )
+    LOOP_BLOCKING_MAX_REPORTS: int = Field(
+        default=50,
+        description="Количество хранимых отчетов о блокировках"
+    )
+
+    # Профилирование
+    PROFILING_ENABLED: bool = Field(
+        default=False,
+        description="Включить профилирование запросов и эндпоинты /api/admin/profile"
+    )
+    PROFILING_ADMIN_TOKEN: Optional[str] = Field(
+        default=None,
+        description="Токен администратора (заголовок X-Admin-Token)"
+    )
+    PROFILING_MAX_STORED: int = Field(
+        default=20,
+        description="Количество хранимых профилей запросов"
+    )
+    PROFILING_SAMPLE_INTERVAL: float = Field(
+        default=0.005,
+        description="Интервал сэмплирования стеков в секундах"
+    )
+    PROFILING_SAMPLE_MAX_DURATION: float = Field(
+        default=60.0,
+        description="Максимальная длительность сэмплирования в секундах"
+    )
 
     # Сетевые адреса
     LOCALHOST_IP: str = Field(
@@ -0,0 +1,575 @@
+"""
+Импорт уведомлений из CSV или NDJSON файла
+
+Файл читается потоком через цепочку генераторов: строки файла -> записи
+-> проверка схемой NotificationCreate -> пачки по --chunk-size. Каждая
+пачка записывается одним INSERT в отдельной транзакции, поэтому память
+не зависит от размера файла. В той же транзакции сохраняется позиция
+в файле (таблица import_progress), и прерванный импорт продолжается
+с нее при повторном запуске с тем же файлом: пачка не записывается
+дважды. С --send уведомления, отправка которых не завершилась до
+остановки, отправляются повторно при продолжении. Повторный запуск
+завершенного импорта ничего не делает; если файл по тому же пути
+изменился, импорт не продолжается. В обоих случаях импортировать файл
+заново можно с --restart.
+
+CSV - с заголовком user_id,message,type; NDJSON - по одному объекту
+{"user_id": ..., "message": ..., "type": ...} в строке. Некорректные
+строки пропускаются и (с --errors) записываются в NDJSON файл с номером
+строки и ошибкой.
+
+Запуск:
+    python src/import_notifications.py history.csv --chunk-size 5000
+    python src/import_notifications.py batch.ndjson --send --errors rejected.ndjson
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import IO, Any, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from pydantic import ValidationError
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from core.settings import settings
+from core.database import db_manager
+from models.import_progress import ImportProgress
+from models.notification import Notification, NotificationStatus, NotificationType
+from models.parked_notification import ParkedNotification
+from schemas.notification import NotificationCreate
+from services.notification_service import NotificationService
+from logger import logger
+
+
+ItemT = TypeVar("ItemT")
+
+FORMATS = ("csv", "ndjson")
+# Размер начала файла, по хешу которого обнаруживается замена файла
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+
+@dataclass
+class Checkpoint:
+    """
+    Позиция импорта: байт и строка, до которых файл уже обработан
+
+    Хранится в таблице import_progress по абсолютному пути файла.
+    unsent - ID уведомлений, отправка которых еще не завершилась;
+    completed_at - время завершения импорта.
+    """
+    source: str
+    offset: int = 0
+    line: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    unsent: List[int] = field(default_factory=list)
+    fingerprint: str = ""
+    completed_at: Optional[datetime] = None
+
+    @classmethod
+    def load(cls, session: Session, source: str) -> "Checkpoint":
+        """Чтение позиции импорта файла или новая, если импорт не начат"""
+        progress = session.get(ImportProgress, source)
+        if progress is None:
+            return cls(source=source)
+        return cls(
+            source=source,
+            offset=progress.offset,
+            line=progress.line,
+            inserted=progress.inserted,
+            rejected=progress.rejected,
+            unsent=[int(item) for item in progress.unsent_ids.split(",") if item],
+            fingerprint=progress.fingerprint,
+            completed_at=progress.completed_at
+        )
+
+    def save(self, session: Session) -> None:
+        """Запись позиции в транзакции вызывающей стороны"""
+        session.merge(ImportProgress(
+            source=self.source,
+            offset=self.offset,
+            line=self.line,
+            inserted=self.inserted,
+            rejected=self.rejected,
+            unsent_ids=",".join(str(item) for item in self.unsent),
+            fingerprint=self.fingerprint,
+            completed_at=self.completed_at
+        ))
+
+    @staticmethod
+    def delete(session: Session, source: str) -> None:
+        """Удаление позиции импорта файла"""
+        session.execute(delete(ImportProgress).where(ImportProgress.source == source))
+
+
+class SourceReader:
+    """
+    Построчное чтение файла с учетом позиции в байтах
+
+    Файл открыт в бинарном режиме, чтобы позицию после каждой строки
+    можно было сохранить и продолжить с нее через seek.
+    """
+
+    def __init__(self, source: IO[bytes], offset: int = 0, line: int = 0) -> None:
+        self._source = source
+        self.offset = offset
+        self.line = line
+
+    def header(self) -> Optional[str]:
+        """Первая строка файла (заголовок CSV) без изменения позиции"""
+        self._source.seek(0)
+        header = self._source.readline().decode("utf-8-sig")
+        if self.offset == 0:
+            self.offset = self._source.tell()
+            self.line = 1
+        return header or None
+
+    def lines(self) -> Iterator[str]:
+        """Строки файла начиная с текущей позиции"""
+        self._source.seek(self.offset)
+        for raw_line in iter(self._source.readline, b""):
+            text = raw_line.decode("utf-8")
+            if self.offset == 0:
+                text = text.lstrip("\ufeff")
+            self.offset += len(raw_line)
+            self.line += 1
+            yield text
+
+
+# Запись файла: номер строки и данные или описание ошибки разбора
+Record = Tuple[int, Optional[Any], Optional[str]]
+
+
+def read_csv(reader: SourceReader) -> Iterator[Record]:
+    """Записи CSV файла в виде словарей по заголовку"""
+    header = reader.header()
+    if header is None:
+        return
+    fieldnames = next(csv.reader([header]))
+    # csv.reader не читает строки заранее: после каждой записи позиция
+    # reader указывает ровно на ее конец
+    for row in csv.reader(reader.lines()):
+        if not row:
+            continue
+        if len(row) != len(fieldnames):
+            yield reader.line, None, (
+                f"Expected {len(fieldnames)} columns, got {len(row)}"
+            )
+            continue
+        yield reader.line, dict(zip(fieldnames, row)), None
+
+
+def read_ndjson(reader: SourceReader) -> Iterator[Record]:
+    """Записи NDJSON файла"""
+    for text in reader.lines():
+        if not text.strip():
+            continue
+        try:
+            yield reader.line, json.loads(text), None
+        except json.JSONDecodeError as e:
+            yield reader.line, None, f"Invalid JSON: {e}"
+
+
+@dataclass
+class ImportStats:
+    """Счетчики импорта для отчета о прогрессе (read - записи этого запуска)"""
+    read: int = 0
+    rejected: int = 0
+
+
+def validate(
+    records: Iterable[Record],
+    stats: ImportStats,
+    errors_file: Optional[IO[str]] = None
+) -> Iterator[NotificationCreate]:
+    """
+    Проверка записей схемой NotificationCreate
+
+    Некорректные записи учитываются в stats и пишутся в errors_file.
+    """
+    for line, data, error in records:
+        stats.read += 1
+        if error is None:
+            try:
+                yield NotificationCreate.model_validate(data)
+                continue
+            except ValidationError as e:
+                error = "; ".join(
+                    f"{'.'.join(str(part) for part in item['loc']) or 'row'}: "
+                    f"{item['msg']}"
+                    for item in e.errors()
+                )
+        stats.rejected += 1
+        if errors_file is not None:
+            errors_file.write(
+                json.dumps({"line": line, "error": error}, ensure_ascii=False) + "\n"
+            )
+
+
+def chunked(items: Iterable[ItemT], size: int) -> Iterator[List[ItemT]]:
+    """Пачки по size элементов"""
+    chunk: List[ItemT] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def insert_chunk(
+    chunk: List[NotificationCreate],
+    checkpoint: Checkpoint,
+    track_unsent: bool = False
+) -> List[int]:
+    """
+    Запись пачки и позиции импорта одной транзакцией
+
+    Args:
+        chunk: Уведомления пачки
+        checkpoint: Позиция после пачки; inserted (и unsent при
+            track_unsent) дополняются записанными уведомлениями
+        track_unsent: Добавить ID пачки в список неотправленных
+
+    Returns:
+        ID созданных уведомлений в порядке пачки
+    """
+    with db_manager.get_session() as session:
+        ids = NotificationService.insert_many(session, chunk)
+        checkpoint.inserted += len(ids)
+        if track_unsent:
+            checkpoint.unsent = checkpoint.unsent + ids
+        checkpoint.save(session)
+        session.commit()
+    return ids
+
+
+def file_fingerprint(path: str) -> str:
+    """Отпечаток файла: размер и хеш первых FINGERPRINT_BLOCK_SIZE байт"""
+    with open(path, "rb") as source_file:
+        block = source_file.read(FINGERPRINT_BLOCK_SIZE)
+        size = os.fstat(source_file.fileno()).st_size
+    return f"{size}:{hashlib.blake2b(block, digest_size=16).hexdigest()}"
+
+
+def load_checkpoint(source: str, fingerprint: str, restart: bool) -> Checkpoint:
+    """
+    Позиция импорта файла (с restart - сброс сохраненной позиции)
+
+    Raises:
+        ValueError: Если файл изменился после начала импорта
+    """
+    with db_manager.get_session() as session:
+        if restart:
+            Checkpoint.delete(session, source)
+            session.commit()
+        checkpoint = Checkpoint.load(session, source)
+
+    if checkpoint.fingerprint and checkpoint.fingerprint != fingerprint:
+        raise ValueError(
+            f"{source} has changed since it was imported at line "
+            f"{checkpoint.line}, run with --restart to import it from the start"
+        )
+    checkpoint.fingerprint = fingerprint
+    return checkpoint
+
+
+def complete_checkpoint(checkpoint: Checkpoint) -> None:
+    """Сохранение итоговой позиции с отметкой о завершении импорта"""
+    checkpoint.completed_at = datetime.now()
+    with db_manager.get_session() as session:
+        checkpoint.save(session)
+        session.commit()
+
+
+def unsent_notifications(
+    notification_ids: List[int]
+) -> List[Tuple[int, NotificationType, int]]:
+    """
+    Уведомления из списка, оставшиеся в статусе pending
+
+    Отложенные circuit breaker уведомления пропускаются: их отправляет
+    очередь отложенных уведомлений сервиса.
+
+    Returns:
+        Тройки (ID, тип, количество выполненных попыток)
+    """
+    if not notification_ids:
+        return []
+    with db_manager.get_session() as session:
+        rows = session.execute(
+            select(Notification.id, Notification.type, Notification.attempts)
+            .where(
+                Notification.id.in_(notification_ids),
+                Notification.status == NotificationStatus.PENDING,
+                Notification.id.not_in(select(ParkedNotification.notification_id))
+            )
+            .order_by(Notification.id)
+        ).all()
+    return [(row.id, row.type, row.attempts) for row in rows]
+
+
+class ProgressReporter:
+    """Вывод прогресса и скорости импорта не чаще interval секунд"""
+
+    def __init__(self, interval: float, checkpoint: Checkpoint) -> None:
+        self.interval = interval
+        self.started_at = time.perf_counter()
+        self._last_report = self.started_at
+        self._initial_inserted = checkpoint.inserted
+
+    def report(
+        self,
+        checkpoint: Checkpoint,
+        stats: ImportStats,
+        final: bool = False
+    ) -> None:
+        now = time.perf_counter()
+        if not final and now - self._last_report < self.interval:
+            return
+        self._last_report = now
+        elapsed = now - self.started_at
+        inserted = checkpoint.inserted - self._initial_inserted
+        rate = inserted / elapsed if elapsed > 0 else 0.0
+        print(
+            f"{'done' if final else 'progress'}: line {checkpoint.line}, "
+            f"{stats.read} read, "
+            f"{checkpoint.inserted} inserted, {checkpoint.rejected} rejected, "
+            f"{rate:.0f} rows/s, {elapsed:.1f}s",
+            flush=True
+        )
+
+
+class Dispatcher:
+    """Отправка импортированных уведомлений с ограничением параллелизма"""
+
+    def __init__(self, concurrency: int) -> None:
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks = set()
+        self._unsent: Set[int] = set()
+        self.sent = 0
+        self.failed = 0
+
+    def unsent(self) -> List[int]:
+        """ID уведомлений, отправка которых еще не завершилась"""
+        return sorted(self._unsent)
+
+    async def submit(
+        self,
+        notification_id: int,
+        notification_type: NotificationType,
+        start_attempt: Optional[int] = None
+    ) -> None:
+        """Запуск отправки; ждет, пока освободится место"""
+        self._unsent.add(notification_id)
+        await self._semaphore.acquire()
+        task = asyncio.create_task(
+            self._send(notification_id, notification_type, start_attempt)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(
+        self,
+        notification_id: int,
+        notification_type: NotificationType,
+        start_attempt: Optional[int]
+    ) -> None:
+        try:
+            status = await NotificationService.send_notification(
+                notification_id, notification_type, start_attempt
+            )
+        finally:
+            self._semaphore.release()
+        self._unsent.discard(notification_id)
+        if status == NotificationStatus.SENT:
+            self.sent += 1
+        elif status == NotificationStatus.FAILED:
+            self.failed += 1
+
+    async def wait(self) -> None:
+        """Ожидание завершения всех отправок"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+
+def detect_format(path: str, requested: Optional[str]) -> str:
+    """Формат файла из аргумента или по расширению"""
+    if requested:
+        return requested
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("ndjson", "jsonl"):
+        return "ndjson"
+    return "csv"
+
+
+async def run_import(
+    path: str,
+    file_format: Optional[str] = None,
+    chunk_size: int = settings.IMPORT_CHUNK_SIZE,
+    send: bool = False,
+    send_concurrency: int = settings.IMPORT_SEND_CONCURRENCY,
+    restart: bool = False,
+    errors_path: Optional[str] = None,
+    progress_interval: float = settings.IMPORT_PROGRESS_INTERVAL
+) -> Checkpoint:
+    """
+    Импорт файла уведомлений
+
+    Args:
+        path: Путь к CSV или NDJSON файлу
+        file_format: csv или ndjson (по умолчанию по расширению)
+        chunk_size: Количество строк в одной транзакции
+        send: Отправлять импортированные уведомления
+        send_concurrency: Максимум одновременных отправок
+        restart: Начать сначала, сбросив сохраненную позицию
+        errors_path: Файл для некорректных строк (NDJSON)
+        progress_interval: Интервал вывода прогресса в секундах
+
+    Returns:
+        Итоговая позиция и счетчики импорта
+
+    Raises:
+        ValueError: Если файл изменился после начала импорта или
+            прерванный импорт с --send продолжается без --send
+    """
+    source = os.path.abspath(path)
+    fingerprint = await asyncio.to_thread(file_fingerprint, path)
+    checkpoint = await asyncio.to_thread(load_checkpoint, source, fingerprint, restart)
+    if checkpoint.completed_at is not None:
+        print(
+            f"{path} was already imported at "
+            f"{checkpoint.completed_at:%Y-%m-%d %H:%M:%S} ({checkpoint.inserted} "
+            f"inserted), run with --restart to import it again",
+            flush=True
+        )
+        return checkpoint
+    if checkpoint.unsent and not send:
+        # Без --send ID неотправленных уведомлений были бы потеряны
+        raise ValueError(
+            f"{len(checkpoint.unsent)} notification(s) of the interrupted import "
+            f"were not sent, resume it with --send"
+        )
+    if checkpoint.offset:
+        print(
+            f"Resuming {path} from line {checkpoint.line} "
+            f"({checkpoint.inserted} already inserted)",
+            flush=True
+        )
+
+    file_format = detect_format(path, file_format)
+    stats = ImportStats(rejected=checkpoint.rejected)
+    reporter = ProgressReporter(progress_interval, checkpoint)
+    dispatcher = Dispatcher(send_concurrency) if send else None
+
+    if checkpoint.unsent:
+        # Отправка уведомлений, прерванная остановкой, - со следующей попытки
+        unsent = await asyncio.to_thread(unsent_notifications, checkpoint.unsent)
+        print(f"Re-sending {len(unsent)} unsent notification(s)", flush=True)
+        for notification_id, notification_type, attempts in unsent:
+            await dispatcher.submit(
+                notification_id,
+                notification_type,
+                min(attempts + 1, settings.RETRY_MAX_ATTEMPTS)
+            )
+
+    errors_file = (
+        open(errors_path, "a", encoding="utf-8") if errors_path else None
+    )
+    try:
+        with open(path, "rb") as source_file:
+            reader = SourceReader(source_file, checkpoint.offset, checkpoint.line)
+            records = read_csv(reader) if file_format == "csv" else read_ndjson(reader)
+            notifications = validate(records, stats, errors_file)
+
+            for chunk in chunked(notifications, chunk_size):
+                progress = replace(
+                    checkpoint,
+                    offset=reader.offset,
+                    line=reader.line,
+                    rejected=stats.rejected,
+                    unsent=dispatcher.unsent() if dispatcher is not None else []
+                )
+                ids = await asyncio.to_thread(
+                    insert_chunk, chunk, progress, dispatcher is not None
+                )
+                checkpoint = progress
+                if errors_file is not None:
+                    errors_file.flush()
+                reporter.report(checkpoint, stats)
+
+                if dispatcher is not None:
+                    for notification_id, notification_data in zip(ids, chunk):
+                        await dispatcher.submit(notification_id, notification_data.type)
+
+            checkpoint.offset = reader.offset
+            checkpoint.line = reader.line
+            checkpoint.rejected = stats.rejected
+    finally:
+        if errors_file is not None:
+            errors_file.close()
+
+    if dispatcher is not None:
+        await dispatcher.wait()
+        print(f"sent: {dispatcher.sent}, failed: {dispatcher.failed}", flush=True)
+
+    reporter.report(checkpoint, stats, final=True)
+    checkpoint.unsent = []
+    await asyncio.to_thread(complete_checkpoint, checkpoint)
+    return checkpoint
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("path", help="CSV или NDJSON файл")
+    parser.add_argument("--format", choices=FORMATS, default=None)
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    parser.add_argument(
+        "--send", action="store_true", help="Отправить импортированные уведомления"
+    )
+    parser.add_argument(
+        "--send-concurrency", type=int, default=settings.IMPORT_SEND_CONCURRENCY
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Импортировать файл с начала, сбросив позицию (и отметку о завершении)"
+    )
+    parser.add_argument(
+        "--errors", default=None, help="NDJSON файл для некорректных строк"
+    )
+    args = parser.parse_args()
+
+    db_manager.init()
+    try:
+        asyncio.run(run_import(
+            args.path,
+            file_format=args.format,
+            chunk_size=args.chunk_size,
+            send=args.send,
+            send_concurrency=args.send_concurrency,
+            restart=args.restart,
+            errors_path=args.errors
+        ))
+    except KeyboardInterrupt:
+        logger.warning("Import interrupted, run the same command again to resume")
+        sys.exit(1)
+    except ValueError as e:
+        logger.error(f"Import failed: {e}")
+        sys.exit(1)
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    main()
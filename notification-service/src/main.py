@@ -1,5 +1,5 @@
 """Главный файл приложения FastAPI"""
-import time
+import asyncio
 import signal
 import sys
 from contextlib import asynccontextmanager
@@ -9,11 +9,22 @@ from fastapi.responses import JSONResponse
 
 from core.settings import settings
 from core.database import db_manager
+from core.middleware import RequestLoggingMiddleware
+from core.loop_monitor import loop_monitor
+from core.profiling import ProfilingMiddleware
+from core.compression import CompressionMiddleware
 from core.constants import (
     HTTP_STATUS_INTERNAL_SERVER_ERROR,
     EXIT_CODE_SUCCESS
 )
 from routers.notifications import router as notifications_router
+from routers.metrics import router as metrics_router
+from routers.admin import router as admin_router
+from routers.campaigns import router as campaigns_router
+from services.notification_service import NotificationService
+from services.campaign_service import CampaignService
+from services.stats_service import StatsService
+from services.retention_service import RetentionService
 from logger import logger
 
 
@@ -25,15 +36,52 @@ async def lifespan(app: FastAPI):
     """
     logger.info("Starting notification service...")
     db_manager.init()
+    with db_manager.get_session() as session:
+        StatsService.rebuild_counters(session)
     logger.info(
         f"Notification service started successfully. "
         f"Access the API at http://localhost:{settings.APP_PORT} "
         f"or http://{settings.LOCALHOST_IP}:{settings.APP_PORT}"
     )
 
+    retention_task = None
+    if settings.RETENTION_ENABLED:
+        retention_task = asyncio.create_task(RetentionService.run_periodically())
+
+    # Уведомления, отложенные до перезапуска, возвращаются в очередь
+    restored_parked = NotificationService.restore_parked()
+    drain_task = None
+    if settings.BREAKER_ENABLED or restored_parked:
+        drain_task = asyncio.create_task(NotificationService.drain_parked())
+
+    replica_health_task = None
+    if settings.DATABASE_REPLICA_URLS:
+        replica_health_task = asyncio.create_task(
+            db_manager.run_replica_health_checks()
+        )
+
+    # Кампании, прерванные перезапуском, продолжаются с сохраненного курсора
+    CampaignService.resume_running()
+
+    loop_monitor_task = None
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor_task = asyncio.create_task(loop_monitor.run())
+        if settings.LOOP_BLOCKING_DETECTOR_ENABLED:
+            loop_monitor.start_watchdog()
+
     yield
 
     logger.info("Shutting down notification service...")
+    if retention_task:
+        retention_task.cancel()
+    if drain_task:
+        drain_task.cancel()
+    if replica_health_task:
+        replica_health_task.cancel()
+    if loop_monitor_task:
+        loop_monitor.stop_watchdog()
+        loop_monitor_task.cancel()
+    await CampaignService.stop_all()
     db_manager.close()
     logger.info("Notification service stopped")
 
@@ -47,6 +95,11 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+if settings.PROFILING_ENABLED:
+    # Добавляется первым, чтобы профиль не включал остальные middleware
+    app.add_middleware(ProfilingMiddleware)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -54,58 +107,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """
-    Middleware для логирования HTTP запросов
-    Логирует метод, путь, статус код и время обработки
-    """
-    start_time = time.time()
-
-    logger.info(
-        f"Incoming request: {request.method} {request.url.path}",
-        extra={
-            "method": request.method,
-            "path": request.url.path,
-            "client": request.client.host if request.client else None
-        }
-    )
-
-    try:
-        response = await call_next(request)
-        process_time = time.time() - start_time
-
-        time_format = f".{settings.TIME_FORMAT_DECIMAL_PLACES}f"
-        logger.info(
-            f"Request completed: {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - Time: {format(process_time, time_format)}s",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "process_time": process_time
-            }
-        )
-
-        return response
-
-    except Exception as e:
-        process_time = time.time() - start_time
-        time_format = f".{settings.TIME_FORMAT_DECIMAL_PLACES}f"
-        logger.error(
-            f"Request failed: {request.method} {request.url.path} - "
-            f"Error: {str(e)} - Time: {format(process_time, time_format)}s",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "error": str(e),
-                "process_time": process_time
-            },
-            exc_info=True
-        )
-        raise
+app.add_middleware(RequestLoggingMiddleware)
 
 
 @app.exception_handler(Exception)
@@ -123,6 +125,9 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 
 app.include_router(notifications_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
+app.include_router(campaigns_router)
 
 
 @app.get("/", tags=["health"])
@@ -1,4 +1,25 @@
 """Модели базы данных"""
 from models.notification import Notification
+from models.notification_stats import NotificationCounter, UserNotificationVersion
+from models.notification_timing import NotificationTiming
+from models.campaign import (
+    Campaign,
+    CampaignNotification,
+    CampaignRecipient,
+    CampaignStatus
+)
+from models.import_progress import ImportProgress
+from models.parked_notification import ParkedNotification
 
-__all__ = ["Notification"]
+__all__ = [
+    "Notification",
+    "NotificationCounter",
+    "UserNotificationVersion",
+    "NotificationTiming",
+    "Campaign",
+    "CampaignRecipient",
+    "CampaignNotification",
+    "CampaignStatus",
+    "ImportProgress",
+    "ParkedNotification",
+]
@@ -0,0 +1,89 @@
+"""Модели рассылок (кампаний) уведомлений"""
+from datetime import datetime
+from enum import Enum
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, Integer, String
+
+from core.database import Base
+from models.notification import NotificationType
+
+
+class CampaignStatus(str, Enum):
+    """Статус кампании"""
+    DRAFT = "draft"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Campaign(Base):
+    """
+    Кампания: одно сообщение для списка получателей
+
+    Счетчики прогресса и курсор (последний обработанный user_id)
+    обновляются после каждой пачки в той же транзакции, что и вставка
+    уведомлений, поэтому после перезапуска кампания продолжается без
+    повторного создания уведомлений.
+    """
+    __tablename__ = "campaigns"
+    __table_args__ = {'extend_existing': True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    message = Column(String, nullable=False)
+    type = Column(SQLEnum(NotificationType), nullable=False)
+    status = Column(SQLEnum(CampaignStatus), default=CampaignStatus.DRAFT, nullable=False)
+    total_recipients = Column(Integer, default=0, nullable=False)
+    created_count = Column(Integer, default=0, nullable=False)
+    dispatched_count = Column(Integer, default=0, nullable=False)
+    sent_count = Column(Integer, default=0, nullable=False)
+    failed_count = Column(Integer, default=0, nullable=False)
+    cursor_user_id = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<Campaign(id={self.id}, type={self.type}, status={self.status}, "
+            f"created={self.created_count}/{self.total_recipients})>"
+        )
+
+
+class CampaignRecipient(Base):
+    """
+    Промежуточная таблица получателей кампании
+
+    Первичный ключ (campaign_id, user_id) убирает повторы при загрузке
+    и задает порядок, по которому кампания идет пачками.
+    """
+    __tablename__ = "campaign_recipients"
+    __table_args__ = {'extend_existing': True}
+
+    campaign_id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, primary_key=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<CampaignRecipient(campaign_id={self.campaign_id}, "
+            f"user_id={self.user_id})>"
+        )
+
+
+class CampaignNotification(Base):
+    """
+    Уведомления, созданные кампанией
+
+    Записывается в одной транзакции с пачкой уведомлений. По этой связи
+    после перезапуска находятся уведомления кампании, оставшиеся в статусе
+    pending, и считаются итоговые счетчики.
+    """
+    __tablename__ = "campaign_notifications"
+    __table_args__ = {'extend_existing': True}
+
+    campaign_id = Column(Integer, primary_key=True)
+    notification_id = Column(Integer, primary_key=True, index=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<CampaignNotification(campaign_id={self.campaign_id}, "
+            f"notification_id={self.notification_id})>"
+        )
@@ -0,0 +1,39 @@
+"""Модель позиции импорта уведомлений из файла"""
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text
+
+from core.database import Base
+
+
+class ImportProgress(Base):
+    """
+    Позиция прерываемого импорта файла
+
+    Обновляется в транзакции записи каждой пачки, поэтому позиция
+    всегда соответствует уже записанным уведомлениям: после сбоя пачка
+    не импортируется повторно. fingerprint - размер и хеш начала файла,
+    по которым обнаруживается замена файла по тому же пути. unsent_ids -
+    ID уведомлений через запятую, отправка которых еще не завершилась
+    (при импорте с --send). После завершения импорта строка остается с
+    completed_at, чтобы повторный запуск не импортировал файл еще раз.
+    """
+    __tablename__ = "import_progress"
+    __table_args__ = {'extend_existing': True}
+
+    source = Column(String, primary_key=True)
+    offset = Column(BigInteger, nullable=False, default=0)
+    line = Column(Integer, nullable=False, default=0)
+    inserted = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    unsent_ids = Column(Text, nullable=False, default="")
+    fingerprint = Column(String, nullable=False, default="")
+    completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(
+        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ImportProgress(source={self.source!r}, line={self.line}, "
+            f"inserted={self.inserted})>"
+        )
@@ -0,0 +1,47 @@
+"""Модели агрегированной статистики уведомлений"""
+from sqlalchemy import Column, Integer, Enum as SQLEnum
+
+from core.database import Base
+from models.notification import NotificationType, NotificationStatus
+
+
+class NotificationCounter(Base):
+    """
+    Счетчик уведомлений пользователя в разрезе типа и статуса
+
+    Поддерживается инкрементально при создании уведомления и при каждой
+    смене статуса, поэтому чтение статистики не требует сканирования истории.
+    """
+    __tablename__ = "notification_counters"
+    __table_args__ = {'extend_existing': True}
+
+    user_id = Column(Integer, primary_key=True)
+    type = Column(SQLEnum(NotificationType), primary_key=True)
+    status = Column(SQLEnum(NotificationStatus), primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<NotificationCounter(user_id={self.user_id}, type={self.type}, "
+            f"status={self.status}, count={self.count})>"
+        )
+
+
+class UserNotificationVersion(Base):
+    """
+    Версия истории уведомлений пользователя
+
+    Увеличивается при любом изменении уведомлений пользователя и
+    используется для формирования ETag без чтения самих уведомлений.
+    """
+    __tablename__ = "notification_user_versions"
+    __table_args__ = {'extend_existing': True}
+
+    user_id = Column(Integer, primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<UserNotificationVersion(user_id={self.user_id}, "
+            f"version={self.version})>"
+        )
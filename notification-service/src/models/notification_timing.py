@@ -0,0 +1,38 @@
+"""Модель временных меток жизненного цикла уведомления"""
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, Index, Integer, String
+
+from core.database import Base
+from models.notification import NotificationType, NotificationStatus
+
+
+class NotificationTiming(Base):
+    """
+    Временные метки доставки уведомления
+
+    Записывается одной строкой при завершении отправки (sent или failed).
+    Позволяет разделить ожидание в очереди, время попыток и паузы между
+    ними. Длительности попыток хранятся компактно: миллисекунды через
+    запятую. Тип и статус продублированы из уведомления, чтобы считать
+    перцентили по каналу без соединения с таблицей уведомлений.
+    """
+    __tablename__ = "notification_timings"
+    __table_args__ = (
+        Index("ix_notification_timings_type_completed_at", "type", "completed_at"),
+        {'extend_existing': True},
+    )
+
+    notification_id = Column(Integer, primary_key=True)
+    type = Column(SQLEnum(NotificationType), nullable=False)
+    status = Column(SQLEnum(NotificationStatus), nullable=False)
+    dispatch_started_at = Column(DateTime, nullable=False)
+    first_attempt_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=False, index=True)
+    queue_wait_ms = Column(Integer, nullable=False)
+    end_to_end_ms = Column(Integer, nullable=False)
+    attempt_durations_ms = Column(String, nullable=False, default="")
+
+    def __repr__(self) -> str:
+        return (
+            f"<NotificationTiming(notification_id={self.notification_id}, "
+            f"status={self.status}, end_to_end_ms={self.end_to_end_ms})>"
+        )
@@ -0,0 +1,29 @@
+"""Модель уведомлений, отложенных circuit breaker"""
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, Integer
+
+from core.database import Base
+from models.notification import NotificationType
+
+
+class ParkedNotification(Base):
+    """
+    Уведомление, отложенное из-за разомкнутого circuit breaker
+
+    Дублирует очередь отложенных уведомлений в памяти, чтобы она
+    восстанавливалась после перезапуска. Строка удаляется вместе с
+    записью итогового статуса уведомления.
+    """
+    __tablename__ = "parked_notifications"
+    __table_args__ = {'extend_existing': True}
+
+    notification_id = Column(Integer, primary_key=True)
+    type = Column(SQLEnum(NotificationType), nullable=False)
+    attempt = Column(Integer, nullable=False)
+    parked_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ParkedNotification(notification_id={self.notification_id}, "
+            f"type={self.type}, attempt={self.attempt})>"
+        )
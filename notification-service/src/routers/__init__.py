@@ -1,4 +1,7 @@
 """Роутеры API"""
 from routers.notifications import router as notifications_router
+from routers.metrics import router as metrics_router
+from routers.admin import router as admin_router
+from routers.campaigns import router as campaigns_router
 
-__all__ = ["notifications_router"]
+__all__ = ["notifications_router", "metrics_router", "admin_router", "campaigns_router"]
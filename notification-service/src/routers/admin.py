@@ -0,0 +1,167 @@
+"""Роутер административных эндпоинтов профилирования"""
+import asyncio
+from typing import Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+
+from core.constants import (
+    HTTP_STATUS_FORBIDDEN,
+    HTTP_STATUS_NOT_FOUND,
+    HTTP_STATUS_CONFLICT
+)
+from core.profiling import (
+    ProfiledRoute,
+    is_admin,
+    profile_store,
+    sampling_profiler
+)
+from core.settings import settings
+from logger import logger
+
+
+def require_admin(
+    x_admin_token: Optional[str] = Header(default=None)
+) -> None:
+    """
+    Проверка доступа к административным эндпоинтам
+
+    Raises:
+        HTTPException: 404, если профилирование выключено; 403 при неверном токене
+    """
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=HTTP_STATUS_NOT_FOUND, detail="Not Found")
+    if not is_admin(x_admin_token):
+        raise HTTPException(
+            status_code=HTTP_STATUS_FORBIDDEN,
+            detail="Admin token required"
+        )
+
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+    route_class=ProfiledRoute
+)
+
+
+def pstats_response(data: bytes, filename: str) -> Response:
+    """Ответ с файлом в формате pstats"""
+    return Response(
+        content=data,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get(
+    "/profiles",
+    summary="Список профилей запросов",
+    description=(
+        "Возвращает последние профили запросов, выполненных с заголовком X-Profile"
+    )
+)
+async def list_profiles() -> List[Dict[str, Any]]:
+    """
+    Список сохраненных профилей запросов
+
+    Returns:
+        Краткое описание профилей, начиная с последнего
+    """
+    return profile_store.list()
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    summary="Профиль запроса",
+    description=(
+        "Возвращает профиль запроса в виде текстового отчета pstats "
+        "или файла pstats для snakeviz/pstats"
+    )
+)
+async def get_profile(
+    profile_id: str,
+    output_format: Literal["text", "pstats"] = Query(
+        default="text", alias="format", description="Формат: text или pstats"
+    ),
+    sort: str = Query(default="cumulative", description="Сортировка текстового отчета"),
+    limit: int = Query(default=50, ge=1, description="Количество строк отчета")
+) -> Response:
+    """
+    Получение профиля запроса
+
+    Args:
+        profile_id: ID профиля из заголовка X-Profile-Id
+        output_format: Формат ответа
+        sort: Ключ сортировки pstats
+        limit: Количество строк текстового отчета
+
+    Returns:
+        Текстовый отчет или файл pstats
+
+    Raises:
+        HTTPException: 404, если профиль не найден
+    """
+    request_profile = profile_store.get(profile_id)
+    if request_profile is None:
+        raise HTTPException(
+            status_code=HTTP_STATUS_NOT_FOUND,
+            detail="Profile not found"
+        )
+
+    if output_format == "pstats":
+        return pstats_response(
+            request_profile.dump_pstats(), f"request-{profile_id}.pstats"
+        )
+    return PlainTextResponse(request_profile.render_text(sort, limit))
+
+
+@router.post(
+    "/profile/sample",
+    summary="Сэмплирование процесса",
+    description=(
+        "Снимает стеки всех потоков процесса в течение duration секунд и "
+        "возвращает collapsed stacks или файл pstats"
+    )
+)
+async def sample_process(
+    duration: float = Query(
+        default=5.0,
+        gt=0,
+        le=settings.PROFILING_SAMPLE_MAX_DURATION,
+        description="Длительность сэмплирования в секундах"
+    ),
+    output_format: Literal["collapsed", "pstats"] = Query(
+        default="collapsed", alias="format", description="Формат: collapsed или pstats"
+    )
+) -> Response:
+    """
+    Статистическое профилирование всего процесса
+
+    Сэмплирование выполняется в отдельном потоке, event loop продолжает
+    обслуживать запросы и попадает в результат.
+
+    Args:
+        duration: Длительность сэмплирования
+        output_format: Формат ответа
+
+    Returns:
+        Collapsed stacks (text/plain) или файл pstats
+
+    Raises:
+        HTTPException: 409, если уже идет другой сеанс сэмплирования
+    """
+    logger.info(f"Sampling profiler started for {duration}s")
+    result = await asyncio.to_thread(
+        sampling_profiler.sample, duration, settings.PROFILING_SAMPLE_INTERVAL
+    )
+    if result is None:
+        raise HTTPException(
+            status_code=HTTP_STATUS_CONFLICT,
+            detail="Sampling profiler is already running"
+        )
+
+    logger.info(f"Sampling profiler finished: {result.samples} samples")
+    if output_format == "pstats":
+        return pstats_response(result.dump_pstats(), "sample.pstats")
+    return PlainTextResponse(result.collapsed())
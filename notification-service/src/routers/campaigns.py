@@ -0,0 +1,180 @@
+"""Роутер для работы с кампаниями (массовыми рассылками)"""
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+
+from core.database import get_db
+from core.profiling import ProfiledRoute
+from core.constants import (
+    HTTP_STATUS_BAD_REQUEST,
+    HTTP_STATUS_NOT_FOUND,
+    HTTP_STATUS_CONFLICT
+)
+from models.campaign import Campaign, CampaignStatus
+from schemas.campaign import CampaignCreate, CampaignResponse, CampaignUploadResponse
+from services.campaign_service import CampaignService
+
+router = APIRouter(
+    prefix="/api/campaigns",
+    tags=["campaigns"],
+    route_class=ProfiledRoute
+)
+
+
+def get_campaign(campaign_id: int, db: Session) -> Campaign:
+    """
+    Получение кампании по ID
+
+    Raises:
+        HTTPException: 404, если кампания не найдена
+    """
+    campaign = db.get(Campaign, campaign_id)
+    if campaign is None:
+        raise HTTPException(
+            status_code=HTTP_STATUS_NOT_FOUND,
+            detail="Campaign not found"
+        )
+    return campaign
+
+
+def require_draft(campaign: Campaign) -> None:
+    """
+    Проверка, что кампания еще не запущена
+
+    Raises:
+        HTTPException: 409, если кампания уже запущена или завершена
+    """
+    if campaign.status != CampaignStatus.DRAFT:
+        raise HTTPException(
+            status_code=HTTP_STATUS_CONFLICT,
+            detail=f"Campaign is already {campaign.status.value}"
+        )
+
+
+@router.post(
+    "",
+    response_model=CampaignResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Создать кампанию",
+    description=(
+        "Создает рассылку одного сообщения списку получателей. Если user_ids "
+        "переданы, отправка начинается сразу; иначе кампания создается в "
+        "статусе draft для загрузки файла получателей"
+    )
+)
+async def create_campaign(
+    campaign_data: CampaignCreate,
+    db: Session = Depends(get_db)
+) -> CampaignResponse:
+    """
+    Создание кампании
+
+    Уведомления создаются не в запросе, а фоновой задачей пачками
+    INSERT ... SELECT из таблицы получателей; прогресс доступен через
+    GET /api/campaigns/{id}.
+
+    Args:
+        campaign_data: Сообщение, тип и (необязательно) получатели
+        db: Сессия базы данных
+
+    Returns:
+        Созданная кампания
+    """
+    campaign = CampaignService.create_campaign(campaign_data, db)
+    if campaign.status == CampaignStatus.RUNNING:
+        CampaignService.start(campaign.id)
+    return CampaignResponse.model_validate(campaign)
+
+
+@router.post(
+    "/{campaign_id}/recipients",
+    response_model=CampaignUploadResponse,
+    summary="Загрузить получателей",
+    description=(
+        "Принимает файл с ID получателей (через пробел, перевод строки, "
+        "запятую или точку с запятой) в теле запроса. Файл читается потоком, "
+        "загрузку можно повторять, пока кампания в статусе draft"
+    )
+)
+async def upload_recipients(
+    campaign_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+) -> CampaignUploadResponse:
+    """
+    Потоковая загрузка получателей кампании
+
+    Args:
+        campaign_id: ID кампании
+        request: Запрос с файлом в теле
+        db: Сессия базы данных
+
+    Returns:
+        Количество принятых и пропущенных значений
+
+    Raises:
+        HTTPException: 404, если кампания не найдена; 409, если она уже запущена
+    """
+    require_draft(get_campaign(campaign_id, db))
+    db.close()
+
+    accepted, rejected, total = await CampaignService.upload_recipients(
+        campaign_id, request.stream()
+    )
+    return CampaignUploadResponse(
+        campaign_id=campaign_id,
+        accepted=accepted,
+        rejected=rejected,
+        total_recipients=total
+    )
+
+
+@router.post(
+    "/{campaign_id}/start",
+    response_model=CampaignResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Запустить кампанию",
+    description="Запускает отправку кампании с загруженными получателями"
+)
+async def start_campaign(
+    campaign_id: int,
+    db: Session = Depends(get_db)
+) -> CampaignResponse:
+    """
+    Запуск кампании в статусе draft
+
+    Raises:
+        HTTPException: 404, если кампания не найдена; 409, если она уже
+            запущена; 400, если получатели не загружены
+    """
+    campaign = get_campaign(campaign_id, db)
+    require_draft(campaign)
+    if not campaign.total_recipients:
+        raise HTTPException(
+            status_code=HTTP_STATUS_BAD_REQUEST,
+            detail="Campaign has no recipients"
+        )
+
+    campaign.status = CampaignStatus.RUNNING
+    db.commit()
+    db.refresh(campaign)
+    CampaignService.start(campaign.id)
+    return CampaignResponse.model_validate(campaign)
+
+
+@router.get(
+    "/{campaign_id}",
+    response_model=CampaignResponse,
+    summary="Состояние кампании",
+    description="Возвращает статус и счетчики прогресса кампании"
+)
+def get_campaign_progress(
+    campaign_id: int,
+    db: Session = Depends(get_db)
+) -> CampaignResponse:
+    """
+    Получение прогресса кампании
+
+    Raises:
+        HTTPException: 404, если кампания не найдена
+    """
+    return CampaignResponse.model_validate(get_campaign(campaign_id, db))
@@ -0,0 +1,103 @@
+"""Роутер для метрик и мониторинга сервиса"""
+from datetime import datetime, timedelta
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from core.circuit_breaker import circuit_breakers
+from core.database import get_read_db
+from core.loop_monitor import loop_monitor
+from core.profiling import ProfiledRoute
+from core.settings import settings
+from models.notification import NotificationType
+from services.notification_service import NotificationService
+from services.timing_service import TimingService
+
+router = APIRouter(
+    prefix="/api/metrics",
+    tags=["metrics"],
+    route_class=ProfiledRoute
+)
+
+
+@router.get(
+    "/breakers",
+    summary="Состояние circuit breaker",
+    description=(
+        "Возвращает состояние circuit breaker каждого канала доставки "
+        "и количество отложенных уведомлений"
+    )
+)
+async def get_breakers() -> Dict[str, Any]:
+    """
+    Состояние circuit breaker каналов доставки
+
+    Returns:
+        Состояние breaker и количество отложенных уведомлений по каналам
+    """
+    for notification_type in NotificationType:
+        circuit_breakers.get(notification_type.value)
+
+    return {
+        "breakers": circuit_breakers.snapshot(),
+        "parked": NotificationService.parked_counts()
+    }
+
+
+@router.get(
+    "/event-loop",
+    summary="Задержка event loop",
+    description=(
+        "Возвращает гистограмму задержки планирования event loop и отчеты "
+        "о блокировках со стеком вызовов (в отладочном режиме)"
+    )
+)
+async def get_event_loop() -> Dict[str, Any]:
+    """
+    Метрики задержки event loop и обнаруженных блокировок
+
+    Returns:
+        Гистограмма задержки и последние отчеты о блокировках
+    """
+    return loop_monitor.snapshot()
+
+
+@router.get(
+    "/latency",
+    summary="Перцентили времени доставки",
+    description=(
+        "Возвращает перцентили времени от создания до отправки уведомления "
+        "и ожидания в очереди по каналам, а также долю уведомлений, "
+        "доставленных быстрее порога SLO"
+    )
+)
+def get_latency(
+    window_minutes: int = Query(
+        default=settings.LATENCY_WINDOW_MINUTES,
+        ge=1,
+        description="Учитываются уведомления, завершенные за последние N минут"
+    ),
+    threshold_ms: int = Query(
+        default=settings.LATENCY_SLO_THRESHOLD_MS,
+        ge=0,
+        description="Порог SLO в миллисекундах"
+    ),
+    db: Session = Depends(get_read_db)
+) -> Dict[str, Any]:
+    """
+    Перцентили времени доставки по каналам
+
+    Args:
+        window_minutes: Окно в минутах
+        threshold_ms: Порог SLO в миллисекундах
+        db: Сессия базы данных
+
+    Returns:
+        Окно, порог и сводка по каналам
+    """
+    since = datetime.now() - timedelta(minutes=window_minutes)
+    return {
+        "window_minutes": window_minutes,
+        "threshold_ms": threshold_ms,
+        "channels": TimingService.latency_summary(db, since, threshold_ms),
+    }
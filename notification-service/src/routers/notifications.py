@@ -1,19 +1,178 @@
 """Роутер для работы с уведомлениями"""
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, status
+import json
+import math
+import zlib
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    BackgroundTasks,
+    Query,
+    Request,
+    Response,
+    status
+)
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
-from core.database import get_db
-from models.notification import NotificationStatus
+from core.database import db_manager, get_db, get_read_db
+from core.profiling import ProfiledRoute
+from core.pubsub import event_bus
+from core.rate_limiter import rate_limiter
+from core.settings import settings
+from core.constants import (
+    HTTP_STATUS_NOT_MODIFIED,
+    HTTP_STATUS_BAD_REQUEST,
+    HTTP_STATUS_TOO_MANY_REQUESTS,
+    HTTP_STATUS_INTERNAL_SERVER_ERROR,
+    HTTP_STATUS_SERVICE_UNAVAILABLE
+)
+from models.notification import NotificationStatus, NotificationType
 from schemas.notification import (
     NotificationCreate,
     NotificationResponse,
     NotificationListResponse,
+    NotificationStatsResponse,
+    NotificationLookupRequest,
+    NotificationStatusRecord,
+    NotificationLookupResponse,
+    NOTIFICATION_FIELDS,
 )
+from services.coalescer import CoalesceMode
 from services.notification_service import NotificationService
+from services.retention_service import RetentionService
+from services.stats_service import StatsService
 from logger import logger
 
-router = APIRouter(prefix="/api/notifications", tags=["notifications"])
+router = APIRouter(
+    prefix="/api/notifications",
+    tags=["notifications"],
+    route_class=ProfiledRoute
+)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Разбор параметра fields со списком полей через запятую
+
+    Args:
+        fields: Значение query параметра
+
+    Returns:
+        Список полей в порядке запроса или None, если параметр не задан
+
+    Raises:
+        HTTPException: Если запрошены неизвестные поля
+    """
+    if fields is None:
+        return None
+
+    requested = list(dict.fromkeys(
+        field.strip() for field in fields.split(",") if field.strip()
+    ))
+    unknown = [field for field in requested if field not in NOTIFICATION_FIELDS]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=HTTP_STATUS_BAD_REQUEST,
+            detail=(
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Allowed: {', '.join(NOTIFICATION_FIELDS)}"
+            ) if unknown else "At least one field must be requested"
+        )
+    return requested
+
+
+def get_create_db() -> Generator[Optional[Session], None, None]:
+    """
+    Зависимость для получения сессии БД при создании уведомления
+
+    При group commit без объединения сессия запроса не нужна: уведомление
+    записывается пачкой в собственной сессии, поэтому сессия не открывается.
+    """
+    if settings.GROUP_COMMIT_ENABLED and settings.COALESCE_MODE == CoalesceMode.OFF:
+        yield None
+        return
+    yield from get_db()
+
+
+def creation_limit(notification_type: NotificationType) -> int:
+    """Лимит создания уведомлений пользователя за окно для типа"""
+    if notification_type == NotificationType.EMAIL:
+        return settings.RATE_LIMIT_EMAIL_PER_WINDOW
+    return settings.RATE_LIMIT_TELEGRAM_PER_WINDOW
+
+
+def check_rate_limit(notification_data: NotificationCreate) -> None:
+    """
+    Проверка ограничения частоты создания уведомлений пользователя
+
+    Args:
+        notification_data: Данные уведомления
+
+    Raises:
+        HTTPException: 429, если лимит для (user_id, type) исчерпан
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    allowed, retry_after = rate_limiter.hit(
+        (notification_data.user_id, notification_data.type),
+        creation_limit(notification_data.type)
+    )
+    if not allowed:
+        logger.warning(
+            f"Rate limit exceeded for user {notification_data.user_id} "
+            f"({notification_data.type.value})",
+            extra={"user_id": notification_data.user_id}
+        )
+        raise HTTPException(
+            status_code=HTTP_STATUS_TOO_MANY_REQUESTS,
+            detail="Too many notifications for this user, retry later",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+
+def build_etag(user_id: int, version: int, request: Request) -> str:
+    """
+    Формирование ETag истории пользователя
+
+    ETag зависит от версии истории и от параметров запроса, так как
+    разные фильтры и наборы полей дают разные представления.
+
+    Args:
+        user_id: ID пользователя
+        version: Версия истории уведомлений пользователя
+        request: HTTP запрос
+
+    Returns:
+        Слабый ETag
+    """
+    query = "&".join(sorted(
+        f"{key}={value}" for key, value in request.query_params.multi_items()
+    ))
+    return f'W/"{user_id}-{version}-{zlib.crc32(query.encode()):08x}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Проверка заголовка If-None-Match (слабое сравнение)
+
+    Args:
+        if_none_match: Значение заголовка If-None-Match
+        etag: Текущий ETag
+
+    Returns:
+        True, если у клиента актуальная версия
+    """
+    if not if_none_match:
+        return False
+    opaque_tag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque_tag:
+            return True
+    return False
 
 
 @router.post(
@@ -28,7 +187,8 @@ router = APIRouter(prefix="/api/notifications", tags=["notifications"])
 async def create_notification(
     notification_data: NotificationCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: Optional[Session] = Depends(get_create_db)
 ) -> NotificationResponse:
     """
     Создание нового уведомления
@@ -36,24 +196,55 @@ async def create_notification(
     Создает уведомление со статусом 'pending' и запускает асинхронную отправку.
     Клиент получает ответ сразу, не дожидаясь завершения отправки.
 
+    Если включено объединение (COALESCE_MODE), повтор сообщения или
+    сообщение, добавленное в дайджест, не создает новой записи: возвращается
+    существующее уведомление со статусом ответа 200.
+
     Args:
         notification_data: Данные уведомления
         background_tasks: Фоновые задачи FastAPI
-        db: Сессия базы данных
+        response: Ответ (для статуса объединенного уведомления)
+        db: Сессия базы данных (None при group commit без объединения)
 
     Returns:
         Созданное уведомление со статусом 'pending'
+
+    Raises:
+        HTTPException: 429 при превышении лимита пользователя для типа
     """
+    coalesced = (
+        NotificationService.find_coalesced(notification_data, db)
+        if db is not None else None
+    )
+    if coalesced is not None:
+        response.status_code = status.HTTP_200_OK
+        return NotificationResponse.model_validate(coalesced)
+
+    check_rate_limit(notification_data)
+
     try:
-        notification = NotificationService.create_notification(
-            notification_data, db
-        )
+        if settings.GROUP_COMMIT_ENABLED:
+            notification = await NotificationService.create_notification_grouped(
+                notification_data
+            )
+        else:
+            notification = NotificationService.create_notification(
+                notification_data, db
+            )
 
-        background_tasks.add_task(
-            NotificationService.send_notification,
-            notification.id,
-            notification.type
-        )
+        if NotificationService.register_for_coalescing(notification):
+            background_tasks.add_task(
+                NotificationService.send_digest,
+                notification.id,
+                notification.type,
+                notification.user_id
+            )
+        else:
+            background_tasks.add_task(
+                NotificationService.send_notification,
+                notification.id,
+                notification.type
+            )
 
         logger.info(
             f"Notification {notification.id} created and queued for sending",
@@ -73,32 +264,141 @@ async def create_notification(
         )
 
 
+@router.post(
+    "/lookup",
+    response_model=NotificationLookupResponse,
+    summary="Получить статусы уведомлений по ID",
+    description=(
+        "Возвращает компактные записи о статусах уведомлений по списку ID "
+        "одним запросом по первичному ключу"
+    )
+)
+def lookup_notifications(
+    lookup_data: NotificationLookupRequest,
+    db: Session = Depends(get_read_db)
+) -> NotificationLookupResponse:
+    """
+    Массовая проверка статусов уведомлений
+
+    Читает с реплики; ID, которых на реплике еще нет (только что созданные
+    уведомления), дочитываются с основной БД.
+
+    Args:
+        lookup_data: Список ID уведомлений
+        db: Сессия базы данных
+
+    Returns:
+        Найденные уведомления в порядке запроса и список ненайденных ID
+    """
+    notification_ids = list(dict.fromkeys(lookup_data.ids))
+
+    try:
+        rows = NotificationService.get_notifications_by_ids(notification_ids, db)
+        if len(rows) < len(notification_ids) and db_manager.is_replica_session(db):
+            with db_manager.get_session() as primary:
+                rows.update(NotificationService.get_notifications_by_ids(
+                    [
+                        notification_id for notification_id in notification_ids
+                        if notification_id not in rows
+                    ],
+                    primary
+                ))
+
+        return NotificationLookupResponse(
+            notifications=[
+                NotificationStatusRecord.model_validate(rows[notification_id])
+                for notification_id in notification_ids
+                if notification_id in rows
+            ],
+            missing=[
+                notification_id for notification_id in notification_ids
+                if notification_id not in rows
+            ]
+        )
+
+    except Exception as e:
+        logger.error(f"Error looking up notifications: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to look up notifications"
+        )
+
+
 @router.get(
     "/{user_id}",
     response_model=NotificationListResponse,
     summary="Получить историю уведомлений",
     description=(
         "Возвращает список уведомлений пользователя с возможностью "
-        "фильтрации по статусу"
+        "фильтрации по статусу, выбора полей и чтения архивной истории"
     )
 )
 def get_notifications(
     user_id: int,
+    request: Request,
+    response: Response,
     status: Optional[NotificationStatus] = None,
-    db: Session = Depends(get_db)
+    include_archived: bool = False,
+    fields: Optional[str] = Query(
+        default=None,
+        description=(
+            "Список возвращаемых полей через запятую, например id,status,type"
+        )
+    ),
+    db: Session = Depends(get_read_db)
 ) -> NotificationListResponse:
     """
     Получение истории уведомлений пользователя
 
+    Если передан параметр fields, из базы выбираются только запрошенные
+    колонки, а ответ сериализуется напрямую, без ORM объектов и Pydantic.
+
+    Ответ содержит ETag на основе версии истории пользователя. Если клиент
+    присылает совпадающий If-None-Match, возвращается 304 без чтения
+    и сериализации уведомлений.
+
     Args:
         user_id: ID пользователя
+        request: HTTP запрос
+        response: HTTP ответ
         status: Опциональный фильтр по статусу (pending, sent, failed)
+        include_archived: Добавить уведомления из архива
+        fields: Опциональный список полей через запятую
         db: Сессия базы данных
 
     Returns:
         Список уведомлений пользователя
     """
+    requested_fields = parse_fields(fields)
+
     try:
+        version = StatsService.get_user_version(user_id, db)
+        etag = build_etag(user_id, version, request)
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(
+                status_code=HTTP_STATUS_NOT_MODIFIED, headers=cache_headers
+            )
+
+        if requested_fields:
+            items = NotificationService.get_user_notifications_projection(
+                user_id=user_id,
+                fields=requested_fields,
+                status=status,
+                db=db
+            )
+            if include_archived:
+                items.extend(
+                    {field: record[field] for field in requested_fields}
+                    for record in RetentionService.read_archived(
+                        user_id=user_id, status=status
+                    )
+                )
+            return JSONResponse(
+                content={"notifications": items, "total": len(items)},
+                headers=cache_headers
+            )
+
         notifications = NotificationService.get_user_notifications(
             user_id=user_id,
             status=status,
@@ -110,12 +410,21 @@ def get_notifications(
             for notification in notifications
         ]
 
+        if include_archived:
+            notification_responses.extend(
+                NotificationResponse(**record)
+                for record in RetentionService.read_archived(
+                    user_id=user_id, status=status
+                )
+            )
+
         logger.info(
             f"Retrieved {len(notification_responses)} notifications "
             f"for user {user_id}",
             extra={"user_id": user_id, "status": status}
         )
 
+        response.headers.update(cache_headers)
         return NotificationListResponse(
             notifications=notification_responses,
             total=len(notification_responses)
@@ -126,6 +435,113 @@ def get_notifications(
             f"Error retrieving notifications for user {user_id}: {e}"
         )
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=HTTP_STATUS_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve notifications"
         )
+
+
+@router.get(
+    "/{user_id}/stats",
+    response_model=NotificationStatsResponse,
+    summary="Получить статистику уведомлений",
+    description=(
+        "Возвращает количество уведомлений пользователя по статусам и типам "
+        "на основе инкрементально поддерживаемых счетчиков"
+    )
+)
+def get_notification_stats(
+    user_id: int,
+    db: Session = Depends(get_read_db)
+) -> NotificationStatsResponse:
+    """
+    Получение статистики уведомлений пользователя
+
+    Args:
+        user_id: ID пользователя
+        db: Сессия базы данных
+
+    Returns:
+        Количество уведомлений по статусам, типам и их сочетаниям
+    """
+    try:
+        stats = NotificationService.get_user_stats(user_id=user_id, db=db)
+        return NotificationStatsResponse(**stats)
+
+    except Exception as e:
+        logger.error(
+            f"Error retrieving notification stats for user {user_id}: {e}"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve notification stats"
+        )
+
+
+def format_sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Форматирование события в формате text/event-stream"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+@router.get(
+    "/{user_id}/events",
+    response_class=StreamingResponse,
+    summary="Поток событий уведомлений",
+    description=(
+        "Server-Sent Events поток со сменой статусов уведомлений пользователя "
+        "(sent, failed) вместо периодического опроса истории"
+    )
+)
+async def stream_notification_events(user_id: int) -> StreamingResponse:
+    """
+    Подписка на смену статусов уведомлений пользователя
+
+    События приходят из внутрипроцессной шины. Если клиент не успевает
+    читать поток, старые события отбрасываются, а клиент получает событие
+    overflow с количеством пропущенных событий и может перечитать историю.
+
+    Args:
+        user_id: ID пользователя
+
+    Returns:
+        Поток text/event-stream
+    """
+    if event_bus.subscriber_count >= settings.SSE_MAX_SUBSCRIBERS:
+        raise HTTPException(
+            status_code=HTTP_STATUS_SERVICE_UNAVAILABLE,
+            detail="Too many event subscribers"
+        )
+
+    async def event_stream() -> AsyncGenerator[str, None]:
+        subscription = event_bus.subscribe(user_id)
+        if subscription is None:
+            return
+
+        reported_drops = 0
+        try:
+            while True:
+                event = await subscription.get(settings.SSE_HEARTBEAT_INTERVAL)
+
+                if subscription.dropped > reported_drops:
+                    yield format_sse(
+                        "overflow",
+                        {"dropped": subscription.dropped - reported_drops}
+                    )
+                    reported_drops = subscription.dropped
+
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                yield format_sse("status", event, event_id=event["id"])
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
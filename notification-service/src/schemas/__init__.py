@@ -3,10 +3,30 @@ from schemas.notification import (
     NotificationCreate,
     NotificationResponse,
     NotificationListResponse,
+    NotificationCounterItem,
+    NotificationStatsResponse,
+    NotificationLookupRequest,
+    NotificationStatusRecord,
+    NotificationLookupResponse,
+    NOTIFICATION_FIELDS,
+)
+from schemas.campaign import (
+    CampaignCreate,
+    CampaignResponse,
+    CampaignUploadResponse,
 )
 
 __all__ = [
     "NotificationCreate",
     "NotificationResponse",
     "NotificationListResponse",
+    "NotificationCounterItem",
+    "NotificationStatsResponse",
+    "NotificationLookupRequest",
+    "NotificationStatusRecord",
+    "NotificationLookupResponse",
+    "NOTIFICATION_FIELDS",
+    "CampaignCreate",
+    "CampaignResponse",
+    "CampaignUploadResponse",
 ]
@@ -0,0 +1,65 @@
+"""Pydantic схемы для кампаний"""
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, PositiveInt
+
+from models.campaign import CampaignStatus
+from models.notification import NotificationType
+from core.constants import TEST_USER_ID, TEST_USER_ID_2, TEST_MESSAGE_CODE
+from core.settings import settings
+
+
+class CampaignCreate(BaseModel):
+    """Схема для создания кампании"""
+    message: str = Field(
+        ...,
+        min_length=1,
+        description=(
+            "Текст сообщения или шаблон: {user_id} заменяется на ID получателя"
+        )
+    )
+    type: NotificationType = Field(..., description="Тип уведомлений (email или telegram)")
+    user_ids: Optional[List[PositiveInt]] = Field(
+        default=None,
+        max_length=settings.CAMPAIGN_MAX_INLINE_RECIPIENTS,
+        description=(
+            "Получатели. Если не переданы, кампания создается в статусе draft "
+            "и ожидает загрузки файла получателей"
+        )
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "message": f"Пользователь {{user_id}}, ваш код: {TEST_MESSAGE_CODE}",
+                "type": "telegram",
+                "user_ids": [TEST_USER_ID, TEST_USER_ID_2]
+            }
+        }
+
+
+class CampaignResponse(BaseModel):
+    """Схема ответа с состоянием кампании"""
+    id: int = Field(..., description="ID кампании")
+    message: str = Field(..., description="Текст сообщения или шаблон")
+    type: NotificationType = Field(..., description="Тип уведомлений")
+    status: CampaignStatus = Field(..., description="Статус кампании")
+    total_recipients: int = Field(..., description="Количество получателей")
+    created_count: int = Field(..., description="Создано уведомлений")
+    dispatched_count: int = Field(..., description="Завершено отправок")
+    sent_count: int = Field(..., description="Отправлено")
+    failed_count: int = Field(..., description="Не отправлено")
+    created_at: datetime = Field(..., description="Время создания")
+    updated_at: datetime = Field(..., description="Время последнего обновления")
+    completed_at: Optional[datetime] = Field(None, description="Время завершения")
+
+    class Config:
+        from_attributes = True
+
+
+class CampaignUploadResponse(BaseModel):
+    """Схема ответа на загрузку получателей"""
+    campaign_id: int = Field(..., description="ID кампании")
+    accepted: int = Field(..., description="Принято ID из файла")
+    rejected: int = Field(..., description="Пропущено некорректных значений")
+    total_recipients: int = Field(..., description="Уникальных получателей в кампании")
@@ -1,6 +1,6 @@
 """Pydantic схемы для уведомлений"""
 from datetime import datetime
-from typing import List
+from typing import Dict, List
 from pydantic import BaseModel, Field
 
 from models.notification import NotificationType, NotificationStatus
@@ -60,6 +60,9 @@ class NotificationResponse(BaseModel):
         }
 
 
+NOTIFICATION_FIELDS = tuple(NotificationResponse.model_fields)
+
+
 class NotificationListResponse(BaseModel):
     """Схема ответа со списком уведомлений"""
     notifications: List[NotificationResponse] = Field(..., description="Список уведомлений")
@@ -83,3 +86,74 @@ class NotificationListResponse(BaseModel):
                 "total": TEST_MIN_NOTIFICATIONS_COUNT
             }
         }
+
+
+class NotificationLookupRequest(BaseModel):
+    """Схема запроса статусов уведомлений по ID"""
+    ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.BULK_LOOKUP_MAX_IDS,
+        description="ID уведомлений"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {"ids": [TEST_NOTIFICATION_ID, TEST_NOTIFICATION_ID + 1]}
+        }
+
+
+class NotificationStatusRecord(BaseModel):
+    """Компактная запись о статусе уведомления"""
+    id: int = Field(..., description="ID уведомления")
+    user_id: int = Field(..., description="ID пользователя")
+    type: NotificationType = Field(..., description="Тип уведомления")
+    status: NotificationStatus = Field(..., description="Статус уведомления")
+    attempts: int = Field(..., description="Количество попыток отправки")
+    updated_at: datetime = Field(..., description="Время последнего обновления")
+
+    class Config:
+        from_attributes = True
+
+
+class NotificationLookupResponse(BaseModel):
+    """Схема ответа со статусами уведомлений"""
+    notifications: List[NotificationStatusRecord] = Field(
+        ..., description="Найденные уведомления в порядке запроса"
+    )
+    missing: List[int] = Field(..., description="ID, которые не найдены")
+
+
+class NotificationCounterItem(BaseModel):
+    """Схема счетчика уведомлений по типу и статусу"""
+    type: NotificationType = Field(..., description="Тип уведомления")
+    status: NotificationStatus = Field(..., description="Статус уведомления")
+    count: int = Field(..., description="Количество уведомлений")
+
+
+class NotificationStatsResponse(BaseModel):
+    """Схема ответа со статистикой уведомлений пользователя"""
+    user_id: int = Field(..., description="ID пользователя")
+    total: int = Field(..., description="Общее количество уведомлений")
+    by_status: Dict[str, int] = Field(..., description="Количество по статусам")
+    by_type: Dict[str, int] = Field(..., description="Количество по типам")
+    counters: List[NotificationCounterItem] = Field(
+        ..., description="Количество по сочетаниям типа и статуса"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "user_id": TEST_USER_ID,
+                "total": TEST_MIN_NOTIFICATIONS_COUNT,
+                "by_status": {"pending": 0, "sent": 1, "failed": 0},
+                "by_type": {"email": 0, "telegram": 1},
+                "counters": [
+                    {
+                        "type": "telegram",
+                        "status": "sent",
+                        "count": TEST_MIN_NOTIFICATIONS_COUNT
+                    }
+                ]
+            }
+        }
@@ -0,0 +1,505 @@
+"""Сервис рассылок (кампаний) уведомлений"""
+import asyncio
+import re
+from collections import Counter
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import String, cast, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from models.campaign import (
+    Campaign,
+    CampaignNotification,
+    CampaignRecipient,
+    CampaignStatus
+)
+from models.notification import Notification, NotificationType, NotificationStatus
+from models.parked_notification import ParkedNotification
+from schemas.campaign import CampaignCreate
+from services.notification_service import NotificationService
+from services.stats_service import StatsService, _dialect_insert
+from core.settings import settings
+from core.database import db_manager
+from logger import logger
+
+
+# Разделители ID в загружаемом файле: пробелы, переводы строк, запятые, точки с запятой
+ID_SEPARATORS = re.compile(rb"[\s,;]+")
+# Максимальная длина одного значения в файле получателей
+MAX_ID_TOKEN_LENGTH = 20
+TEMPLATE_USER_ID = "{user_id}"
+
+_campaign_tasks: Dict[int, asyncio.Task] = {}
+
+
+def _parse_user_id(token: bytes) -> Optional[int]:
+    """Разбор ID получателя; None для некорректного значения"""
+    if len(token) > MAX_ID_TOKEN_LENGTH or not token.isdigit():
+        return None
+    user_id = int(token)
+    return user_id if user_id > 0 else None
+
+
+class CampaignService:
+    """Сервис для создания кампаний и их поэтапной отправки"""
+
+    @staticmethod
+    def stage_recipients(
+        session: Session,
+        campaign_id: int,
+        user_ids: Iterable[int]
+    ) -> None:
+        """
+        Загрузка получателей в промежуточную таблицу пачками
+
+        Каждая пачка вставляется одним executemany с ON CONFLICT DO NOTHING,
+        поэтому повторы ID не приводят к повторным уведомлениям.
+
+        Args:
+            session: Сессия базы данных
+            campaign_id: ID кампании
+            user_ids: ID получателей (может быть генератором)
+        """
+        stmt = _dialect_insert(session)(CampaignRecipient).on_conflict_do_nothing(
+            index_elements=[CampaignRecipient.campaign_id, CampaignRecipient.user_id]
+        )
+        chunk: List[Dict[str, int]] = []
+        for user_id in user_ids:
+            chunk.append({"campaign_id": campaign_id, "user_id": user_id})
+            if len(chunk) >= settings.CAMPAIGN_STAGING_CHUNK_SIZE:
+                session.execute(stmt, chunk)
+                chunk = []
+        if chunk:
+            session.execute(stmt, chunk)
+
+    @staticmethod
+    def count_recipients(session: Session, campaign_id: int) -> int:
+        """Количество уникальных получателей кампании"""
+        return session.execute(
+            select(func.count())
+            .select_from(CampaignRecipient)
+            .where(CampaignRecipient.campaign_id == campaign_id)
+        ).scalar_one()
+
+    @staticmethod
+    def create_campaign(campaign_data: CampaignCreate, db: Session) -> Campaign:
+        """
+        Создание кампании
+
+        Если в запросе переданы получатели, они загружаются в промежуточную
+        таблицу, и кампания сразу переходит в статус running. Иначе кампания
+        остается в статусе draft до загрузки файла получателей.
+
+        Args:
+            campaign_data: Данные кампании
+            db: Сессия базы данных
+
+        Returns:
+            Созданная кампания
+        """
+        campaign = Campaign(
+            message=campaign_data.message,
+            type=campaign_data.type,
+            status=CampaignStatus.DRAFT
+        )
+        db.add(campaign)
+        db.flush()
+
+        if campaign_data.user_ids:
+            CampaignService.stage_recipients(db, campaign.id, campaign_data.user_ids)
+            campaign.total_recipients = CampaignService.count_recipients(
+                db, campaign.id
+            )
+            campaign.status = CampaignStatus.RUNNING
+
+        db.commit()
+        db.refresh(campaign)
+        logger.info(
+            f"Created campaign {campaign.id} with {campaign.total_recipients} "
+            f"recipient(s)"
+        )
+        return campaign
+
+    @staticmethod
+    def _stage_chunk(campaign_id: int, user_ids: List[int]) -> None:
+        with db_manager.get_session() as session:
+            CampaignService.stage_recipients(session, campaign_id, user_ids)
+            session.commit()
+
+    @staticmethod
+    def _update_total(campaign_id: int) -> int:
+        with db_manager.get_session() as session:
+            total = CampaignService.count_recipients(session, campaign_id)
+            session.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values(total_recipients=total)
+            )
+            session.commit()
+            return total
+
+    @staticmethod
+    async def upload_recipients(
+        campaign_id: int,
+        chunks: AsyncIterator[bytes]
+    ) -> Tuple[int, int, int]:
+        """
+        Потоковая загрузка файла с ID получателей
+
+        Файл читается по частям и записывается пачками по
+        CAMPAIGN_STAGING_CHUNK_SIZE, поэтому память не зависит от размера
+        файла. Некорректные значения (например, заголовок CSV) пропускаются.
+
+        Args:
+            campaign_id: ID кампании
+            chunks: Части тела запроса
+
+        Returns:
+            Количество принятых и пропущенных значений и итоговое
+            количество уникальных получателей
+        """
+        accepted = 0
+        rejected = 0
+        pending: List[int] = []
+        remainder = b""
+
+        async def flush() -> None:
+            nonlocal pending
+            if pending:
+                await asyncio.to_thread(CampaignService._stage_chunk, campaign_id, pending)
+                pending = []
+
+        async def consume(tokens: Iterable[bytes]) -> None:
+            nonlocal accepted, rejected
+            for token in tokens:
+                if not token:
+                    continue
+                user_id = _parse_user_id(token)
+                if user_id is None:
+                    rejected += 1
+                    continue
+                accepted += 1
+                pending.append(user_id)
+                if len(pending) >= settings.CAMPAIGN_STAGING_CHUNK_SIZE:
+                    await flush()
+
+        async for chunk in chunks:
+            tokens = ID_SEPARATORS.split(remainder + chunk)
+            # Последнее значение может продолжиться в следующей части
+            remainder = tokens.pop()
+            if len(remainder) > MAX_ID_TOKEN_LENGTH:
+                rejected += 1
+                remainder = b""
+            await consume(tokens)
+        await consume([remainder])
+        await flush()
+
+        total = await asyncio.to_thread(CampaignService._update_total, campaign_id)
+        logger.info(
+            f"Campaign {campaign_id}: uploaded {accepted} recipient id(s), "
+            f"{rejected} rejected, {total} unique"
+        )
+        return accepted, rejected, total
+
+    @staticmethod
+    def _insert_chunk(campaign_id: int) -> List[Tuple[int, int]]:
+        """
+        Создание следующей пачки уведомлений кампании
+
+        Уведомления создаются одним INSERT ... SELECT из промежуточной
+        таблицы по диапазону user_id после курсора. Связь уведомлений с
+        кампанией, счетчики статистики, версии историй и курсор кампании
+        обновляются в той же транзакции.
+
+        Returns:
+            Пары (ID уведомления, user_id); пустой список, если получатели
+            закончились
+        """
+        with db_manager.get_session() as session:
+            campaign = session.get(Campaign, campaign_id)
+            cursor = campaign.cursor_user_id
+
+            in_range = (
+                (CampaignRecipient.campaign_id == campaign_id)
+                & (CampaignRecipient.user_id > cursor)
+            )
+            upper = session.execute(
+                select(CampaignRecipient.user_id)
+                .where(in_range)
+                .order_by(CampaignRecipient.user_id)
+                .offset(settings.CAMPAIGN_INSERT_CHUNK_SIZE - 1)
+                .limit(1)
+            ).scalar()
+            if upper is not None:
+                in_range = in_range & (CampaignRecipient.user_id <= upper)
+
+            message = literal(campaign.message, String)
+            if TEMPLATE_USER_ID in campaign.message:
+                message = func.replace(
+                    message, TEMPLATE_USER_ID, cast(CampaignRecipient.user_id, String)
+                )
+            now = datetime.now()
+            columns = Notification.__table__.c
+            source = select(
+                CampaignRecipient.user_id,
+                message,
+                literal(campaign.type, columns.type.type),
+                literal(NotificationStatus.PENDING, columns.status.type),
+                literal(settings.NOTIFICATION_INITIAL_ATTEMPTS),
+                literal(now, columns.created_at.type),
+                literal(now, columns.updated_at.type),
+            ).where(in_range)
+
+            rows = session.execute(
+                insert(Notification.__table__)
+                .from_select(
+                    [
+                        columns.user_id,
+                        columns.message,
+                        columns.type,
+                        columns.status,
+                        columns.attempts,
+                        columns.created_at,
+                        columns.updated_at,
+                    ],
+                    source
+                )
+                .returning(columns.id, columns.user_id)
+            ).all()
+            if not rows:
+                return []
+
+            session.execute(insert(CampaignNotification.__table__), [
+                {"campaign_id": campaign_id, "notification_id": row.id}
+                for row in rows
+            ])
+            user_ids = [row.user_id for row in rows]
+            StatsService.apply_deltas(session, {
+                (user_id, campaign.type, NotificationStatus.PENDING): 1
+                for user_id in user_ids
+            })
+            StatsService.bump_versions(session, user_ids)
+            campaign.cursor_user_id = max(user_ids)
+            campaign.created_count += len(rows)
+            session.commit()
+            return [(row.id, row.user_id) for row in rows]
+
+    @staticmethod
+    def _pending_notifications(campaign_id: int) -> List[Tuple[int, int]]:
+        """
+        Уведомления кампании, оставшиеся в статусе pending
+
+        Это уведомления пачки, отправка которых была прервана остановкой
+        сервиса: курсор кампании уже прошел их получателей. Отложенные
+        circuit breaker уведомления не включаются: их отправляет очередь
+        отложенных уведомлений.
+
+        Returns:
+            Пары (ID уведомления, количество выполненных попыток)
+        """
+        with db_manager.get_session() as session:
+            rows = session.execute(
+                select(Notification.id, Notification.attempts)
+                .join(
+                    CampaignNotification,
+                    CampaignNotification.notification_id == Notification.id
+                )
+                .where(
+                    CampaignNotification.campaign_id == campaign_id,
+                    Notification.status == NotificationStatus.PENDING,
+                    Notification.id.not_in(
+                        select(ParkedNotification.notification_id)
+                    )
+                )
+                .order_by(Notification.id)
+            ).all()
+        return [(row.id, row.attempts) for row in rows]
+
+    @staticmethod
+    def _save_progress(campaign_id: int, delta: Counter) -> None:
+        """Увеличение счетчиков прогресса кампании"""
+        with db_manager.get_session() as session:
+            session.execute(
+                update(Campaign).where(Campaign.id == campaign_id).values(
+                    dispatched_count=Campaign.dispatched_count + delta["dispatched"],
+                    sent_count=Campaign.sent_count + delta[NotificationStatus.SENT],
+                    failed_count=(
+                        Campaign.failed_count + delta[NotificationStatus.FAILED]
+                    ),
+                )
+            )
+            session.commit()
+
+    @staticmethod
+    def _finish(campaign_id: int, status: CampaignStatus) -> None:
+        """
+        Завершение кампании с пересчетом счетчиков по уведомлениям
+
+        Счетчики, накопленные по ходу отправки, заменяются точными
+        значениями из БД, поэтому итог не зависит от прерываний.
+        """
+        with db_manager.get_session() as session:
+            counts = dict(session.execute(
+                select(Notification.status, func.count())
+                .join(
+                    CampaignNotification,
+                    CampaignNotification.notification_id == Notification.id
+                )
+                .where(CampaignNotification.campaign_id == campaign_id)
+                .group_by(Notification.status)
+            ).all())
+            sent = counts.get(NotificationStatus.SENT, 0)
+            failed = counts.get(NotificationStatus.FAILED, 0)
+            session.execute(
+                update(Campaign).where(Campaign.id == campaign_id).values(
+                    dispatched_count=sent + failed,
+                    sent_count=sent,
+                    failed_count=failed,
+                    status=status,
+                    completed_at=datetime.now(),
+                )
+            )
+            session.commit()
+
+    @staticmethod
+    async def _dispatch(
+        notification_id: int,
+        notification_type: NotificationType,
+        semaphore: asyncio.Semaphore,
+        outcomes: Counter,
+        start_attempt: Optional[int] = None
+    ) -> None:
+        try:
+            status = await NotificationService.send_notification(
+                notification_id, notification_type, start_attempt
+            )
+        finally:
+            semaphore.release()
+        outcomes["dispatched"] += 1
+        if status is not None:
+            outcomes[status] += 1
+
+    @staticmethod
+    async def run(campaign_id: int) -> None:
+        """
+        Поэтапная отправка кампании
+
+        Следующая пачка уведомлений создается только по мере освобождения
+        мест для отправки (CAMPAIGN_DISPATCH_CONCURRENCY), поэтому в памяти
+        находится не больше одной пачки ID и ограниченное число отправок.
+
+        При продолжении после перезапуска сначала повторно отправляются
+        уведомления кампании, оставшиеся в статусе pending, начиная со
+        следующей попытки.
+
+        Args:
+            campaign_id: ID кампании
+        """
+        with db_manager.get_session() as session:
+            notification_type = session.get(Campaign, campaign_id).type
+
+        semaphore = asyncio.Semaphore(settings.CAMPAIGN_DISPATCH_CONCURRENCY)
+        in_flight = set()
+        outcomes: Counter = Counter()
+        saved: Counter = Counter()
+
+        async def dispatch(
+            notification_id: int,
+            start_attempt: Optional[int] = None
+        ) -> None:
+            await semaphore.acquire()
+            task = asyncio.create_task(CampaignService._dispatch(
+                notification_id, notification_type, semaphore, outcomes, start_attempt
+            ))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+        async def stop_in_flight() -> None:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+        async def save() -> None:
+            delta = outcomes - saved
+            saved.update(delta)
+            await asyncio.to_thread(CampaignService._save_progress, campaign_id, delta)
+
+        try:
+            pending = await asyncio.to_thread(
+                CampaignService._pending_notifications, campaign_id
+            )
+            if pending:
+                logger.info(
+                    f"Campaign {campaign_id}: re-dispatching {len(pending)} "
+                    f"pending notification(s)"
+                )
+            for notification_id, attempts in pending:
+                await dispatch(
+                    notification_id, min(attempts + 1, settings.RETRY_MAX_ATTEMPTS)
+                )
+
+            while True:
+                rows = await asyncio.to_thread(CampaignService._insert_chunk, campaign_id)
+                if not rows:
+                    break
+                for notification_id, _ in rows:
+                    await dispatch(notification_id)
+                await save()
+
+            if in_flight:
+                await asyncio.gather(*in_flight)
+            await asyncio.to_thread(
+                CampaignService._finish, campaign_id, CampaignStatus.COMPLETED
+            )
+            logger.info(f"Campaign {campaign_id} completed")
+        except asyncio.CancelledError:
+            # Кампания остается в статусе running: прерванные отправки
+            # остаются pending и повторяются после перезапуска
+            await stop_in_flight()
+            await save()
+            raise
+        except Exception as e:
+            logger.error(f"Campaign {campaign_id} failed: {e}")
+            await stop_in_flight()
+            await asyncio.to_thread(
+                CampaignService._finish, campaign_id, CampaignStatus.FAILED
+            )
+
+    @staticmethod
+    def start(campaign_id: int) -> None:
+        """Запуск отправки кампании в фоновой задаче"""
+        if campaign_id in _campaign_tasks:
+            return
+        task = asyncio.create_task(CampaignService.run(campaign_id))
+        _campaign_tasks[campaign_id] = task
+        task.add_done_callback(lambda _: _campaign_tasks.pop(campaign_id, None))
+
+    @staticmethod
+    def resume_running() -> int:
+        """
+        Продолжение кампаний, прерванных перезапуском сервиса
+
+        Returns:
+            Количество продолженных кампаний
+        """
+        with db_manager.get_session() as session:
+            campaign_ids = session.execute(
+                select(Campaign.id).where(Campaign.status == CampaignStatus.RUNNING)
+            ).scalars().all()
+        for campaign_id in campaign_ids:
+            logger.info(f"Resuming campaign {campaign_id}")
+            CampaignService.start(campaign_id)
+        return len(campaign_ids)
+
+    @staticmethod
+    async def stop_all() -> None:
+        """
+        Остановка фоновых задач кампаний
+
+        Ожидает, пока задачи сохранят прогресс, поэтому вызывается
+        до закрытия соединений с БД.
+        """
+        tasks = list(_campaign_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
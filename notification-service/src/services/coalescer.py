@@ -0,0 +1,174 @@
+"""Подавление дублей и объединение уведомлений в дайджесты"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.notification import NotificationType
+from core.settings import settings
+
+
+class CoalesceMode(str, Enum):
+    """Режим обработки повторяющихся уведомлений"""
+    OFF = "off"
+    DEDUPE = "dedupe"
+    DIGEST = "digest"
+
+
+class NotificationCoalescer:
+    """
+    Ограниченный индекс недавних уведомлений с истечением по времени
+
+    Индекс дублей хранит 16-байтовый хеш (user_id, type, message) и ID
+    уже созданного уведомления, поэтому размер записи не зависит от
+    длины сообщения. Индекс дайджестов хранит для (user_id, type) ID
+    уведомления, которое еще ждет отправки, и накопленные сообщения.
+
+    Записи добавляются в порядке времени создания и живут одинаковое
+    время, поэтому истекшие записи всегда находятся в начале OrderedDict
+    и удаляются за O(1) на запись. При переполнении вытесняются самые
+    старые записи.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        max_keys: int,
+        digest_max_messages: int,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self.digest_max_messages = digest_max_messages
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Хеш сообщения -> (ID уведомления, момент истечения)
+        self._recent: "OrderedDict[bytes, Tuple[int, float]]" = OrderedDict()
+        # (user_id, type) -> (ID уведомления, дополнительные сообщения)
+        self._digests: Dict[Tuple[int, str], Tuple[int, List[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._recent) + len(self._digests)
+
+    @staticmethod
+    def message_key(
+        user_id: int,
+        notification_type: NotificationType,
+        message: str
+    ) -> bytes:
+        """Хеш (user_id, type, message)"""
+        payload = f"{user_id}\x00{notification_type.value}\x00{message}"
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+    def _expire(self, now: float) -> None:
+        while self._recent:
+            _, expires_at = next(iter(self._recent.values()))
+            if expires_at > now:
+                break
+            self._recent.popitem(last=False)
+
+    def find_duplicate(
+        self,
+        user_id: int,
+        notification_type: NotificationType,
+        message: str
+    ) -> Optional[int]:
+        """
+        Поиск уведомления с тем же сообщением внутри окна
+
+        Returns:
+            ID ранее созданного уведомления или None
+        """
+        key = self.message_key(user_id, notification_type, message)
+        with self._lock:
+            self._expire(self._clock())
+            entry = self._recent.get(key)
+            return entry[0] if entry else None
+
+    def remember(
+        self,
+        user_id: int,
+        notification_type: NotificationType,
+        message: str,
+        notification_id: int
+    ) -> None:
+        """Запоминание сообщения для подавления дублей до конца окна"""
+        key = self.message_key(user_id, notification_type, message)
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            self._recent.pop(key, None)
+            self._recent[key] = (notification_id, now + self.window_seconds)
+            while len(self._recent) > self.max_keys:
+                self._recent.popitem(last=False)
+
+    def open_digest(
+        self,
+        user_id: int,
+        notification_type: NotificationType,
+        notification_id: int
+    ) -> bool:
+        """
+        Открытие дайджеста для уведомления, ожидающего отправки
+
+        Returns:
+            False, если у пользователя уже есть открытый дайджест этого типа
+            или индекс заполнен, и уведомление нужно отправить сразу
+        """
+        key = (user_id, notification_type.value)
+        with self._lock:
+            if key in self._digests or len(self._digests) >= self.max_keys:
+                return False
+            self._digests[key] = (notification_id, [])
+            return True
+
+    def append_to_digest(
+        self,
+        user_id: int,
+        notification_type: NotificationType,
+        message: str
+    ) -> Optional[int]:
+        """
+        Добавление сообщения в открытый дайджест пользователя
+
+        Returns:
+            ID уведомления-дайджеста или None, если дайджеста нет или он заполнен
+        """
+        with self._lock:
+            entry = self._digests.get((user_id, notification_type.value))
+            if entry is None:
+                return None
+            notification_id, messages = entry
+            if len(messages) + 1 >= self.digest_max_messages:
+                return None
+            messages.append(message)
+            return notification_id
+
+    def close_digest(
+        self,
+        user_id: int,
+        notification_type: NotificationType,
+        notification_id: int
+    ) -> List[str]:
+        """
+        Закрытие дайджеста перед отправкой
+
+        Returns:
+            Сообщения, добавленные после первого
+        """
+        key = (user_id, notification_type.value)
+        with self._lock:
+            entry = self._digests.get(key)
+            if entry is None or entry[0] != notification_id:
+                return []
+            del self._digests[key]
+            return entry[1]
+
+
+coalescer = NotificationCoalescer(
+    window_seconds=settings.COALESCE_WINDOW_SECONDS,
+    max_keys=settings.COALESCE_MAX_KEYS,
+    digest_max_messages=settings.COALESCE_DIGEST_MAX_MESSAGES
+)
@@ -1,91 +1,349 @@
 """Сервис для работы с уведомлениями"""
 import asyncio
-import random
-from typing import Optional, List
+import time
+from collections import Counter, deque
+from datetime import datetime
+from enum import Enum
+from typing import Any, Deque, Dict, Optional, List, Sequence, Set, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 
 from models.notification import (
     Notification,
     NotificationType,
     NotificationStatus
 )
+from models.parked_notification import ParkedNotification
 from schemas.notification import NotificationCreate
+from services.stats_service import StatsService
+from services.provider_simulator import SendOutcome, get_provider
+from services.coalescer import CoalesceMode, coalescer
+from services.timing_service import LifecycleTiming, TimingService
 from core.settings import settings
 from core.database import db_manager
+from core.pubsub import event_bus
+from core.circuit_breaker import BreakerState, circuit_breakers
+from core.group_commit import GroupCommitter
 from logger import logger
 
 
+# Уведомления, отложенные из-за разомкнутого circuit breaker: (id, номер попытки)
+_parked: Dict[NotificationType, Deque[Tuple[int, int]]] = {
+    notification_type: deque() for notification_type in NotificationType
+}
+# ID отложенных уведомлений, сохраненных в parked_notifications
+_parked_rows: Set[int] = set()
+_background_tasks: Set[asyncio.Task] = set()
+# Временные метки отправок, которые еще не завершены (включая отложенные)
+_timings: Dict[int, LifecycleTiming] = {}
+
+
+def _to_json_value(value: Any) -> Any:
+    """Приведение значения колонки к JSON-совместимому виду"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _status_event(notification: Notification) -> Dict[str, Any]:
+    """Событие смены статуса уведомления для шины событий"""
+    return {
+        "id": notification.id,
+        "user_id": notification.user_id,
+        "type": notification.type.value,
+        "status": notification.status.value,
+        "attempts": notification.attempts,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
 class NotificationService:
     """Сервис для управления уведомлениями"""
 
     @staticmethod
     async def send_notification(
         notification_id: int,
-        notification_type: NotificationType
-    ) -> None:
+        notification_type: NotificationType,
+        start_attempt: Optional[int] = None
+    ) -> Optional[NotificationStatus]:
         """
         Асинхронная отправка уведомления с retry механизмом
 
+        Перед каждой попыткой проверяется circuit breaker канала. Если он
+        разомкнут, уведомление откладывается и не расходует попытки.
+
         Args:
             notification_id: ID уведомления
             notification_type: Тип уведомления (email или telegram)
+            start_attempt: Номер первой попытки (для отложенных уведомлений)
+
+        Returns:
+            Итоговый статус или None, если уведомление отложено
         """
         max_attempts = settings.RETRY_MAX_ATTEMPTS
-        error_probability = settings.ERROR_PROBABILITY
+        breaker = circuit_breakers.get(notification_type.value)
+        provider = get_provider(notification_type)
+        timing = _timings.setdefault(
+            notification_id, LifecycleTiming(dispatch_started_at=datetime.now())
+        )
 
-        if notification_type == NotificationType.EMAIL:
-            delay = settings.EMAIL_DELAY
-        else:
-            delay = settings.TELEGRAM_DELAY
+        first_attempt = start_attempt or settings.NOTIFICATION_RETRY_START_ATTEMPT
+        for attempt in range(first_attempt, max_attempts + 1):
+            if settings.BREAKER_ENABLED and not breaker.allow_request():
+                NotificationService._park(notification_id, notification_type, attempt)
+                return None
 
-        for attempt in range(settings.NOTIFICATION_RETRY_START_ATTEMPT, max_attempts + 1):
+            if timing.first_attempt_at is None:
+                timing.first_attempt_at = datetime.now()
+            attempt_started_at = time.perf_counter()
             try:
-                await asyncio.sleep(delay)
-
-                should_fail = (
-                    random.random() < error_probability and attempt < max_attempts
+                result = provider.send()
+                await asyncio.sleep(result.latency)
+                timing.attempt_durations.append(
+                    time.perf_counter() - attempt_started_at
                 )
+
+                should_fail = result.outcome != SendOutcome.DELIVERED
+                if not settings.PROVIDER_SIMULATOR_ENABLED:
+                    should_fail = should_fail and attempt < max_attempts
+
                 if should_fail:
+                    if result.outcome == SendOutcome.RATE_LIMITED:
+                        breaker.release()
+                    else:
+                        breaker.record_failure()
+
+                    if attempt == max_attempts:
+                        if NotificationService._complete_notification(
+                            notification_id, NotificationStatus.FAILED, attempt
+                        ):
+                            logger.error(
+                                f"Notification {notification_id} failed after "
+                                f"{max_attempts} attempts"
+                            )
+                        return NotificationStatus.FAILED
+
                     logger.warning(
                         f"Notification {notification_id} failed on attempt "
-                        f"{attempt}, retrying..."
+                        f"{attempt} ({result.outcome.value}), retrying..."
                     )
-                    with db_manager.get_session() as session:
-                        notification = session.get(Notification, notification_id)
-                        if notification:
-                            notification.attempts = attempt
-                            session.commit()
+                    NotificationService._record_attempt(notification_id, attempt)
+                    await asyncio.sleep(result.retry_after)
                     continue
 
-                with db_manager.get_session() as session:
-                    notification = session.get(Notification, notification_id)
-                    if notification:
-                        notification.status = NotificationStatus.SENT
-                        notification.attempts = attempt
-                        session.commit()
-                        logger.info(
-                            f"Notification {notification_id} sent successfully"
-                            f"after {attempt} attempt(s)"
-                        )
-                return
+                breaker.record_success()
+                if NotificationService._complete_notification(
+                    notification_id, NotificationStatus.SENT, attempt
+                ):
+                    logger.info(
+                        f"Notification {notification_id} sent successfully"
+                        f"after {attempt} attempt(s)"
+                    )
+                return NotificationStatus.SENT
 
             except Exception as e:
+                timing.attempt_durations.append(
+                    time.perf_counter() - attempt_started_at
+                )
+                breaker.record_failure()
                 logger.error(
                     f"Error sending notification {notification_id} on attempt "
                     f"{attempt}: {e}"
                 )
                 if attempt == max_attempts:
-                    with db_manager.get_session() as session:
-                        notification = session.get(Notification, notification_id)
-                        if notification:
-                            notification.status = NotificationStatus.FAILED
-                            notification.attempts = attempt
-                            session.commit()
-                            logger.error(
-                                f"Notification {notification_id} failed after "
-                                f"{max_attempts} attempts"
-                            )
+                    if NotificationService._complete_notification(
+                        notification_id, NotificationStatus.FAILED, attempt
+                    ):
+                        logger.error(
+                            f"Notification {notification_id} failed after "
+                            f"{max_attempts} attempts"
+                        )
+                    return NotificationStatus.FAILED
+        return None
+
+    @staticmethod
+    def _record_attempt(notification_id: int, attempt: int) -> None:
+        """Сохранение номера неудачной попытки"""
+        with db_manager.get_session() as session:
+            notification = session.get(Notification, notification_id)
+            if notification:
+                StatsService.bump_versions(session, [notification.user_id])
+                notification.attempts = attempt
+                session.commit()
+
+    @staticmethod
+    def _complete_notification(
+        notification_id: int,
+        new_status: NotificationStatus,
+        attempt: int
+    ) -> bool:
+        """
+        Сохранение итогового статуса уведомления и публикация события
+
+        В той же транзакции записываются временные метки доставки.
+
+        Args:
+            notification_id: ID уведомления
+            new_status: Итоговый статус
+            attempt: Количество выполненных попыток
+
+        Returns:
+            True, если уведомление найдено
+        """
+        timing = _timings.pop(notification_id, None)
+        with db_manager.get_session() as session:
+            notification = session.get(Notification, notification_id)
+            if not notification:
+                return False
+            StatsService.record_transition(
+                session, notification, notification.status, new_status
+            )
+            notification.status = new_status
+            notification.attempts = attempt
+            if notification_id in _parked_rows:
+                session.execute(delete(ParkedNotification).where(
+                    ParkedNotification.notification_id == notification_id
+                ))
+            if timing is not None:
+                session.add(TimingService.build_record(
+                    notification, timing, datetime.now()
+                ))
+            event = _status_event(notification)
+            session.commit()
+        _parked_rows.discard(notification_id)
+        event_bus.publish(event["user_id"], event)
+        return True
+
+    @staticmethod
+    def _park(
+        notification_id: int,
+        notification_type: NotificationType,
+        attempt: int
+    ) -> None:
+        """
+        Откладывание уведомления при разомкнутом circuit breaker
+
+        Уведомление сохраняется в parked_notifications, чтобы очередь
+        восстановилась после перезапуска. Если очередь отложенных
+        уведомлений канала заполнена, уведомление сразу помечается как failed.
+        """
+        queue = _parked[notification_type]
+        if len(queue) >= settings.BREAKER_PARKING_CAPACITY:
+            logger.error(
+                f"Parking for {notification_type.value} is full, notification "
+                f"{notification_id} marked as failed"
+            )
+            NotificationService._complete_notification(
+                notification_id,
+                NotificationStatus.FAILED,
+                max(attempt - 1, settings.NOTIFICATION_INITIAL_ATTEMPTS)
+            )
+            return
+
+        with db_manager.get_session() as session:
+            session.merge(ParkedNotification(
+                notification_id=notification_id,
+                type=notification_type,
+                attempt=attempt,
+                parked_at=datetime.now()
+            ))
+            session.commit()
+        _parked_rows.add(notification_id)
+        queue.append((notification_id, attempt))
+        logger.warning(
+            f"Circuit breaker for {notification_type.value} is open, "
+            f"notification {notification_id} parked"
+        )
+
+    @staticmethod
+    def restore_parked() -> int:
+        """
+        Восстановление очереди отложенных уведомлений после перезапуска
+
+        Строки уведомлений, которые уже не в статусе pending, удаляются.
+
+        Returns:
+            Количество восстановленных уведомлений
+        """
+        with db_manager.get_session() as session:
+            rows = session.execute(
+                select(
+                    ParkedNotification.notification_id,
+                    ParkedNotification.type,
+                    ParkedNotification.attempt,
+                    Notification.status
+                )
+                .outerjoin(
+                    Notification,
+                    Notification.id == ParkedNotification.notification_id
+                )
+                .order_by(ParkedNotification.parked_at)
+            ).all()
+            stale = [
+                row.notification_id for row in rows
+                if row.status != NotificationStatus.PENDING
+            ]
+            if stale:
+                session.execute(delete(ParkedNotification).where(
+                    ParkedNotification.notification_id.in_(stale)
+                ))
+                session.commit()
+
+        restored = 0
+        for row in rows:
+            if row.status != NotificationStatus.PENDING:
+                continue
+            if row.notification_id in _parked_rows:
+                continue
+            _parked_rows.add(row.notification_id)
+            _parked[row.type].append((row.notification_id, row.attempt))
+            restored += 1
+        if restored:
+            logger.info(f"Restored {restored} parked notification(s)")
+        return restored
+
+    @staticmethod
+    def dispatch_parked() -> int:
+        """
+        Повторная отправка отложенных уведомлений каналов с не разомкнутым breaker
+
+        Returns:
+            Количество запущенных отправок
+        """
+        dispatched = 0
+        for notification_type, queue in _parked.items():
+            breaker = circuit_breakers.get(notification_type.value)
+            if not queue or breaker.state == BreakerState.OPEN:
+                continue
+            for _ in range(min(len(queue), settings.BREAKER_DRAIN_BATCH_SIZE)):
+                notification_id, attempt = queue.popleft()
+                task = asyncio.create_task(NotificationService.send_notification(
+                    notification_id, notification_type, attempt
+                ))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+                dispatched += 1
+        return dispatched
+
+    @staticmethod
+    async def drain_parked() -> None:
+        """Периодическая отправка отложенных уведомлений"""
+        while True:
+            await asyncio.sleep(settings.BREAKER_DRAIN_INTERVAL)
+            try:
+                NotificationService.dispatch_parked()
+            except Exception as e:
+                logger.error(f"Failed to dispatch parked notifications: {e}")
+
+    @staticmethod
+    def parked_counts() -> Dict[str, int]:
+        """Количество отложенных уведомлений по каналам"""
+        return {
+            notification_type.value: len(queue)
+            for notification_type, queue in _parked.items()
+        }
 
     @staticmethod
     def create_notification(
@@ -110,6 +368,7 @@ class NotificationService:
             attempts=settings.NOTIFICATION_INITIAL_ATTEMPTS
         )
         db.add(notification)
+        StatsService.record_created(db, [notification])
         db.commit()
         db.refresh(notification)
         logger.info(
@@ -118,6 +377,212 @@ class NotificationService:
         )
         return notification
 
+    @staticmethod
+    def create_notifications_batch(
+        notifications_data: List[NotificationCreate]
+    ) -> List[Notification]:
+        """
+        Создание пачки уведомлений одной транзакцией
+
+        Args:
+            notifications_data: Данные уведомлений
+
+        Returns:
+            Созданные уведомления (отсоединенные от сессии, с ID)
+        """
+        notifications = [
+            Notification(
+                user_id=notification_data.user_id,
+                message=notification_data.message,
+                type=notification_data.type,
+                status=NotificationStatus.PENDING,
+                attempts=settings.NOTIFICATION_INITIAL_ATTEMPTS
+            )
+            for notification_data in notifications_data
+        ]
+        with db_manager.get_session() as session:
+            # Значения остаются загруженными после commit: без refresh на запись
+            session.expire_on_commit = False
+            session.add_all(notifications)
+            StatsService.record_created(session, notifications)
+            session.commit()
+        logger.info(
+            f"Created {len(notifications)} notification(s) in one transaction"
+        )
+        return notifications
+
+    @staticmethod
+    def insert_many(
+        session: Session,
+        notifications_data: Sequence[NotificationCreate]
+    ) -> List[int]:
+        """
+        Вставка пачки уведомлений одним INSERT (executemany) без ORM объектов
+
+        Счетчики статистики и версии историй обновляются в той же транзакции,
+        commit выполняет вызывающая сторона.
+
+        Args:
+            session: Сессия базы данных
+            notifications_data: Данные уведомлений
+
+        Returns:
+            ID созданных уведомлений в порядке данных
+        """
+        if not notifications_data:
+            return []
+        now = datetime.now()
+        columns = Notification.__table__.c
+        rows = [
+            {
+                "user_id": notification_data.user_id,
+                "message": notification_data.message,
+                "type": notification_data.type,
+                "status": NotificationStatus.PENDING,
+                "attempts": settings.NOTIFICATION_INITIAL_ATTEMPTS,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for notification_data in notifications_data
+        ]
+        ids = session.execute(
+            insert(Notification.__table__).returning(
+                columns.id, sort_by_parameter_order=True
+            ),
+            rows
+        ).scalars().all()
+
+        deltas: Counter = Counter(
+            (notification_data.user_id, notification_data.type, NotificationStatus.PENDING)
+            for notification_data in notifications_data
+        )
+        StatsService.apply_deltas(session, deltas)
+        StatsService.bump_versions(session, (key[0] for key in deltas))
+        return list(ids)
+
+    @staticmethod
+    async def create_notification_grouped(
+        notification_data: NotificationCreate
+    ) -> Notification:
+        """
+        Создание уведомления в составе общей транзакции (GROUP_COMMIT_ENABLED)
+
+        Конкурентные запросы ждут до GROUP_COMMIT_MAX_DELAY и записываются
+        одним commit; результат возвращается после фиксации.
+
+        Args:
+            notification_data: Данные для создания уведомления
+
+        Returns:
+            Созданное уведомление
+        """
+        return await notification_committer.submit(notification_data)
+
+    @staticmethod
+    def find_coalesced(
+        notification_data: NotificationCreate,
+        db: Session
+    ) -> Optional[Notification]:
+        """
+        Поиск уведомления, с которым объединяется новое
+
+        В режиме dedupe возвращается уведомление с тем же сообщением,
+        созданное внутри окна COALESCE_WINDOW_SECONDS. В режиме digest
+        сообщение, кроме того, добавляется в открытый дайджест пользователя.
+
+        Args:
+            notification_data: Данные нового уведомления
+            db: Сессия базы данных
+
+        Returns:
+            Существующее уведомление или None, если нужно создать новое
+        """
+        mode = CoalesceMode(settings.COALESCE_MODE)
+        if mode == CoalesceMode.OFF:
+            return None
+
+        user_id = notification_data.user_id
+        notification_type = notification_data.type
+        message = notification_data.message
+
+        notification_id = coalescer.find_duplicate(
+            user_id, notification_type, message
+        )
+        if notification_id is None and mode == CoalesceMode.DIGEST:
+            notification_id = coalescer.append_to_digest(
+                user_id, notification_type, message
+            )
+            if notification_id is not None:
+                coalescer.remember(
+                    user_id, notification_type, message, notification_id
+                )
+        if notification_id is None:
+            return None
+
+        logger.info(
+            f"Notification for user {user_id} coalesced into "
+            f"{notification_id} ({mode.value})"
+        )
+        return db.get(Notification, notification_id)
+
+    @staticmethod
+    def register_for_coalescing(notification: Notification) -> bool:
+        """
+        Регистрация созданного уведомления в индексе недавних
+
+        Returns:
+            True, если уведомление открывает дайджест и его отправку
+            нужно отложить до конца окна
+        """
+        mode = CoalesceMode(settings.COALESCE_MODE)
+        if mode == CoalesceMode.OFF:
+            return False
+
+        coalescer.remember(
+            notification.user_id,
+            notification.type,
+            notification.message,
+            notification.id
+        )
+        return mode == CoalesceMode.DIGEST and coalescer.open_digest(
+            notification.user_id, notification.type, notification.id
+        )
+
+    @staticmethod
+    async def send_digest(
+        notification_id: int,
+        notification_type: NotificationType,
+        user_id: int
+    ) -> None:
+        """
+        Отправка дайджеста по окончании окна накопления
+
+        Сообщения, добавленные в дайджест, дописываются в текст уведомления
+        одной записью в БД, после чего выполняется обычная отправка.
+
+        Args:
+            notification_id: ID уведомления-дайджеста
+            notification_type: Тип уведомления
+            user_id: ID пользователя
+        """
+        await asyncio.sleep(settings.COALESCE_WINDOW_SECONDS)
+        messages = coalescer.close_digest(user_id, notification_type, notification_id)
+        if messages:
+            with db_manager.get_session() as session:
+                notification = session.get(Notification, notification_id)
+                if notification:
+                    StatsService.bump_versions(session, [notification.user_id])
+                    notification.message = "\n".join(
+                        [notification.message, *messages]
+                    )
+                    session.commit()
+            logger.info(
+                f"Digest {notification_id} merged {len(messages) + 1} messages"
+            )
+        await NotificationService.send_notification(
+            notification_id, notification_type
+        )
+
     @staticmethod
     def get_user_notifications(
         user_id: int,
@@ -148,3 +613,115 @@ class NotificationService:
             f"Retrieved {len(notifications)} notifications for user {user_id}"
         )
         return list(notifications)
+
+    @staticmethod
+    def get_user_notifications_projection(
+        user_id: int,
+        fields: Sequence[str],
+        status: Optional[NotificationStatus] = None,
+        db: Session = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Получение выбранных полей уведомлений пользователя
+
+        Выбирает только запрошенные колонки в виде строк, без загрузки
+        ORM объектов и без валидации через Pydantic. Значения сразу
+        приводятся к JSON-совместимому виду.
+
+        Args:
+            user_id: ID пользователя
+            fields: Имена запрашиваемых полей
+            status: Опциональный фильтр по статусу
+            db: Сессия базы данных
+
+        Returns:
+            Список словарей с запрошенными полями
+        """
+        columns = [getattr(Notification, field) for field in fields]
+        query = select(*columns).where(Notification.user_id == user_id)
+
+        if status:
+            query = query.where(Notification.status == status)
+
+        query = query.order_by(Notification.created_at.desc())
+
+        rows = db.execute(query).all()
+        logger.debug(
+            f"Retrieved {len(rows)} projected notifications for user {user_id}"
+        )
+        return [
+            {
+                field: _to_json_value(value)
+                for field, value in zip(fields, row)
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def get_notifications_by_ids(
+        notification_ids: Sequence[int],
+        db: Session
+    ) -> Dict[int, Any]:
+        """
+        Получение статусов уведомлений по списку ID одним запросом
+
+        Args:
+            notification_ids: ID уведомлений
+            db: Сессия базы данных
+
+        Returns:
+            Строки со статусами по ID найденных уведомлений
+        """
+        query = select(
+            Notification.id,
+            Notification.user_id,
+            Notification.type,
+            Notification.status,
+            Notification.attempts,
+            Notification.updated_at
+        ).where(Notification.id.in_(notification_ids))
+
+        return {row.id: row for row in db.execute(query)}
+
+    @staticmethod
+    def get_user_stats(user_id: int, db: Session) -> dict:
+        """
+        Получение статистики уведомлений пользователя по счетчикам
+
+        Args:
+            user_id: ID пользователя
+            db: Сессия базы данных
+
+        Returns:
+            Количество уведомлений по статусам, типам и их сочетаниям
+        """
+        counters = StatsService.get_user_counters(user_id, db)
+
+        by_status = {item.value: 0 for item in NotificationStatus}
+        by_type = {item.value: 0 for item in NotificationType}
+        for (notification_type, notification_status), count in counters.items():
+            by_status[notification_status.value] += count
+            by_type[notification_type.value] += count
+
+        return {
+            "user_id": user_id,
+            "total": sum(counters.values()),
+            "by_status": by_status,
+            "by_type": by_type,
+            "counters": [
+                {
+                    "type": notification_type,
+                    "status": notification_status,
+                    "count": count
+                }
+                for (notification_type, notification_status), count
+                in sorted(counters.items())
+            ],
+        }
+
+
+notification_committer: GroupCommitter[NotificationCreate, Notification] = GroupCommitter(
+    NotificationService.create_notifications_batch,
+    max_delay=settings.GROUP_COMMIT_MAX_DELAY,
+    max_batch=settings.GROUP_COMMIT_MAX_BATCH
+)
@@ -0,0 +1,215 @@
+"""Симулятор провайдеров доставки уведомлений"""
+import bisect
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.notification import NotificationType
+from core.settings import settings
+
+
+class LatencyDistribution(str, Enum):
+    """Распределение задержки провайдера"""
+    FIXED = "fixed"
+    LOGNORMAL = "lognormal"
+    PERCENTILES = "percentiles"
+
+
+class SendOutcome(str, Enum):
+    """Результат обращения к провайдеру"""
+    DELIVERED = "delivered"
+    ERROR = "error"
+    RATE_LIMITED = "rate_limited"
+
+
+@dataclass(frozen=True)
+class SendResult:
+    """Результат одной попытки отправки"""
+    outcome: SendOutcome
+    latency: float
+    retry_after: float = 0.0
+
+
+class ProviderSimulator:
+    """
+    Симулятор провайдера с воспроизводимым поведением
+
+    Использует собственный генератор случайных чисел: при одинаковом seed
+    последовательность задержек и ошибок одинакова. На каждый вызов
+    расходуется фиксированное количество случайных чисел, поэтому
+    результат не зависит от того, какая ветка сработала ранее.
+
+    Поддерживает задержки из распределений (fixed, lognormal, percentiles),
+    серии отказов (outage) длиной в outage_length вызовов и ограничение
+    частоты запросов (token bucket) с ответом rate_limited.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        median_latency: float,
+        error_probability: float,
+        distribution: LatencyDistribution = LatencyDistribution.FIXED,
+        latency_sigma: float = 0.5,
+        tail_factors: Tuple[float, float, float] = (2.0, 5.0, 20.0),
+        outage_probability: float = 0.0,
+        outage_length: int = 0,
+        rate_limit_per_second: float = 0.0,
+        rate_limit_retry_after: float = 1.0,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.name = name
+        self.median_latency = median_latency
+        self.error_probability = error_probability
+        self.distribution = LatencyDistribution(distribution)
+        self.latency_sigma = latency_sigma
+        self.outage_probability = outage_probability
+        self.outage_length = outage_length
+        self.rate_limit_per_second = rate_limit_per_second
+        self.rate_limit_retry_after = rate_limit_retry_after
+        self._rng = random.Random(seed)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._outage_remaining = 0
+        self._tokens = rate_limit_per_second
+        self._tokens_updated_at = clock()
+
+        # Опорные точки (квантиль, задержка) для распределения percentiles
+        p90, p99, p999 = (median_latency * factor for factor in tail_factors)
+        self._quantiles: List[Tuple[float, float]] = [
+            (0.0, median_latency / 2),
+            (0.5, median_latency),
+            (0.9, p90),
+            (0.99, p99),
+            (0.999, p999),
+            (1.0, p999 * 2),
+        ]
+
+    @classmethod
+    def from_settings(
+        cls,
+        notification_type: NotificationType
+    ) -> "ProviderSimulator":
+        """
+        Создание симулятора канала по настройкам
+
+        Если PROVIDER_SIMULATOR_ENABLED выключен, создается провайдер
+        с фиксированной задержкой EMAIL_DELAY/TELEGRAM_DELAY и вероятностью
+        ошибки ERROR_PROBABILITY, как и раньше.
+        """
+        if notification_type == NotificationType.EMAIL:
+            median_latency = settings.EMAIL_DELAY
+        else:
+            median_latency = settings.TELEGRAM_DELAY
+
+        if not settings.PROVIDER_SIMULATOR_ENABLED:
+            return cls(
+                name=notification_type.value,
+                median_latency=median_latency,
+                error_probability=settings.ERROR_PROBABILITY
+            )
+
+        seed = settings.PROVIDER_SIMULATOR_SEED
+        if seed is not None:
+            seed += list(NotificationType).index(notification_type)
+
+        return cls(
+            name=notification_type.value,
+            median_latency=median_latency,
+            error_probability=settings.ERROR_PROBABILITY,
+            distribution=settings.PROVIDER_LATENCY_DISTRIBUTION,
+            latency_sigma=settings.PROVIDER_LATENCY_SIGMA,
+            tail_factors=(
+                settings.PROVIDER_LATENCY_P90_FACTOR,
+                settings.PROVIDER_LATENCY_P99_FACTOR,
+                settings.PROVIDER_LATENCY_P999_FACTOR,
+            ),
+            outage_probability=settings.PROVIDER_OUTAGE_PROBABILITY,
+            outage_length=settings.PROVIDER_OUTAGE_LENGTH,
+            rate_limit_per_second=settings.PROVIDER_RATE_LIMIT_PER_SECOND,
+            rate_limit_retry_after=settings.PROVIDER_RATE_LIMIT_RETRY_AFTER,
+            seed=seed
+        )
+
+    def _latency(self, uniform: float, normal: float) -> float:
+        """Задержка по равномерной и нормальной случайным величинам"""
+        if self.distribution == LatencyDistribution.LOGNORMAL:
+            return self.median_latency * math.exp(self.latency_sigma * normal)
+
+        if self.distribution == LatencyDistribution.PERCENTILES:
+            index = bisect.bisect_right(self._quantiles, (uniform, math.inf))
+            index = min(max(index, 1), len(self._quantiles) - 1)
+            (q_low, low), (q_high, high) = (
+                self._quantiles[index - 1], self._quantiles[index]
+            )
+            fraction = (uniform - q_low) / (q_high - q_low)
+            # Интерполяция в логарифмической шкале сохраняет длинный хвост
+            return low * (high / low) ** fraction
+
+        return self.median_latency
+
+    def _take_token(self) -> bool:
+        """Token bucket ограничения частоты запросов"""
+        if self.rate_limit_per_second <= 0:
+            return True
+        now = self._clock()
+        self._tokens = min(
+            self.rate_limit_per_second,
+            self._tokens
+            + (now - self._tokens_updated_at) * self.rate_limit_per_second
+        )
+        self._tokens_updated_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def send(self) -> SendResult:
+        """
+        Симуляция одной попытки отправки
+
+        Returns:
+            Результат попытки с задержкой, которую нужно выдержать
+        """
+        with self._lock:
+            uniform = self._rng.random()
+            normal = self._rng.gauss(0.0, 1.0)
+            outage_roll = self._rng.random()
+            error_roll = self._rng.random()
+
+            latency = self._latency(uniform, normal)
+
+            if self._outage_remaining > 0:
+                self._outage_remaining -= 1
+                return SendResult(SendOutcome.ERROR, latency)
+            if outage_roll < self.outage_probability and self.outage_length > 0:
+                self._outage_remaining = self.outage_length - 1
+                return SendResult(SendOutcome.ERROR, latency)
+            if not self._take_token():
+                return SendResult(
+                    SendOutcome.RATE_LIMITED,
+                    latency,
+                    retry_after=self.rate_limit_retry_after
+                )
+            if error_roll < self.error_probability:
+                return SendResult(SendOutcome.ERROR, latency)
+            return SendResult(SendOutcome.DELIVERED, latency)
+
+
+_providers: Dict[NotificationType, ProviderSimulator] = {}
+
+
+def get_provider(notification_type: NotificationType) -> ProviderSimulator:
+    """Получение (или создание) симулятора провайдера канала"""
+    provider = _providers.get(notification_type)
+    if provider is None:
+        provider = _providers.setdefault(
+            notification_type, ProviderSimulator.from_settings(notification_type)
+        )
+    return provider
@@ -0,0 +1,219 @@
+"""Сервис очистки и архивации старых уведомлений"""
+import asyncio
+import gzip
+import json
+import os
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select, delete
+
+from models.notification import Notification, NotificationStatus
+from models.notification_timing import NotificationTiming
+from models.campaign import CampaignNotification
+from core.settings import settings
+from core.database import db_manager
+from services.stats_service import StatsService
+from logger import logger
+
+
+ARCHIVE_COLUMNS = (
+    Notification.id,
+    Notification.user_id,
+    Notification.message,
+    Notification.type,
+    Notification.status,
+    Notification.created_at,
+    Notification.updated_at,
+    Notification.attempts,
+)
+
+FINAL_STATUSES = (NotificationStatus.SENT, NotificationStatus.FAILED)
+
+
+def _serialize_row(row) -> Dict[str, Any]:
+    """Преобразование строки уведомления в запись архива"""
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "message": row.message,
+        "type": row.type.value,
+        "status": row.status.value,
+        "created_at": row.created_at.isoformat(),
+        "updated_at": row.updated_at.isoformat(),
+        "attempts": row.attempts,
+    }
+
+
+class RetentionService:
+    """Сервис для удаления и архивации завершенных уведомлений"""
+
+    @staticmethod
+    def _bucket_dir(archive_dir: str, user_id: int) -> str:
+        """Каталог партиции архива для пользователя"""
+        bucket = user_id % settings.RETENTION_ARCHIVE_BUCKETS
+        return os.path.join(archive_dir, f"bucket={bucket:04d}")
+
+    @staticmethod
+    def _archive_chunk(
+        rows: List[Any],
+        archive_dir: str,
+        run_id: str
+    ) -> None:
+        """
+        Дозапись пачки строк в сжатые NDJSON файлы партиций
+
+        Каждая пачка добавляется отдельным gzip member, поэтому файл
+        остается читаемым даже при прерывании очистки.
+        """
+        by_bucket: Dict[str, List[str]] = defaultdict(list)
+        for row in rows:
+            by_bucket[RetentionService._bucket_dir(archive_dir, row.user_id)].append(
+                json.dumps(_serialize_row(row), ensure_ascii=False)
+            )
+
+        for bucket_dir, lines in by_bucket.items():
+            os.makedirs(bucket_dir, exist_ok=True)
+            path = os.path.join(bucket_dir, f"{run_id}.ndjson.gz")
+            with gzip.open(path, "at", encoding="utf-8") as archive_file:
+                archive_file.write("\n".join(lines) + "\n")
+
+    @staticmethod
+    def purge(
+        cutoff: Optional[datetime] = None,
+        user_id: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        archive: Optional[bool] = None,
+        archive_dir: Optional[str] = None
+    ) -> int:
+        """
+        Удаление завершенных уведомлений старше cutoff небольшими пачками
+
+        Строки выбираются по возрастанию первичного ключа (keyset), каждая
+        пачка архивируется и удаляется в отдельной короткой транзакции,
+        чтобы не держать долгие блокировки. Счетчики статистики уменьшаются
+        в той же транзакции. Архив пишется до удаления,
+        поэтому при сбое строка может попасть в архив повторно, но не потеряется.
+
+        Args:
+            cutoff: Граница по updated_at (по умолчанию now - RETENTION_DAYS)
+            user_id: Опциональное ограничение очистки одним пользователем
+            batch_size: Размер пачки (по умолчанию RETENTION_BATCH_SIZE)
+            archive: Архивировать ли строки (по умолчанию RETENTION_ARCHIVE_ENABLED)
+            archive_dir: Каталог архива (по умолчанию RETENTION_ARCHIVE_DIR)
+
+        Returns:
+            Количество удаленных уведомлений
+        """
+        if cutoff is None:
+            cutoff = datetime.now() - timedelta(days=settings.RETENTION_DAYS)
+        batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+        if archive is None:
+            archive = settings.RETENTION_ARCHIVE_ENABLED
+        archive_dir = archive_dir or settings.RETENTION_ARCHIVE_DIR
+        run_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+
+        last_id = 0
+        purged = 0
+        while True:
+            query = select(*ARCHIVE_COLUMNS).where(
+                Notification.id > last_id,
+                Notification.status.in_(FINAL_STATUSES),
+                Notification.updated_at < cutoff
+            )
+            if user_id is not None:
+                query = query.where(Notification.user_id == user_id)
+            query = query.order_by(Notification.id).limit(batch_size)
+
+            with db_manager.get_session() as session:
+                rows = session.execute(query).all()
+                if not rows:
+                    break
+
+                if archive:
+                    RetentionService._archive_chunk(rows, archive_dir, run_id)
+
+                ids = [row.id for row in rows]
+                session.execute(
+                    delete(Notification).where(Notification.id.in_(ids))
+                )
+                session.execute(
+                    delete(NotificationTiming)
+                    .where(NotificationTiming.notification_id.in_(ids))
+                )
+                session.execute(
+                    delete(CampaignNotification)
+                    .where(CampaignNotification.notification_id.in_(ids))
+                )
+                purged_counts = Counter(
+                    (row.user_id, row.type, row.status) for row in rows
+                )
+                StatsService.apply_deltas(session, {
+                    key: -count for key, count in purged_counts.items()
+                })
+                StatsService.bump_versions(session, (row.user_id for row in rows))
+                session.commit()
+
+            last_id = ids[-1]
+            purged += len(ids)
+
+        logger.info(
+            f"Retention purge finished: {purged} notifications older than "
+            f"{cutoff.isoformat()} removed",
+            extra={"purged": purged, "archived": archive}
+        )
+        return purged
+
+    @staticmethod
+    def read_archived(
+        user_id: int,
+        status: Optional[NotificationStatus] = None,
+        archive_dir: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Чтение архивной истории пользователя
+
+        Читается только партиция пользователя; повторно заархивированные
+        строки схлопываются по id.
+
+        Args:
+            user_id: ID пользователя
+            status: Опциональный фильтр по статусу
+            archive_dir: Каталог архива (по умолчанию RETENTION_ARCHIVE_DIR)
+
+        Returns:
+            Архивные уведомления в формате ответа API
+        """
+        archive_dir = archive_dir or settings.RETENTION_ARCHIVE_DIR
+        bucket_dir = RetentionService._bucket_dir(archive_dir, user_id)
+        if not os.path.isdir(bucket_dir):
+            return []
+
+        records: Dict[int, Dict[str, Any]] = {}
+        for file_name in sorted(os.listdir(bucket_dir)):
+            if not file_name.endswith(".ndjson.gz"):
+                continue
+            with gzip.open(
+                os.path.join(bucket_dir, file_name), "rt", encoding="utf-8"
+            ) as archive_file:
+                for line in archive_file:
+                    record = json.loads(line)
+                    if record["user_id"] != user_id:
+                        continue
+                    if status and record["status"] != status.value:
+                        continue
+                    records[record["id"]] = record
+
+        return sorted(
+            records.values(), key=lambda item: item["created_at"], reverse=True
+        )
+
+    @staticmethod
+    async def run_periodically() -> None:
+        """Периодический запуск очистки в пуле потоков"""
+        while True:
+            try:
+                await asyncio.to_thread(RetentionService.purge)
+            except Exception as e:
+                logger.error(f"Retention purge failed: {e}", exc_info=True)
+            await asyncio.sleep(settings.RETENTION_INTERVAL)
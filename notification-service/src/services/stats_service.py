@@ -0,0 +1,232 @@
+"""Сервис для инкрементальной статистики уведомлений"""
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import select, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models.notification import (
+    Notification,
+    NotificationType,
+    NotificationStatus
+)
+from models.notification_stats import (
+    NotificationCounter,
+    UserNotificationVersion
+)
+from core.database import db_manager
+from logger import logger
+
+
+CounterKey = Tuple[int, NotificationType, NotificationStatus]
+
+
+def _dialect_insert(session: Session):
+    """Возвращает insert с поддержкой ON CONFLICT для текущего диалекта"""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise RuntimeError(f"Unsupported database dialect: {dialect}")
+
+
+class StatsService:
+    """Сервис для управления счетчиками уведомлений"""
+
+    @staticmethod
+    def apply_deltas(session: Session, deltas: Dict[CounterKey, int]) -> None:
+        """
+        Применение пачки изменений счетчиков одним upsert запросом
+
+        Изменения выполняются в транзакции вызывающей стороны, поэтому
+        счетчики фиксируются вместе с самими уведомлениями.
+
+        Args:
+            session: Сессия базы данных
+            deltas: Изменения счетчиков по ключу (user_id, type, status)
+        """
+        rows = [
+            {
+                "user_id": user_id,
+                "type": notification_type,
+                "status": notification_status,
+                "count": delta,
+            }
+            for (user_id, notification_type, notification_status), delta
+            in deltas.items()
+            if delta
+        ]
+        if not rows:
+            return
+
+        insert = _dialect_insert(session)
+        stmt = insert(NotificationCounter)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                NotificationCounter.user_id,
+                NotificationCounter.type,
+                NotificationCounter.status,
+            ],
+            set_={"count": NotificationCounter.count + stmt.excluded.count}
+        )
+        session.execute(stmt, rows)
+
+    @staticmethod
+    def bump_versions(session: Session, user_ids: Iterable[int]) -> None:
+        """
+        Увеличение версии истории уведомлений пользователей
+
+        Также открывает окно read-your-writes: ближайшие чтения этих
+        пользователей выполняются на основной БД, а не на реплике.
+
+        Args:
+            session: Сессия базы данных
+            user_ids: ID пользователей, чьи уведомления изменились
+        """
+        rows = [
+            {"user_id": user_id, "version": 1}
+            for user_id in sorted(set(user_ids))
+        ]
+        if not rows:
+            return
+
+        insert = _dialect_insert(session)
+        stmt = insert(UserNotificationVersion)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserNotificationVersion.user_id],
+            set_={"version": UserNotificationVersion.version + 1}
+        )
+        session.execute(stmt, rows)
+        db_manager.mark_writes(row["user_id"] for row in rows)
+
+    @staticmethod
+    def get_user_version(user_id: int, db: Session) -> int:
+        """
+        Получение версии истории уведомлений пользователя
+
+        Args:
+            user_id: ID пользователя
+            db: Сессия базы данных
+
+        Returns:
+            Текущая версия (0, если уведомлений еще не было)
+        """
+        version: Optional[int] = db.execute(
+            select(UserNotificationVersion.version).where(
+                UserNotificationVersion.user_id == user_id
+            )
+        ).scalar()
+        return version or 0
+
+    @staticmethod
+    def record_created(
+        session: Session,
+        notifications: Iterable[Notification]
+    ) -> None:
+        """
+        Учет созданных уведомлений
+
+        Args:
+            session: Сессия базы данных
+            notifications: Созданные уведомления
+        """
+        deltas: Counter = Counter()
+        for notification in notifications:
+            deltas[
+                (notification.user_id, notification.type, notification.status)
+            ] += 1
+        StatsService.apply_deltas(session, deltas)
+        StatsService.bump_versions(session, (key[0] for key in deltas))
+
+    @staticmethod
+    def record_transition(
+        session: Session,
+        notification: Notification,
+        old_status: NotificationStatus,
+        new_status: NotificationStatus
+    ) -> None:
+        """
+        Учет изменения уведомления и смены его статуса
+
+        Args:
+            session: Сессия базы данных
+            notification: Уведомление
+            old_status: Предыдущий статус
+            new_status: Новый статус
+        """
+        StatsService.bump_versions(session, [notification.user_id])
+        if old_status == new_status:
+            return
+        StatsService.apply_deltas(session, {
+            (notification.user_id, notification.type, old_status): -1,
+            (notification.user_id, notification.type, new_status): 1,
+        })
+
+    @staticmethod
+    def get_user_counters(
+        user_id: int,
+        db: Session
+    ) -> Dict[Tuple[NotificationType, NotificationStatus], int]:
+        """
+        Получение счетчиков пользователя
+
+        Читает не более len(NotificationType) * len(NotificationStatus)
+        строк по первичному ключу, независимо от размера истории.
+
+        Args:
+            user_id: ID пользователя
+            db: Сессия базы данных
+
+        Returns:
+            Количество уведомлений по ключу (type, status)
+        """
+        query = select(
+            NotificationCounter.type,
+            NotificationCounter.status,
+            NotificationCounter.count
+        ).where(NotificationCounter.user_id == user_id)
+
+        return {
+            (row.type, row.status): row.count
+            for row in db.execute(query)
+            if row.count
+        }
+
+    @staticmethod
+    def rebuild_counters(db: Session) -> None:
+        """
+        Полный пересчет счетчиков по таблице уведомлений
+
+        Используется однократно, если счетчики еще не заполнены,
+        а в таблице уведомлений уже есть данные.
+
+        Args:
+            db: Сессия базы данных
+        """
+        counters_exist = db.execute(
+            select(NotificationCounter.user_id).limit(1)
+        ).first()
+        notifications_exist = db.execute(
+            select(Notification.id).limit(1)
+        ).first()
+        if counters_exist or not notifications_exist:
+            return
+
+        query = select(
+            Notification.user_id,
+            Notification.type,
+            Notification.status,
+            func.count(Notification.id)
+        ).group_by(
+            Notification.user_id,
+            Notification.type,
+            Notification.status
+        )
+        deltas = {
+            (user_id, notification_type, notification_status): count
+            for user_id, notification_type, notification_status, count
+            in db.execute(query)
+        }
+        StatsService.apply_deltas(db, deltas)
+        logger.info(f"Rebuilt notification counters for {len(deltas)} keys")
@@ -0,0 +1,158 @@
+"""Сервис учета времени доставки уведомлений"""
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from models.notification import Notification, NotificationStatus
+from models.notification_timing import NotificationTiming
+from core.settings import settings
+
+
+PERCENTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+
+
+@dataclass
+class LifecycleTiming:
+    """Временные метки отправки, накапливаемые до ее завершения"""
+    dispatch_started_at: datetime
+    first_attempt_at: Optional[datetime] = None
+    attempt_durations: List[float] = field(default_factory=list)
+
+
+def _milliseconds(seconds: float) -> int:
+    return max(0, round(seconds * 1000))
+
+
+def percentile(sorted_values: Sequence[int], fraction: float) -> int:
+    """Перцентиль по отсортированному списку (nearest-rank)"""
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def distribution(values: List[int]) -> Optional[Dict[str, int]]:
+    """Перцентили и максимум списка значений"""
+    if not values:
+        return None
+    values.sort()
+    result = {name: percentile(values, fraction) for name, fraction in PERCENTILES}
+    result["max"] = values[-1]
+    return result
+
+
+class TimingService:
+    """Сервис для записи и агрегации времени доставки"""
+
+    @staticmethod
+    def build_record(
+        notification: Notification,
+        timing: LifecycleTiming,
+        completed_at: datetime
+    ) -> NotificationTiming:
+        """
+        Формирование записи о времени доставки завершенного уведомления
+
+        Args:
+            notification: Уведомление с итоговым статусом
+            timing: Накопленные временные метки отправки
+            completed_at: Момент завершения отправки
+
+        Returns:
+            Запись для добавления в сессию
+        """
+        return NotificationTiming(
+            notification_id=notification.id,
+            type=notification.type,
+            status=notification.status,
+            dispatch_started_at=timing.dispatch_started_at,
+            first_attempt_at=timing.first_attempt_at,
+            completed_at=completed_at,
+            queue_wait_ms=_milliseconds(
+                (timing.dispatch_started_at - notification.created_at).total_seconds()
+            ),
+            end_to_end_ms=_milliseconds(
+                (completed_at - notification.created_at).total_seconds()
+            ),
+            attempt_durations_ms=",".join(
+                str(_milliseconds(duration)) for duration in timing.attempt_durations
+            )
+        )
+
+    @staticmethod
+    def latency_summary(
+        db: Session,
+        since: datetime,
+        threshold_ms: Optional[int] = None,
+        sample_size: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Перцентили времени доставки по каналам
+
+        Время доставки (end_to_end_ms) считается от создания уведомления
+        до успешной отправки. Доля within_threshold учитывает все
+        завершенные уведомления: неотправленные считаются нарушением SLO.
+
+        Счетчики и доля within_threshold считаются в БД по всему окну,
+        а перцентили - по последним sample_size записям канала, поэтому
+        память и время ответа не растут с нагрузкой.
+
+        Args:
+            db: Сессия базы данных
+            since: Учитываются уведомления, завершенные после этого момента
+            threshold_ms: Порог SLO в миллисекундах
+            sample_size: Размер выборки для перцентилей
+                (по умолчанию LATENCY_SAMPLE_SIZE)
+
+        Returns:
+            Сводка по каждому каналу
+        """
+        sample_size = sample_size or settings.LATENCY_SAMPLE_SIZE
+        is_sent = NotificationTiming.status == NotificationStatus.SENT
+        columns = [
+            NotificationTiming.type,
+            func.count().label("total"),
+            func.sum(case((is_sent, 1), else_=0)).label("sent"),
+        ]
+        if threshold_ms is not None:
+            within = and_(is_sent, NotificationTiming.end_to_end_ms <= threshold_ms)
+            columns.append(func.sum(case((within, 1), else_=0)).label("within"))
+        counts = db.execute(
+            select(*columns)
+            .where(NotificationTiming.completed_at >= since)
+            .group_by(NotificationTiming.type)
+        ).all()
+
+        summary = {}
+        for row in sorted(counts, key=lambda item: item.type.value):
+            sample = db.execute(
+                select(
+                    NotificationTiming.status,
+                    NotificationTiming.queue_wait_ms,
+                    NotificationTiming.end_to_end_ms
+                )
+                .where(
+                    NotificationTiming.type == row.type,
+                    NotificationTiming.completed_at >= since
+                )
+                .order_by(NotificationTiming.completed_at.desc())
+                .limit(sample_size)
+            ).all()
+            channel_summary = {
+                "count": row.total,
+                "sent": row.sent,
+                "failed": row.total - row.sent,
+                "sample_size": len(sample),
+                "end_to_end_ms": distribution([
+                    item.end_to_end_ms for item in sample
+                    if item.status == NotificationStatus.SENT
+                ]),
+                "queue_wait_ms": distribution(
+                    [item.queue_wait_ms for item in sample]
+                ),
+            }
+            if threshold_ms is not None:
+                channel_summary["within_threshold"] = row.within / row.total
+            summary[row.type.value] = channel_summary
+        return summary
@@ -8,6 +8,7 @@ from sqlalchemy.pool import StaticPool
 from src.core.database import Base, get_db
 from src.core.constants import TEST_USER_ID, TEST_MESSAGE_CODE
 from src.main import app
+from src.routers import notifications as notifications_router
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -19,6 +20,15 @@ def setup_database():
     Base.metadata.clear()
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    """Сброс счетчиков общего ограничителя частоты между тестами"""
+    # Ограничитель из модуля, с которым работает приложение
+    notifications_router.rate_limiter.reset()
+    yield
+    notifications_router.rate_limiter.reset()
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """Создание тестовой базы данных в памяти"""
@@ -0,0 +1,184 @@
+"""Тесты для кампаний (массовых рассылок)"""
+import asyncio
+import time
+
+from fastapi import status
+
+from src.core.constants import TEST_USER_ID_CAMPAIGN, TEST_MESSAGE_CODE
+from src.core import settings as settings_module
+from src.services import campaign_service as campaign_module
+from src.services.campaign_service import CampaignService, _parse_user_id
+
+
+CAMPAIGN_TIMEOUT = 15.0
+
+
+def wait_for_campaign(client, campaign_id: int) -> dict:
+    """Ожидание завершения кампании"""
+    deadline = time.monotonic() + CAMPAIGN_TIMEOUT
+    while time.monotonic() < deadline:
+        data = client.get(f"/api/campaigns/{campaign_id}").json()
+        if data["status"] in ("completed", "failed"):
+            return data
+        time.sleep(0.1)
+    raise AssertionError(f"Campaign {campaign_id} did not finish: {data}")
+
+
+class TestRecipientParsing:
+    """Тесты разбора ID получателей"""
+
+    def test_parse_user_id(self):
+        """Тест, что принимаются только положительные целые"""
+        assert _parse_user_id(b"42") == 42
+        assert _parse_user_id(b"0") is None
+        assert _parse_user_id(b"-5") is None
+        assert _parse_user_id(b"user_id") is None
+        assert _parse_user_id(b"9" * 40) is None
+
+
+class TestCampaignEndpoints:
+    """Тесты эндпоинтов кампаний"""
+
+    def test_inline_recipients_in_chunks(self, client, monkeypatch):
+        """Тест кампании с получателями в запросе и вставкой пачками"""
+        monkeypatch.setattr(settings_module.settings, "CAMPAIGN_INSERT_CHUNK_SIZE", 2)
+        user_ids = [TEST_USER_ID_CAMPAIGN + offset for offset in range(3)]
+
+        response = client.post("/api/campaigns", json={
+            "message": f"Пользователь {{user_id}}, ваш код: {TEST_MESSAGE_CODE}",
+            "type": "telegram",
+            "user_ids": user_ids + [user_ids[0]]
+        })
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        campaign = response.json()
+        assert campaign["status"] == "running"
+        assert campaign["total_recipients"] == 3
+
+        campaign = wait_for_campaign(client, campaign["id"])
+        assert campaign["status"] == "completed"
+        assert campaign["created_count"] == 3
+        assert campaign["dispatched_count"] == 3
+        assert campaign["sent_count"] + campaign["failed_count"] == 3
+
+        history = client.get(f"/api/notifications/{user_ids[1]}").json()
+        assert any(
+            notification["message"].startswith(f"Пользователь {user_ids[1]},")
+            for notification in history["notifications"]
+        )
+
+    def test_upload_recipients_and_start(self, client):
+        """Тест загрузки файла получателей в draft и запуска"""
+        response = client.post("/api/campaigns", json={
+            "message": f"Ваш код: {TEST_MESSAGE_CODE}",
+            "type": "email"
+        })
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        campaign_id = response.json()["id"]
+        assert response.json()["status"] == "draft"
+
+        response = client.post(f"/api/campaigns/{campaign_id}/start")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        first = TEST_USER_ID_CAMPAIGN + 10
+        body = f"user_id\n{first}\n{first + 1},{first + 2};oops\n{first}".encode()
+        response = client.post(
+            f"/api/campaigns/{campaign_id}/recipients",
+            content=body,
+            headers={"Content-Type": "text/plain"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "campaign_id": campaign_id,
+            "accepted": 4,
+            "rejected": 2,
+            "total_recipients": 3
+        }
+
+        response = client.post(f"/api/campaigns/{campaign_id}/start")
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json()["status"] == "running"
+
+        response = client.post(
+            f"/api/campaigns/{campaign_id}/recipients", content=b"1"
+        )
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+        campaign = wait_for_campaign(client, campaign_id)
+        assert campaign["status"] == "completed"
+        assert campaign["dispatched_count"] == 3
+
+    def test_campaign_not_found(self, client):
+        """Тест 404 для несуществующей кампании"""
+        response = client.get("/api/campaigns/999999999")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def set_running(campaign_id: int) -> None:
+    """Перевод кампании в статус running без запуска фоновой задачи"""
+    # Сессия и модель из модулей, с которыми работает приложение
+    with campaign_module.db_manager.get_session() as session:
+        campaign = session.get(campaign_module.Campaign, campaign_id)
+        campaign.status = campaign_module.CampaignStatus.RUNNING
+
+
+class TestCampaignResume:
+    """Тесты продолжения кампании после прерывания"""
+
+    def test_resume_dispatches_pending_notifications(self, client):
+        """Тест, что уведомления прерванной пачки отправляются при продолжении"""
+        response = client.post("/api/campaigns", json={
+            "message": f"Ваш код: {TEST_MESSAGE_CODE}",
+            "type": "telegram"
+        })
+        campaign_id = response.json()["id"]
+        first = TEST_USER_ID_CAMPAIGN + 20
+        client.post(
+            f"/api/campaigns/{campaign_id}/recipients",
+            content=f"{first} {first + 1} {first + 2}".encode()
+        )
+
+        # Пачка создана и курсор сдвинут, но отправка прервана остановкой
+        rows = CampaignService._insert_chunk(campaign_id)
+        assert len(rows) == 3
+        assert len(CampaignService._pending_notifications(campaign_id)) == 3
+        set_running(campaign_id)
+
+        asyncio.run(CampaignService.run(campaign_id))
+
+        assert CampaignService._pending_notifications(campaign_id) == []
+        campaign = client.get(f"/api/campaigns/{campaign_id}").json()
+        assert campaign["status"] == "completed"
+        assert campaign["created_count"] == 3
+        assert campaign["dispatched_count"] == 3
+        assert campaign["sent_count"] + campaign["failed_count"] == 3
+
+    def test_cancel_saves_progress_and_keeps_running(self, client):
+        """Тест, что отмена сохраняет кампанию для продолжения"""
+        response = client.post("/api/campaigns", json={
+            "message": f"Ваш код: {TEST_MESSAGE_CODE}",
+            "type": "email"
+        })
+        campaign_id = response.json()["id"]
+        first = TEST_USER_ID_CAMPAIGN + 30
+        client.post(
+            f"/api/campaigns/{campaign_id}/recipients",
+            content=f"{first} {first + 1}".encode()
+        )
+        set_running(campaign_id)
+
+        async def interrupted_run():
+            task = asyncio.create_task(CampaignService.run(campaign_id))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(interrupted_run())
+        campaign = client.get(f"/api/campaigns/{campaign_id}").json()
+        assert campaign["status"] == "running"
+        assert campaign["created_count"] == 2
+        assert len(CampaignService._pending_notifications(campaign_id)) == 2
+
+        asyncio.run(CampaignService.run(campaign_id))
+        campaign = client.get(f"/api/campaigns/{campaign_id}").json()
+        assert campaign["status"] == "completed"
+        assert campaign["dispatched_count"] == 2
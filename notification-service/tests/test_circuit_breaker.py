@@ -0,0 +1,154 @@
+"""Тесты для circuit breaker каналов доставки"""
+from fastapi import status
+
+from src.core.circuit_breaker import BreakerState, CircuitBreaker
+from src.core.constants import TEST_MESSAGE_CODE, TEST_USER_ID_BREAKER
+from src.routers import notifications as router_module
+from src.schemas.notification import NotificationCreate
+from src.services import notification_service as service_module
+from src.services.notification_service import NotificationService
+
+
+class FakeClock:
+    """Управляемые часы для тестов"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        name="telegram",
+        failure_rate_threshold=0.5,
+        minimum_calls=4,
+        window_seconds=10.0,
+        window_buckets=5,
+        open_timeout=5.0,
+        half_open_max_calls=2,
+        clock=clock
+    )
+
+
+class TestCircuitBreaker:
+    """Тесты переходов состояний circuit breaker"""
+
+    def test_stays_closed_below_minimum_calls(self):
+        """Тест, что breaker не размыкается до минимального числа попыток"""
+        breaker = make_breaker(FakeClock())
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.state == BreakerState.CLOSED
+        assert breaker.allow_request()
+
+    def test_opens_on_failure_rate(self):
+        """Тест размыкания при превышении доли ошибок"""
+        breaker = make_breaker(FakeClock())
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == BreakerState.CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == BreakerState.OPEN
+        assert not breaker.allow_request()
+
+    def test_old_failures_leave_window(self):
+        """Тест, что ошибки за пределами окна не учитываются"""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(3):
+            breaker.record_failure()
+
+        clock.now += 11.0
+        breaker.record_failure()
+        assert breaker.state == BreakerState.CLOSED
+        assert breaker.snapshot()["window_failures"] == 1
+
+    def test_half_open_probes_close_breaker(self):
+        """Тест пробных попыток в half-open и замыкания после успехов"""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure()
+        assert breaker.state == BreakerState.OPEN
+
+        clock.now += 5.0
+        assert breaker.state == BreakerState.HALF_OPEN
+        assert breaker.allow_request()
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        breaker.record_success()
+        assert breaker.state == BreakerState.CLOSED
+        assert breaker.snapshot()["window_calls"] == 0
+
+    def test_half_open_failure_reopens(self):
+        """Тест повторного размыкания при ошибке пробной попытки"""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure()
+
+        clock.now += 5.0
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == BreakerState.OPEN
+        assert not breaker.allow_request()
+
+
+class TestBreakerMetrics:
+    """Тесты endpoint мониторинга circuit breaker"""
+
+    def test_breakers_endpoint(self, client):
+        """Тест, что состояние доступно по каждому каналу"""
+        response = client.get("/api/metrics/breakers")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert set(data["breakers"]) == {"email", "telegram"}
+        assert set(data["parked"]) == {"email", "telegram"}
+        for breaker in data["breakers"].values():
+            assert breaker["state"] in {item.value for item in BreakerState}
+
+
+class TestParkedNotifications:
+    """Тесты сохранения отложенных уведомлений"""
+
+    def test_parked_notifications_survive_restart(self, client, monkeypatch):
+        """Тест восстановления очереди отложенных уведомлений из БД"""
+        # Фоновая задача drain_parked не должна забирать уведомления из очереди
+        # во время теста (и в модуле приложения, и в модуле тестов)
+        for service in (NotificationService, router_module.NotificationService):
+            monkeypatch.setattr(service, "dispatch_parked", staticmethod(lambda: 0))
+        notification_type = service_module.NotificationType.EMAIL
+        with service_module.db_manager.get_session() as session:
+            [notification_id] = NotificationService.insert_many(session, [
+                NotificationCreate(
+                    user_id=TEST_USER_ID_BREAKER,
+                    message=f"Ваш код: {TEST_MESSAGE_CODE}",
+                    type="email"
+                )
+            ])
+            session.commit()
+
+        NotificationService._park(notification_id, notification_type, 2)
+        queue = service_module._parked[notification_type]
+        assert (notification_id, 2) in queue
+
+        # Перезапуск: очередь в памяти потеряна
+        queue.clear()
+        service_module._parked_rows.clear()
+        assert NotificationService.restore_parked() >= 1
+        assert (notification_id, 2) in queue
+
+        # После итогового статуса уведомление больше не восстанавливается
+        queue.clear()
+        NotificationService._complete_notification(
+            notification_id, service_module.NotificationStatus.SENT, 2
+        )
+        service_module._parked_rows.clear()
+        NotificationService.restore_parked()
+        assert (notification_id, 2) not in queue
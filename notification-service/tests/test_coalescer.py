@@ -0,0 +1,98 @@
+"""Тесты для подавления дублей и дайджестов"""
+from fastapi import status
+
+from src.core.constants import TEST_USER_ID_COALESCE, TEST_MESSAGE_CODE
+from src.models.notification import NotificationType
+from src.services import coalescer as coalescer_module
+from src.services.coalescer import NotificationCoalescer
+
+
+class FakeClock:
+    """Управляемые часы для тестов"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_coalescer(clock: FakeClock, max_keys: int = 100) -> NotificationCoalescer:
+    return NotificationCoalescer(
+        window_seconds=10.0,
+        max_keys=max_keys,
+        digest_max_messages=3,
+        clock=clock
+    )
+
+
+class TestNotificationCoalescer:
+    """Тесты индекса недавних уведомлений"""
+
+    def test_duplicate_within_window(self):
+        """Тест обнаружения дубля внутри окна и его истечения"""
+        clock = FakeClock()
+        coalescer = make_coalescer(clock)
+        coalescer.remember(1, NotificationType.EMAIL, "code 1111", 42)
+
+        assert coalescer.find_duplicate(1, NotificationType.EMAIL, "code 1111") == 42
+        assert coalescer.find_duplicate(1, NotificationType.EMAIL, "code 2222") is None
+        assert coalescer.find_duplicate(1, NotificationType.TELEGRAM, "code 1111") is None
+        assert coalescer.find_duplicate(2, NotificationType.EMAIL, "code 1111") is None
+
+        clock.now += 10.0
+        assert coalescer.find_duplicate(1, NotificationType.EMAIL, "code 1111") is None
+        assert len(coalescer) == 0
+
+    def test_memory_is_bounded(self):
+        """Тест вытеснения самых старых записей при переполнении"""
+        coalescer = make_coalescer(FakeClock(), max_keys=5)
+        for index in range(100):
+            coalescer.remember(1, NotificationType.EMAIL, f"message {index}", index)
+        assert len(coalescer) == 5
+        assert coalescer.find_duplicate(1, NotificationType.EMAIL, "message 99") == 99
+        assert coalescer.find_duplicate(1, NotificationType.EMAIL, "message 0") is None
+
+    def test_digest_collects_messages(self):
+        """Тест накопления сообщений дайджеста с ограничением размера"""
+        coalescer = make_coalescer(FakeClock())
+        assert coalescer.append_to_digest(1, NotificationType.EMAIL, "a") is None
+
+        assert coalescer.open_digest(1, NotificationType.EMAIL, 7)
+        assert not coalescer.open_digest(1, NotificationType.EMAIL, 8)
+        assert coalescer.append_to_digest(1, NotificationType.EMAIL, "b") == 7
+        assert coalescer.append_to_digest(1, NotificationType.EMAIL, "c") == 7
+        # Дайджест заполнен: первое сообщение и два добавленных
+        assert coalescer.append_to_digest(1, NotificationType.EMAIL, "d") is None
+
+        assert coalescer.close_digest(1, NotificationType.EMAIL, 8) == []
+        assert coalescer.close_digest(1, NotificationType.EMAIL, 7) == ["b", "c"]
+        assert coalescer.append_to_digest(1, NotificationType.EMAIL, "e") is None
+
+
+class TestCreateCoalescing:
+    """Тесты объединения на эндпоинте создания"""
+
+    def test_duplicate_returns_existing(self, client, monkeypatch):
+        """Тест, что повтор сообщения возвращает существующее уведомление"""
+        monkeypatch.setattr(coalescer_module.settings, "COALESCE_MODE", "dedupe")
+        payload = {
+            "user_id": TEST_USER_ID_COALESCE,
+            "message": f"Ваш код: {TEST_MESSAGE_CODE}",
+            "type": "telegram"
+        }
+        first = client.post("/api/notifications", json=payload)
+        assert first.status_code == status.HTTP_201_CREATED
+
+        second = client.post("/api/notifications", json=payload)
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["id"] == first.json()["id"]
+
+        # История пользователя накапливается между запусками тестов,
+        # поэтому проверяются только уведомления, созданные этим тестом
+        history = client.get(f"/api/notifications/{TEST_USER_ID_COALESCE}")
+        created = [
+            item["id"] for item in history.json()["notifications"]
+            if item["id"] >= first.json()["id"]
+        ]
+        assert created == [first.json()["id"]]
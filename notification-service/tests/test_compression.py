@@ -0,0 +1,112 @@
+"""Тесты для сжатия ответов"""
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.core import settings as settings_module
+from src.core.compression import (
+    Codec,
+    CompressionMiddleware,
+    negotiate,
+    parse_accept_encoding
+)
+
+
+LARGE_ITEMS = [
+    {"id": index, "type": "telegram", "status": "sent", "message": "Ваш код: 1234"}
+    for index in range(200)
+]
+CODECS = {
+    "gzip": Codec("gzip", gzip.compress),
+    "zstd": Codec("zstd", lambda data: data),
+}
+
+
+class TestNegotiation:
+    """Тесты выбора алгоритма по Accept-Encoding"""
+
+    def test_parse_weights(self):
+        """Тест разбора весов q"""
+        assert parse_accept_encoding("gzip, br;q=0.5, zstd;q=0") == {
+            "gzip": 1.0, "br": 0.5, "zstd": 0.0
+        }
+
+    def test_server_preference_on_equal_weights(self):
+        """Тест, что при равных весах выбирается предпочтение сервера"""
+        codec = negotiate("gzip, zstd", CODECS, ["zstd", "br", "gzip"])
+        assert codec.name == "zstd"
+
+    def test_client_weights_and_unavailable_codecs(self):
+        """Тест учета весов клиента, запрета и недоступных алгоритмов"""
+        assert negotiate("zstd;q=0.1, gzip", CODECS, ["zstd", "gzip"]).name == "gzip"
+        assert negotiate("br", CODECS, ["zstd", "br", "gzip"]) is None
+        assert negotiate("*;q=0.5, zstd;q=0", CODECS, ["zstd", "gzip"]).name == "gzip"
+        assert negotiate("identity", CODECS, ["zstd", "gzip"]) is None
+        assert negotiate(None, CODECS, ["gzip"]) is None
+
+
+class TestCompressionMiddleware:
+    """Тесты middleware сжатия"""
+
+    @pytest.fixture
+    def compression_client(self, monkeypatch):
+        monkeypatch.setattr(settings_module.settings, "COMPRESSION_ENCODINGS", "gzip")
+        monkeypatch.setattr(settings_module.settings, "COMPRESSION_MIN_SIZE", 1024)
+        monkeypatch.setattr(settings_module.settings, "COMPRESSION_OFFLOAD_SIZE", 4096)
+
+        app = FastAPI()
+
+        @app.get("/large")
+        async def large():
+            return LARGE_ITEMS
+
+        @app.get("/small")
+        async def small():
+            return {"status": "ok"}
+
+        @app.get("/text")
+        async def text():
+            return PlainTextResponse("x" * 2000)
+
+        @app.get("/events")
+        async def events():
+            async def stream():
+                yield "data: " + "x" * 2000 + "\n\n"
+            return StreamingResponse(stream(), media_type="text/event-stream")
+
+        app.add_middleware(CompressionMiddleware)
+        return TestClient(app)
+
+    def test_large_body_is_compressed_off_loop(self, compression_client):
+        """Тест сжатия большого ответа (выше порога выноса в пул потоков)"""
+        response = compression_client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json() == LARGE_ITEMS
+
+    def test_medium_text_is_compressed_inline(self, compression_client):
+        """Тест сжатия ответа между порогами"""
+        response = compression_client.get("/text", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == "x" * 2000
+
+    def test_small_body_is_not_compressed(self, compression_client):
+        """Тест, что ответ меньше порога отправляется как есть"""
+        response = compression_client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"status": "ok"}
+
+    def test_event_stream_and_identity_bypass(self, compression_client):
+        """Тест, что SSE и клиенты без сжатия получают исходный ответ"""
+        response = compression_client.get("/events", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+        response = compression_client.get(
+            "/large", headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in response.headers
+        assert response.json() == LARGE_ITEMS
@@ -0,0 +1,109 @@
+"""Тесты для маршрутизации чтений на реплики"""
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+
+from src.core import database as database_module
+from src.core.database import DatabaseManager
+
+
+class FakeClock:
+    """Управляемые часы для тестов"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_marker(path, name: str) -> None:
+    """Создание таблицы, по которой видно, из какой БД выполнено чтение"""
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS db_marker (name TEXT)")
+        conn.execute("INSERT INTO db_marker VALUES (?)", (name,))
+
+
+def read_marker(manager: DatabaseManager, user_id=None) -> str:
+    with manager.get_read_session(user_id) as session:
+        return session.execute(text("SELECT name FROM db_marker")).scalar()
+
+
+@pytest.fixture
+def two_databases(tmp_path, monkeypatch):
+    """Основная БД и реплика в двух файлах SQLite"""
+    primary_path = tmp_path / "primary.db"
+    replica_path = tmp_path / "replica.db"
+    create_marker(primary_path, "primary")
+    create_marker(replica_path, "replica")
+
+    settings = database_module.settings
+    monkeypatch.setattr(settings, "SQLITE_DEFAULT_PATH", f"sqlite:///{primary_path}")
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", f"sqlite:///{replica_path}")
+    monkeypatch.setattr(settings, "DATABASE_READ_YOUR_WRITES_WINDOW", 5.0)
+
+    clock = FakeClock()
+    manager = DatabaseManager(clock=clock)
+    manager.init()
+    yield manager, clock
+    manager.close()
+
+
+class TestReadReplicas:
+    """Тесты маршрутизации чтений"""
+
+    def test_reads_go_to_replica(self, two_databases):
+        """Тест, что чтения выполняются на реплике, а запись на основной БД"""
+        manager, _ = two_databases
+        assert read_marker(manager) == "replica"
+        assert read_marker(manager, user_id=1) == "replica"
+        with manager.get_session() as session:
+            assert session.execute(text("SELECT name FROM db_marker")).scalar() == "primary"
+
+    def test_read_your_writes_window(self, two_databases):
+        """Тест чтения с основной БД сразу после изменения пользователя"""
+        manager, clock = two_databases
+        manager.mark_writes([1])
+
+        assert read_marker(manager, user_id=1) == "primary"
+        assert read_marker(manager, user_id=2) == "replica"
+
+        clock.now += 5.0
+        assert read_marker(manager, user_id=1) == "replica"
+
+    def test_unhealthy_replica_falls_back_to_primary(
+        self, two_databases, tmp_path, monkeypatch
+    ):
+        """Тест, что при недоступной реплике чтения идут на основную БД"""
+        manager, _ = two_databases
+        # Реплика недоступна: путь к файлу в несуществующем каталоге
+        broken = DatabaseManager()
+        broken._engine = manager._engine
+        broken._session_factory = manager._session_factory
+        monkeypatch.setattr(
+            database_module.settings,
+            "DATABASE_REPLICA_URLS",
+            f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+        )
+        broken.init_replicas()
+
+        assert broken.check_replicas() == [False]
+        assert read_marker(broken) == "primary"
+
+    def test_without_replicas(self, tmp_path, monkeypatch):
+        """Тест, что без реплик все чтения выполняются на основной БД"""
+        primary_path = tmp_path / "primary.db"
+        create_marker(primary_path, "primary")
+        settings = database_module.settings
+        monkeypatch.setattr(settings, "SQLITE_DEFAULT_PATH", f"sqlite:///{primary_path}")
+        monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", None)
+
+        manager = DatabaseManager()
+        manager.init()
+        try:
+            manager.mark_writes([1])
+            assert read_marker(manager, user_id=1) == "primary"
+            assert read_marker(manager) == "primary"
+        finally:
+            manager.close()
@@ -0,0 +1,119 @@
+"""Тесты для групповой фиксации записей"""
+import asyncio
+import threading
+
+import pytest
+from fastapi import status
+
+from src.core import settings as settings_module
+from src.core.constants import TEST_USER_ID, TEST_MESSAGE_CODE
+from src.core.group_commit import GroupCommitter
+
+
+class RecordingCommit:
+    """Функция записи пачки, запоминающая пачки"""
+
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        if self.fail_on in items:
+            raise ValueError(f"bad item {self.fail_on}")
+        return [item * 10 for item in items]
+
+
+class TestGroupCommitter:
+    """Тесты объединения записей в транзакции"""
+
+    def test_concurrent_submits_share_one_commit(self):
+        """Тест, что конкурентные записи фиксируются одной пачкой"""
+        commit = RecordingCommit()
+        committer = GroupCommitter(commit, max_delay=0.01, max_batch=100)
+
+        async def scenario():
+            return await asyncio.gather(*(committer.submit(i) for i in range(5)))
+
+        assert asyncio.run(scenario()) == [0, 10, 20, 30, 40]
+        assert commit.batches == [[0, 1, 2, 3, 4]]
+
+    def test_max_batch_splits_commits(self):
+        """Тест ограничения размера пачки"""
+        commit = RecordingCommit()
+        committer = GroupCommitter(commit, max_delay=10.0, max_batch=2)
+
+        async def scenario():
+            return await asyncio.gather(*(committer.submit(i) for i in range(5)))
+
+        assert asyncio.run(scenario()) == [0, 10, 20, 30, 40]
+        assert [len(batch) for batch in commit.batches] == [2, 2, 1]
+
+    def test_failed_batch_retries_records_one_by_one(self):
+        """Тест, что ошибка одной записи не отклоняет остальные"""
+        commit = RecordingCommit(fail_on=2)
+        committer = GroupCommitter(commit, max_delay=0.01, max_batch=100)
+
+        async def scenario():
+            return await asyncio.gather(
+                *(committer.submit(i) for i in range(4)), return_exceptions=True
+            )
+
+        results = asyncio.run(scenario())
+        assert results[0] == 0 and results[1] == 10 and results[3] == 30
+        assert isinstance(results[2], ValueError)
+        assert commit.batches[0] == [0, 1, 2, 3]
+        assert commit.batches[1:] == [[0], [1], [2], [3]]
+
+    def test_cancelled_commit_fails_waiting_records(self):
+        """Тест, что отмена транзакции не оставляет записи ждать вечно"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_commit(items):
+            started.set()
+            release.wait()
+            return items
+
+        committer = GroupCommitter(blocking_commit, max_delay=0.0, max_batch=100)
+
+        async def scenario():
+            submits = asyncio.gather(
+                *(committer.submit(i) for i in range(3)), return_exceptions=True
+            )
+            await asyncio.to_thread(started.wait)
+            for task in list(committer._tasks):
+                task.cancel()
+            try:
+                return await asyncio.wait_for(submits, 1.0)
+            finally:
+                release.set()
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+class TestGroupCommitEndpoint:
+    """Тесты создания уведомлений в режиме group commit"""
+
+    @pytest.fixture(autouse=True)
+    def enable_group_commit(self, monkeypatch):
+        monkeypatch.setattr(settings_module.settings, "GROUP_COMMIT_ENABLED", True)
+
+    def test_create_returns_committed_notification(self, client):
+        """Тест, что созданное уведомление сохранено и доступно в истории"""
+        response = client.post("/api/notifications", json={
+            "user_id": TEST_USER_ID,
+            "message": f"Групповая запись: {TEST_MESSAGE_CODE}",
+            "type": "telegram"
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        notification = response.json()
+        assert notification["id"] > 0
+        assert notification["status"] == "pending"
+
+        response = client.post(
+            "/api/notifications/lookup", json={"ids": [notification["id"]]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["notifications"][0]["user_id"] == TEST_USER_ID
@@ -0,0 +1,166 @@
+"""Тесты для импорта уведомлений из файла"""
+import asyncio
+import io
+import json
+
+import pytest
+
+from src import import_notifications as import_module
+from src.core.constants import TEST_MESSAGE_CODE, TEST_USER_ID_IMPORT
+from src.import_notifications import (
+    Checkpoint,
+    ImportStats,
+    SourceReader,
+    chunked,
+    file_fingerprint,
+    insert_chunk,
+    read_csv,
+    read_ndjson,
+    run_import,
+    validate
+)
+from src.schemas.notification import NotificationCreate
+
+
+CSV_BODY = (
+    "user_id,message,type\n"
+    f"{TEST_USER_ID_IMPORT},\"Код: {TEST_MESSAGE_CODE}\",telegram\n"
+    f"{TEST_USER_ID_IMPORT},\"Многострочное\nсообщение\",email\n"
+    "abc,Плохой user_id,email\n"
+    f"{TEST_USER_ID_IMPORT},Неизвестный тип,sms\n"
+    f"{TEST_USER_ID_IMPORT + 1},Последнее,telegram\n"
+)
+
+
+class TestPipeline:
+    """Тесты генераторов чтения, проверки и разбиения на пачки"""
+
+    def test_csv_records_track_offsets(self):
+        """Тест, что позиция после записи позволяет продолжить чтение"""
+        source = io.BytesIO(CSV_BODY.encode())
+        reader = SourceReader(source)
+        records = read_csv(reader)
+
+        line, data, error = next(records)
+        assert error is None and data["type"] == "telegram"
+        _, data, _ = next(records)
+        assert data["message"] == "Многострочное\nсообщение"
+        offset, lines = reader.offset, reader.line
+        assert lines == 4
+
+        resumed = SourceReader(io.BytesIO(CSV_BODY.encode()), offset, lines)
+        remaining = [data for _, data, _ in read_csv(resumed)]
+        assert [row["message"] for row in remaining] == [
+            "Плохой user_id", "Неизвестный тип", "Последнее"
+        ]
+
+    def test_validate_counts_rejected_rows(self):
+        """Тест отбраковки строк, не прошедших проверку NotificationCreate"""
+        stats = ImportStats()
+        errors = io.StringIO()
+        records = read_csv(SourceReader(io.BytesIO(CSV_BODY.encode())))
+        valid = list(validate(records, stats, errors))
+
+        assert len(valid) == 3
+        assert stats.read == 5 and stats.rejected == 2
+        rejected = [json.loads(line) for line in errors.getvalue().splitlines()]
+        assert [item["line"] for item in rejected] == [5, 6]
+        assert "user_id" in rejected[0]["error"]
+
+    def test_ndjson_and_chunks(self):
+        """Тест чтения NDJSON и разбиения на пачки"""
+        body = b'{"user_id": 1, "message": "a", "type": "email"}\n\n{broken\n'
+        records = list(read_ndjson(SourceReader(io.BytesIO(body))))
+        assert records[0][1]["message"] == "a"
+        assert records[1][0] == 3 and records[1][2].startswith("Invalid JSON")
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+class TestRunImport:
+    """Тесты импорта в базу данных"""
+
+    def test_import_resumes_from_checkpoint(self, client, tmp_path):
+        """Тест продолжения прерванного импорта с сохраненной позиции"""
+        path = tmp_path / "notifications.csv"
+        path.write_bytes(CSV_BODY.encode())
+        source = str(path.resolve())
+
+        # Первые две записи (строки 1-4) записаны прерванным запуском с --send
+        # вместе с позицией, но отправить их он не успел
+        reader = SourceReader(io.BytesIO(CSV_BODY.encode()))
+        records = read_csv(reader)
+        chunk = [
+            NotificationCreate.model_validate(data)
+            for _, data, _ in (next(records), next(records))
+        ]
+        progress = Checkpoint(
+            source=source, offset=reader.offset, line=reader.line,
+            fingerprint=file_fingerprint(str(path))
+        )
+        interrupted_ids = insert_chunk(chunk, progress, track_unsent=True)
+        assert progress.inserted == 2 and progress.unsent == interrupted_ids
+
+        result = asyncio.run(run_import(str(path), chunk_size=2, send=True))
+        assert result.inserted == 3
+        assert result.rejected == 2
+        assert result.line == 7
+
+        with import_module.db_manager.get_session() as session:
+            saved = Checkpoint.load(session, source)
+        assert saved.completed_at is not None and saved.unsent == []
+
+        history = client.get(f"/api/notifications/{TEST_USER_ID_IMPORT}").json()
+        statuses = {
+            notification["id"]: notification["status"]
+            for notification in history["notifications"]
+        }
+        assert all(
+            statuses[notification_id] != "pending"
+            for notification_id in interrupted_ids
+        )
+
+        history = client.get(f"/api/notifications/{TEST_USER_ID_IMPORT + 1}").json()
+        assert any(
+            notification["message"] == "Последнее"
+            for notification in history["notifications"]
+        )
+
+    def test_completed_or_changed_file_is_not_imported_again(self, client, tmp_path):
+        """Тест, что повторный запуск не дублирует уведомления завершенного импорта"""
+        path = tmp_path / "notifications.ndjson"
+        path.write_text(json.dumps({
+            "user_id": TEST_USER_ID_IMPORT + 2,
+            "message": f"Код: {TEST_MESSAGE_CODE}",
+            "type": "email"
+        }) + "\n", encoding="utf-8")
+
+        first = asyncio.run(run_import(str(path)))
+        assert first.inserted == 1 and first.completed_at is not None
+        history_url = f"/api/notifications/{TEST_USER_ID_IMPORT + 2}"
+        total = client.get(history_url).json()["total"]
+
+        again = asyncio.run(run_import(str(path)))
+        assert again.inserted == 1 and again.completed_at == first.completed_at
+        assert client.get(history_url).json()["total"] == total
+
+        # Файл по тому же пути заменен: продолжать со старой позиции нельзя
+        path.write_text(path.read_text(encoding="utf-8") * 2, encoding="utf-8")
+        with pytest.raises(ValueError, match="--restart"):
+            asyncio.run(run_import(str(path)))
+
+    def test_unsent_notifications_require_send(self, client, tmp_path):
+        """Тест, что прерванный импорт с --send не продолжается без --send"""
+        path = tmp_path / "notifications.csv"
+        path.write_bytes(CSV_BODY.encode())
+        reader = SourceReader(io.BytesIO(CSV_BODY.encode()))
+        _, data, _ = next(read_csv(reader))
+        progress = Checkpoint(
+            source=str(path.resolve()), offset=reader.offset, line=reader.line,
+            fingerprint=file_fingerprint(str(path))
+        )
+        insert_chunk([NotificationCreate.model_validate(data)], progress, True)
+
+        with pytest.raises(ValueError, match="--send"):
+            asyncio.run(run_import(str(path)))
+        with import_module.db_manager.get_session() as session:
+            assert Checkpoint.load(session, progress.source).unsent == progress.unsent
@@ -0,0 +1,77 @@
+"""Тесты для мониторинга event loop"""
+import threading
+
+from fastapi import status
+
+from src.core.loop_monitor import LoopMonitor
+
+
+class FakeClock:
+    """Управляемые часы для тестов"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_monitor(clock: FakeClock) -> LoopMonitor:
+    return LoopMonitor(
+        interval=0.1,
+        blocking_threshold=0.2,
+        max_reports=2,
+        clock=clock
+    )
+
+
+def blocked_here(monitor: LoopMonitor, clock: FakeClock):
+    clock.now += 0.5
+    return monitor.check_blocking()
+
+
+class TestLoopMonitor:
+    """Тесты измерения задержки и обнаружения блокировок"""
+
+    def test_lag_histogram(self):
+        """Тест накопления задержки в гистограмме"""
+        monitor = make_monitor(FakeClock())
+        for lag in (0.0005, 0.0005, 0.003, 0.3):
+            monitor.record_lag(lag)
+
+        lag = monitor.snapshot()["lag"]
+        assert lag["samples"] == 4
+        assert lag["buckets"]["le_1ms"] == 2
+        assert lag["buckets"]["le_5ms"] == 1
+        assert lag["buckets"]["le_500ms"] == 1
+        assert lag["p50_ms"] == 1.0
+        assert lag["max_ms"] == 300.0
+        assert lag["last_ms"] == 300.0
+
+    def test_blocking_reported_once_with_stack(self):
+        """Тест отчета о блокировке со стеком заблокированного потока"""
+        clock = FakeClock()
+        monitor = make_monitor(clock)
+        monitor._loop_thread_id = threading.get_ident()
+        monitor.record_lag(0.0)
+
+        assert monitor.check_blocking() is None
+        report = blocked_here(monitor, clock)
+        assert report is not None
+        assert report["blocked_for_ms"] >= 200
+        assert any("blocked_here" in line for line in report["stack"])
+        assert monitor.check_blocking() is None
+
+        # Следующий тик монитора фиксирует фактическую длительность
+        monitor.record_lag(0.55)
+        blocking = monitor.snapshot()["blocking"]
+        assert blocking["count"] == 1
+        assert blocking["recent"][0]["duration_ms"] == 550.0
+
+    def test_event_loop_endpoint(self, client):
+        """Тест эндпоинта метрик event loop"""
+        response = client.get("/api/metrics/event-loop")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert "samples" in data["lag"]
+        assert data["blocking"]["count"] >= 0
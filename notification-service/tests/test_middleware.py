@@ -0,0 +1,77 @@
+"""Тесты для middleware логирования запросов"""
+import logging
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.core import middleware as middleware_module
+from src.core.middleware import RequestLoggingMiddleware
+from src.core.constants import HTTP_STATUS_INTERNAL_SERVER_ERROR
+
+LOGGER_NAME = "notification_service"
+
+
+@pytest.fixture
+def middleware_client():
+    """Тестовое приложение с RequestLoggingMiddleware"""
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"status": "ok"}
+
+    @app.get("/error")
+    async def error():
+        raise HTTPException(status_code=HTTP_STATUS_INTERNAL_SERVER_ERROR)
+
+    app.add_middleware(RequestLoggingMiddleware)
+    with TestClient(app) as client:
+        yield client
+
+
+def _request_records(caplog):
+    return [
+        record for record in caplog.records
+        if record.name == LOGGER_NAME and record.msg.startswith("Request")
+    ]
+
+
+class TestRequestLoggingMiddleware:
+    """Тесты сэмплирования логов запросов"""
+
+    def test_success_not_logged_when_sampled_out(
+        self, middleware_client, caplog, monkeypatch
+    ):
+        """Тест, что успешные запросы не логируются при нулевой доле"""
+        monkeypatch.setattr(middleware_module.settings, "LOG_REQUESTS_SAMPLE_RATE", 0.0)
+        caplog.set_level(logging.INFO, logger=LOGGER_NAME)
+
+        response = middleware_client.get("/ok")
+        assert response.status_code == 200
+        assert _request_records(caplog) == []
+
+    def test_errors_always_logged(self, middleware_client, caplog, monkeypatch):
+        """Тест, что ошибки логируются независимо от сэмплирования"""
+        monkeypatch.setattr(middleware_module.settings, "LOG_REQUESTS_SAMPLE_RATE", 0.0)
+        caplog.set_level(logging.INFO, logger=LOGGER_NAME)
+
+        response = middleware_client.get("/error")
+        assert response.status_code == HTTP_STATUS_INTERNAL_SERVER_ERROR
+
+        records = _request_records(caplog)
+        assert len(records) == 1
+        assert records[0].levelno == logging.ERROR
+        assert records[0].status_code == HTTP_STATUS_INTERNAL_SERVER_ERROR
+
+    def test_slow_requests_always_logged(self, middleware_client, caplog, monkeypatch):
+        """Тест, что медленные запросы логируются с уровнем WARNING"""
+        monkeypatch.setattr(middleware_module.settings, "LOG_REQUESTS_SAMPLE_RATE", 0.0)
+        monkeypatch.setattr(middleware_module.settings, "LOG_SLOW_REQUEST_THRESHOLD", 0.0)
+        caplog.set_level(logging.INFO, logger=LOGGER_NAME)
+
+        middleware_client.get("/ok")
+
+        records = _request_records(caplog)
+        assert len(records) == 1
+        assert records[0].levelno == logging.WARNING
+        assert records[0].path == "/ok"
@@ -1,5 +1,6 @@
 """Тесты для API уведомлений"""
 import time
+from datetime import datetime, timedelta
 from fastapi import status
 
 from src.models.notification import NotificationStatus
@@ -12,9 +13,13 @@ from src.core.constants import (
     TEST_USER_ID_MULTI_1,
     TEST_USER_ID_MULTI_2,
     TEST_EMPTY_NOTIFICATIONS_COUNT,
-    TEST_MIN_NOTIFICATIONS_COUNT
+    TEST_MIN_NOTIFICATIONS_COUNT,
+    TEST_USER_ID_STATS,
+    TEST_USER_ID_RETENTION,
+    TEST_USER_ID_ETAG
 )
 from src.core.settings import settings
+from src.services.retention_service import RetentionService
 
 
 class TestCreateNotification:
@@ -144,6 +149,243 @@ class TestGetNotifications:
             assert notification["user_id"] == TEST_USER_ID_MULTI_1
 
 
+class TestNotificationFields:
+    """Тесты для выбора полей в истории уведомлений"""
+
+    def test_get_notifications_selected_fields(self, client, notification_data):
+        """Тест, что возвращаются только запрошенные поля"""
+        client.post("/api/notifications", json=notification_data)
+
+        response = client.get(
+            f"/api/notifications/{notification_data['user_id']}",
+            params={"fields": "id,status,type"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        full = client.get(f"/api/notifications/{notification_data['user_id']}").json()
+        assert data["total"] == full["total"]
+        assert data["total"] >= TEST_MIN_NOTIFICATIONS_COUNT
+        for projected, item in zip(data["notifications"], full["notifications"]):
+            assert list(projected) == ["id", "status", "type"]
+            assert projected == {
+                "id": item["id"], "status": item["status"], "type": item["type"]
+            }
+
+    def test_get_notifications_fields_with_status_filter(
+        self, client, notification_data
+    ):
+        """Тест, что фильтр по статусу работает вместе с выбором полей"""
+        client.post("/api/notifications", json=notification_data)
+
+        response = client.get(
+            f"/api/notifications/{notification_data['user_id']}",
+            params={"fields": "status", "status": NotificationStatus.SENT.value}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        for notification in response.json()["notifications"]:
+            assert notification == {"status": NotificationStatus.SENT.value}
+
+    def test_get_notifications_unknown_field(self, client):
+        """Тест ошибки при запросе неизвестного поля"""
+        response = client.get(
+            f"/api/notifications/{TEST_USER_ID}",
+            params={"fields": "id,password"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "password" in response.json()["detail"]
+
+
+class TestConditionalGet:
+    """Тесты для ETag / If-None-Match"""
+
+    def test_not_modified_for_matching_etag(self, client):
+        """Тест ответа 304 при совпадении ETag"""
+        response = client.get(f"/api/notifications/{TEST_USER_ID_ETAG}")
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers["ETag"]
+
+        cached = client.get(
+            f"/api/notifications/{TEST_USER_ID_ETAG}",
+            headers={"If-None-Match": etag}
+        )
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert cached.headers["ETag"] == etag
+        assert cached.content == b""
+
+    def test_etag_changes_after_create(self, client):
+        """Тест, что создание уведомления меняет ETag"""
+        etag = client.get(f"/api/notifications/{TEST_USER_ID_ETAG}").headers["ETag"]
+
+        client.post("/api/notifications", json={
+            "user_id": TEST_USER_ID_ETAG,
+            "message": "ETag message",
+            "type": "telegram"
+        })
+
+        response = client.get(
+            f"/api/notifications/{TEST_USER_ID_ETAG}",
+            headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        assert response.json()["total"] >= TEST_MIN_NOTIFICATIONS_COUNT
+
+    def test_etag_depends_on_query(self, client):
+        """Тест, что разные представления истории имеют разные ETag"""
+        full = client.get(f"/api/notifications/{TEST_USER_ID_ETAG}")
+        projected = client.get(
+            f"/api/notifications/{TEST_USER_ID_ETAG}",
+            params={"fields": "id,status"}
+        )
+        assert full.headers["ETag"] != projected.headers["ETag"]
+
+        response = client.get(
+            f"/api/notifications/{TEST_USER_ID_ETAG}",
+            params={"fields": "id,status"},
+            headers={"If-None-Match": full.headers["ETag"]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+
+class TestNotificationLookup:
+    """Тесты для массовой проверки статусов"""
+
+    def test_lookup_by_ids(self, client, notification_data):
+        """Тест получения статусов в порядке запроса и списка ненайденных ID"""
+        created_ids = [
+            client.post("/api/notifications", json=notification_data).json()["id"]
+            for _ in range(2)
+        ]
+        missing_id = max(created_ids) + 1_000_000
+
+        response = client.post("/api/notifications/lookup", json={
+            "ids": [created_ids[1], missing_id, created_ids[0], created_ids[1]]
+        })
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert [item["id"] for item in data["notifications"]] == [
+            created_ids[1], created_ids[0]
+        ]
+        assert data["missing"] == [missing_id]
+        for item in data["notifications"]:
+            assert set(item) == {
+                "id", "user_id", "type", "status", "attempts", "updated_at"
+            }
+            assert item["user_id"] == notification_data["user_id"]
+
+    def test_lookup_limits(self, client):
+        """Тест ограничений на количество ID"""
+        empty = client.post("/api/notifications/lookup", json={"ids": []})
+        assert empty.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        too_many = client.post("/api/notifications/lookup", json={
+            "ids": list(range(settings.BULK_LOOKUP_MAX_IDS + 1))
+        })
+        assert too_many.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestNotificationStats:
+    """Тесты для статистики уведомлений"""
+
+    def test_stats_empty_user(self, client):
+        """Тест статистики пользователя без уведомлений"""
+        response = client.get(f"/api/notifications/{TEST_USER_ID_3}/stats")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["user_id"] == TEST_USER_ID_3
+        assert data["total"] == TEST_EMPTY_NOTIFICATIONS_COUNT
+        assert data["counters"] == []
+        assert set(data["by_status"]) == {item.value for item in NotificationStatus}
+
+    def test_stats_follow_created_notifications(self, client):
+        """Тест, что счетчики увеличиваются при создании и согласованы между собой"""
+        before = client.get(f"/api/notifications/{TEST_USER_ID_STATS}/stats").json()
+
+        for notification_type in ("telegram", "email"):
+            response = client.post("/api/notifications", json={
+                "user_id": TEST_USER_ID_STATS,
+                "message": "Stats message",
+                "type": notification_type
+            })
+            assert response.status_code == status.HTTP_201_CREATED
+
+        response = client.get(f"/api/notifications/{TEST_USER_ID_STATS}/stats")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert data["total"] == before["total"] + 2
+        assert data["by_type"]["telegram"] == before["by_type"]["telegram"] + 1
+        assert data["by_type"]["email"] == before["by_type"]["email"] + 1
+        assert sum(data["by_status"].values()) == data["total"]
+        assert sum(item["count"] for item in data["counters"]) == data["total"]
+
+        history = client.get(f"/api/notifications/{TEST_USER_ID_STATS}").json()
+        assert history["total"] == data["total"]
+        for status_value, count in data["by_status"].items():
+            assert count == sum(
+                1 for item in history["notifications"]
+                if item["status"] == status_value
+            )
+
+
+class TestRetention:
+    """Тесты для очистки и архивации истории"""
+
+    def test_purge_archives_and_removes_final_notifications(
+        self, client, tmp_path
+    ):
+        """Тест, что завершенные уведомления переносятся в архив пачками"""
+        for index in range(3):
+            response = client.post("/api/notifications", json={
+                "user_id": TEST_USER_ID_RETENTION,
+                "message": f"Retention message {index}",
+                "type": "telegram"
+            })
+            assert response.status_code == status.HTTP_201_CREATED
+
+        live = client.get(f"/api/notifications/{TEST_USER_ID_RETENTION}").json()
+        final_ids = {
+            item["id"] for item in live["notifications"]
+            if item["status"] != NotificationStatus.PENDING.value
+        }
+        assert final_ids
+
+        purged = RetentionService.purge(
+            cutoff=datetime.now() + timedelta(minutes=1),
+            user_id=TEST_USER_ID_RETENTION,
+            batch_size=1,
+            archive_dir=str(tmp_path)
+        )
+        assert purged == len(final_ids)
+
+        remaining = client.get(
+            f"/api/notifications/{TEST_USER_ID_RETENTION}"
+        ).json()
+        assert not final_ids & {item["id"] for item in remaining["notifications"]}
+
+        stats = client.get(f"/api/notifications/{TEST_USER_ID_RETENTION}/stats")
+        assert stats.json()["total"] == remaining["total"]
+
+        archived = RetentionService.read_archived(
+            user_id=TEST_USER_ID_RETENTION, archive_dir=str(tmp_path)
+        )
+        assert {item["id"] for item in archived} == final_ids
+        assert all(item["user_id"] == TEST_USER_ID_RETENTION for item in archived)
+
+    def test_purge_keeps_recent_notifications(self, client, tmp_path):
+        """Тест, что уведомления новее границы не удаляются"""
+        purged = RetentionService.purge(
+            cutoff=datetime.now() - timedelta(days=365 * 100),
+            archive_dir=str(tmp_path)
+        )
+        assert purged == TEST_EMPTY_NOTIFICATIONS_COUNT
+        assert RetentionService.read_archived(
+            user_id=TEST_USER_ID, archive_dir=str(tmp_path)
+        ) == []
+
+
 class TestHealthEndpoints:
     """Тесты для health check endpoints"""
     def test_root_endpoint(self, client):
@@ -0,0 +1,139 @@
+"""Тесты для профилирования по требованию"""
+import marshal
+import pstats
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from src.core import profiling as profiling_module
+from src.core.profiling import (
+    ProfiledRoute,
+    ProfilingMiddleware,
+    ProfileStore,
+    RequestProfile,
+    SamplingProfiler,
+    profile_store
+)
+
+ADMIN_TOKEN = "test-admin-token"
+
+
+def busy_handler() -> dict:
+    total = 0
+    for index in range(10000):
+        total += index
+    return {"total": total}
+
+
+class TestSamplingProfiler:
+    """Тесты статистического профилировщика"""
+
+    def test_collapsed_and_pstats(self):
+        """Тест форматов collapsed stacks и pstats"""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(
+                SamplingProfiler().sample, duration=0.05, interval=0.001
+            )
+            while not future.done():
+                busy_handler()
+            result = future.result()
+        assert result.samples > 0
+
+        collapsed = result.collapsed()
+        assert "busy_handler" in collapsed
+        stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+        assert stack.startswith("MainThread;")
+        assert int(count) > 0
+
+        stats = marshal.loads(result.dump_pstats())
+        assert stats
+        cc, nc, tt, ct, callers = next(iter(stats.values()))
+        assert ct >= tt >= 0
+
+    def test_single_session(self):
+        """Тест, что одновременно работает только один сеанс"""
+        profiler = SamplingProfiler()
+        with profiler._lock:
+            assert profiler.sample(duration=0.01, interval=0.001) is None
+
+
+class TestProfileStore:
+    """Тесты хранилища профилей"""
+
+    def test_capacity(self):
+        """Тест вытеснения самых старых профилей"""
+        store = ProfileStore(capacity=2)
+        for index in range(3):
+            request_profile = RequestProfile(str(index), "GET", "/")
+            request_profile.finish(0.0)
+            store.add(request_profile)
+        assert [item["id"] for item in store.list()] == ["2", "1"]
+        assert store.get("0") is None
+
+
+class TestProfilingMiddleware:
+    """Тесты профилирования отдельных запросов"""
+
+    def make_client(self, monkeypatch) -> TestClient:
+        monkeypatch.setattr(profiling_module.settings, "PROFILING_ENABLED", True)
+        monkeypatch.setattr(
+            profiling_module.settings, "PROFILING_ADMIN_TOKEN", ADMIN_TOKEN
+        )
+        app = FastAPI()
+        app.router.route_class = ProfiledRoute
+        app.get("/busy")(busy_handler)
+        return TestClient(ProfilingMiddleware(app))
+
+    def test_profiles_sync_handler(self, monkeypatch):
+        """Тест профиля синхронного обработчика из пула потоков"""
+        client = self.make_client(monkeypatch)
+        response = client.get(
+            "/busy",
+            headers={"X-Profile": "1", "X-Admin-Token": ADMIN_TOKEN}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        request_profile = profile_store.get(response.headers["X-Profile-Id"])
+        assert request_profile is not None
+
+        stats = pstats.Stats()
+        stats.stats = marshal.loads(request_profile.dump_pstats())
+        functions = {name for _, _, name in stats.stats}
+        assert "busy_handler" in functions
+
+    def test_requires_admin_token(self, monkeypatch):
+        """Тест, что без токена запрос не профилируется"""
+        client = self.make_client(monkeypatch)
+        response = client.get("/busy", headers={"X-Profile": "1"})
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Profile-Id" not in response.headers
+
+
+class TestAdminEndpoints:
+    """Тесты административных эндпоинтов"""
+
+    def test_hidden_when_disabled(self, client):
+        """Тест, что эндпоинты недоступны при выключенном профилировании"""
+        response = client.get(
+            "/api/admin/profiles", headers={"X-Admin-Token": ADMIN_TOKEN}
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_sample_endpoint(self, client, monkeypatch):
+        """Тест сэмплирования процесса через эндпоинт"""
+        monkeypatch.setattr(profiling_module.settings, "PROFILING_ENABLED", True)
+        monkeypatch.setattr(
+            profiling_module.settings, "PROFILING_ADMIN_TOKEN", ADMIN_TOKEN
+        )
+        response = client.post("/api/admin/profile/sample?duration=0.05")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        started_at = time.perf_counter()
+        response = client.post(
+            "/api/admin/profile/sample?duration=0.05",
+            headers={"X-Admin-Token": ADMIN_TOKEN}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert time.perf_counter() - started_at < 2
+        assert response.text.strip()
@@ -0,0 +1,103 @@
+"""Тесты для симулятора провайдеров"""
+import statistics
+
+from src.services.provider_simulator import (
+    LatencyDistribution,
+    ProviderSimulator,
+    SendOutcome
+)
+
+TEST_SEED = 42
+TEST_MEDIAN_LATENCY = 0.2
+TEST_SAMPLES = 5000
+
+
+class FakeClock:
+    """Управляемые часы для тестов"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_simulator(**kwargs) -> ProviderSimulator:
+    params = {
+        "name": "telegram",
+        "median_latency": TEST_MEDIAN_LATENCY,
+        "error_probability": 0.1,
+        "seed": TEST_SEED,
+    }
+    params.update(kwargs)
+    return ProviderSimulator(**params)
+
+
+class TestProviderSimulator:
+    """Тесты воспроизводимости и распределений симулятора"""
+
+    def test_same_seed_same_sequence(self):
+        """Тест, что одинаковый seed дает одинаковую последовательность"""
+        params = {
+            "distribution": LatencyDistribution.LOGNORMAL,
+            "outage_probability": 0.01,
+            "outage_length": 5,
+        }
+        first = make_simulator(**params)
+        second = make_simulator(**params)
+        assert [first.send() for _ in range(500)] == [
+            second.send() for _ in range(500)
+        ]
+        assert make_simulator(seed=TEST_SEED + 1, **params).send() != make_simulator(
+            **params
+        ).send()
+
+    def test_fixed_distribution(self):
+        """Тест фиксированной задержки (прежнее поведение)"""
+        simulator = make_simulator()
+        assert {simulator.send().latency for _ in range(100)} == {TEST_MEDIAN_LATENCY}
+
+    def test_lognormal_median(self):
+        """Тест медианы логнормального распределения"""
+        simulator = make_simulator(distribution=LatencyDistribution.LOGNORMAL)
+        latencies = [simulator.send().latency for _ in range(TEST_SAMPLES)]
+        assert abs(statistics.median(latencies) - TEST_MEDIAN_LATENCY) < 0.02
+        assert max(latencies) > TEST_MEDIAN_LATENCY * 3
+
+    def test_percentiles_long_tail(self):
+        """Тест перцентилей распределения с длинным хвостом"""
+        simulator = make_simulator(
+            distribution=LatencyDistribution.PERCENTILES,
+            tail_factors=(2.0, 5.0, 20.0)
+        )
+        latencies = sorted(simulator.send().latency for _ in range(TEST_SAMPLES))
+        p50 = latencies[int(TEST_SAMPLES * 0.5)]
+        p99 = latencies[int(TEST_SAMPLES * 0.99)]
+        assert abs(p50 - TEST_MEDIAN_LATENCY) < 0.02
+        assert TEST_MEDIAN_LATENCY * 4 < p99 < TEST_MEDIAN_LATENCY * 7
+
+    def test_outage_is_a_burst(self):
+        """Тест, что отказ длится outage_length вызовов подряд"""
+        simulator = make_simulator(
+            error_probability=0.0, outage_probability=1.0, outage_length=3
+        )
+        outcomes = [simulator.send().outcome for _ in range(3)]
+        assert outcomes == [SendOutcome.ERROR] * 3
+
+    def test_rate_limit(self):
+        """Тест ограничения частоты запросов"""
+        clock = FakeClock()
+        simulator = make_simulator(
+            error_probability=0.0,
+            rate_limit_per_second=2.0,
+            rate_limit_retry_after=0.5,
+            clock=clock
+        )
+        results = [simulator.send() for _ in range(3)]
+        assert [result.outcome for result in results] == [
+            SendOutcome.DELIVERED, SendOutcome.DELIVERED, SendOutcome.RATE_LIMITED
+        ]
+        assert results[-1].retry_after == 0.5
+
+        clock.now += 1.0
+        assert simulator.send().outcome == SendOutcome.DELIVERED
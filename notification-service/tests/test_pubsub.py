@@ -0,0 +1,132 @@
+"""Тесты для внутрипроцессной шины событий"""
+import asyncio
+import threading
+
+from src.core import settings as settings_module
+from src.core.pubsub import EventBus
+from src.routers import notifications as router_module
+from src.routers.notifications import format_sse, stream_notification_events
+from src.core.constants import (
+    TEST_USER_ID,
+    TEST_USER_ID_2,
+    TEST_USER_ID_EVENTS,
+    TEST_DELAY,
+    TEST_MESSAGE_CODE
+)
+from src.schemas.notification import NotificationCreate
+from src.services import notification_service as service_module
+from src.services.notification_service import NotificationService
+
+
+class TestEventBus:
+    """Тесты fan-out и ограничения буферов подписок"""
+
+    def test_publish_reaches_only_user_subscribers(self):
+        """Тест, что событие получают только подписчики пользователя"""
+        async def scenario():
+            bus = EventBus()
+            first = bus.subscribe(TEST_USER_ID)
+            second = bus.subscribe(TEST_USER_ID)
+            other = bus.subscribe(TEST_USER_ID_2)
+
+            delivered = bus.publish(TEST_USER_ID, {"id": 1, "status": "sent"})
+
+            assert delivered == 2
+            assert await first.get(TEST_DELAY) == {"id": 1, "status": "sent"}
+            assert await second.get(TEST_DELAY) == {"id": 1, "status": "sent"}
+            assert await other.get(TEST_DELAY) is None
+
+        asyncio.run(scenario())
+
+    def test_full_buffer_drops_oldest_events(self):
+        """Тест, что переполненный буфер не блокирует издателя"""
+        async def scenario():
+            bus = EventBus()
+            subscription = bus.subscribe(TEST_USER_ID, maxsize=2)
+
+            for event_id in range(5):
+                bus.publish(TEST_USER_ID, {"id": event_id})
+
+            assert subscription.dropped == 3
+            assert (await subscription.get(TEST_DELAY))["id"] == 3
+            assert (await subscription.get(TEST_DELAY))["id"] == 4
+
+        asyncio.run(scenario())
+
+    def test_unsubscribe_and_cross_thread_publish(self):
+        """Тест публикации из другого потока и отписки"""
+        async def scenario():
+            bus = EventBus()
+            subscription = bus.subscribe(TEST_USER_ID)
+            assert bus.subscriber_count == 1
+
+            publisher = threading.Thread(
+                target=bus.publish, args=(TEST_USER_ID, {"id": 7})
+            )
+            publisher.start()
+            publisher.join()
+            assert (await subscription.get(TEST_DELAY * 10))["id"] == 7
+
+            bus.unsubscribe(subscription)
+            assert bus.subscriber_count == 0
+            assert bus.publish(TEST_USER_ID, {"id": 8}) == 0
+
+        asyncio.run(scenario())
+
+    def test_format_sse(self):
+        """Тест формата события text/event-stream"""
+        assert format_sse("status", {"id": 1}, event_id=1) == (
+            'event: status\nid: 1\ndata: {"id": 1}\n\n'
+        )
+
+
+class TestEventStream:
+    """Тесты SSE потока /{user_id}/events"""
+
+    def test_stream_receives_sent_event(self, client, monkeypatch):
+        """Тест, что подписчик потока получает событие отправки уведомления"""
+        monkeypatch.setattr(settings_module.settings, "BREAKER_ENABLED", False)
+        event_bus = router_module.event_bus
+
+        def create_notification() -> int:
+            with service_module.db_manager.get_session() as session:
+                [notification_id] = NotificationService.insert_many(session, [
+                    NotificationCreate(
+                        user_id=TEST_USER_ID_EVENTS,
+                        message=f"Ваш код: {TEST_MESSAGE_CODE}",
+                        type="telegram"
+                    )
+                ])
+                session.commit()
+            return notification_id
+
+        async def scenario():
+            subscribers = event_bus.subscriber_count
+            response = await stream_notification_events(TEST_USER_ID_EVENTS)
+            assert response.media_type == "text/event-stream"
+            stream = response.body_iterator
+
+            # Первое чтение потока создает подписку
+            next_chunk = asyncio.ensure_future(stream.__anext__())
+            while event_bus.subscriber_count == subscribers:
+                await asyncio.sleep(0)
+
+            notification_id = await asyncio.to_thread(create_notification)
+            # Последняя попытка без симулятора провайдера всегда успешна
+            status = await NotificationService.send_notification(
+                notification_id,
+                service_module.NotificationType.TELEGRAM,
+                settings_module.settings.RETRY_MAX_ATTEMPTS
+            )
+            assert status == service_module.NotificationStatus.SENT
+
+            chunk = await asyncio.wait_for(next_chunk, TEST_DELAY * 10)
+            while chunk.startswith(":"):
+                chunk = await asyncio.wait_for(stream.__anext__(), TEST_DELAY * 10)
+            assert chunk.startswith(f"event: status\nid: {notification_id}\n")
+            assert '"status": "sent"' in chunk
+
+            await stream.aclose()
+            assert event_bus.subscriber_count == subscribers
+
+        asyncio.run(scenario())
@@ -0,0 +1,110 @@
+"""Тесты для ограничения частоты создания уведомлений"""
+from fastapi import status
+
+from src.core import rate_limiter as rate_limiter_module
+from src.core.constants import TEST_USER_ID_RATE_LIMIT, TEST_MESSAGE_CODE
+from src.core.rate_limiter import SlidingWindowRateLimiter
+
+
+class FakeClock:
+    """Управляемые часы для тестов"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_limiter(clock: FakeClock, max_keys: int = 100) -> SlidingWindowRateLimiter:
+    return SlidingWindowRateLimiter(
+        window_seconds=10.0,
+        max_keys=max_keys,
+        shards=4,
+        clock=clock
+    )
+
+
+class TestSlidingWindowRateLimiter:
+    """Тесты sliding window счетчика"""
+
+    def test_rejects_over_limit(self):
+        """Тест отклонения запросов сверх лимита с паузой до конца окна"""
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+        for _ in range(3):
+            assert limiter.hit("user", 3)[0]
+
+        allowed, retry_after = limiter.hit("user", 3)
+        assert not allowed
+        assert 0 < retry_after <= 10.0
+
+    def test_keys_are_independent(self):
+        """Тест, что лимиты разных ключей не влияют друг на друга"""
+        limiter = make_limiter(FakeClock())
+        assert limiter.hit((1, "email"), 1)[0]
+        assert not limiter.hit((1, "email"), 1)[0]
+        assert limiter.hit((1, "telegram"), 1)[0]
+        assert limiter.hit((2, "email"), 1)[0]
+
+    def test_previous_window_is_weighted(self):
+        """Тест, что предыдущее окно учитывается пропорционально перекрытию"""
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+        for _ in range(4):
+            assert limiter.hit("user", 4)[0]
+
+        # Середина следующего окна: оценка 4 * 0.5 = 2, доступно еще 2
+        clock.now += 15.0
+        assert limiter.hit("user", 4)[0]
+        assert limiter.hit("user", 4)[0]
+        assert not limiter.hit("user", 4)[0]
+
+        # Через два окна история полностью забыта
+        clock.now += 20.0
+        for _ in range(4):
+            assert limiter.hit("user", 4)[0]
+
+    def test_reset_clears_counters(self):
+        """Тест, что сброс снимает ограничение со всех ключей"""
+        limiter = make_limiter(FakeClock())
+        assert limiter.hit("user", 1)[0]
+        assert not limiter.hit("user", 1)[0]
+
+        limiter.reset()
+        assert len(limiter) == 0
+        assert limiter.hit("user", 1)[0]
+
+    def test_memory_is_bounded(self):
+        """Тест вытеснения давно неиспользуемых ключей"""
+        limiter = make_limiter(FakeClock(), max_keys=8)
+        for user_id in range(1000):
+            limiter.hit(user_id, 5)
+        assert len(limiter) <= 8
+
+
+class TestCreateRateLimit:
+    """Тесты ограничения частоты на эндпоинте создания"""
+
+    def test_create_returns_429(self, client, monkeypatch):
+        """Тест ответа 429 с Retry-After при превышении лимита"""
+        monkeypatch.setattr(rate_limiter_module.settings, "RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(
+            rate_limiter_module.settings, "RATE_LIMIT_EMAIL_PER_WINDOW", 2
+        )
+        payload = {
+            "user_id": TEST_USER_ID_RATE_LIMIT,
+            "message": TEST_MESSAGE_CODE,
+            "type": "email"
+        }
+        for _ in range(2):
+            response = client.post("/api/notifications", json=payload)
+            assert response.status_code == status.HTTP_201_CREATED
+
+        response = client.post("/api/notifications", json=payload)
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers["Retry-After"]) >= 1
+
+        payload["type"] = "telegram"
+        response = client.post("/api/notifications", json=payload)
+        assert response.status_code == status.HTTP_201_CREATED
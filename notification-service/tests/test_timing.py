@@ -0,0 +1,135 @@
+"""Тесты для учета времени доставки"""
+from datetime import datetime, timedelta
+
+from fastapi import status
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+
+from src.core.constants import TEST_USER_ID, TEST_MESSAGE_CODE
+from src.models.notification import (
+    Notification,
+    NotificationStatus,
+    NotificationType
+)
+from src.models.notification_timing import NotificationTiming
+from src.services.timing_service import (
+    LifecycleTiming,
+    TimingService,
+    distribution,
+    percentile
+)
+
+
+class TestPercentiles:
+    """Тесты расчета перцентилей"""
+
+    def test_nearest_rank(self):
+        """Тест перцентилей по методу nearest-rank"""
+        values = list(range(1, 101))
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.99) == 99
+        assert percentile(values, 0.999) == 100
+        assert percentile([7], 0.5) == 7
+
+    def test_distribution(self):
+        """Тест сводки распределения"""
+        assert distribution([]) is None
+        result = distribution([300, 100, 200])
+        assert result["p50"] == 200
+        assert result["max"] == 300
+
+
+class TestTimingRecord:
+    """Тесты формирования записи о времени доставки"""
+
+    def test_build_record(self):
+        """Тест расчета ожидания, времени доставки и длительностей попыток"""
+        created_at = datetime(2024, 1, 1, 12, 0, 0)
+        notification = Notification(
+            id=1,
+            user_id=TEST_USER_ID,
+            message=TEST_MESSAGE_CODE,
+            type=NotificationType.TELEGRAM,
+            status=NotificationStatus.SENT,
+            created_at=created_at
+        )
+        timing = LifecycleTiming(
+            dispatch_started_at=created_at + timedelta(milliseconds=50),
+            first_attempt_at=created_at + timedelta(milliseconds=60),
+            attempt_durations=[0.2, 0.25]
+        )
+
+        record = TimingService.build_record(
+            notification, timing, created_at + timedelta(seconds=1.5)
+        )
+        assert record.queue_wait_ms == 50
+        assert record.end_to_end_ms == 1500
+        assert record.attempt_durations_ms == "200,250"
+        assert record.type == NotificationType.TELEGRAM
+
+
+class TestLatencySummary:
+    """Тесты агрегации времени доставки"""
+
+    def test_counts_cover_window_and_percentiles_use_sample(self):
+        """Тест, что счетчики считаются по окну, а перцентили - по выборке"""
+        engine = create_engine("sqlite:///:memory:")
+        with engine.begin() as connection:
+            connection.execute(CreateTable(NotificationTiming.__table__))
+        now = datetime.now()
+        outcomes = [
+            (NotificationStatus.SENT, 100),
+            (NotificationStatus.SENT, 200),
+            (NotificationStatus.FAILED, 900),
+            (NotificationStatus.SENT, 300),
+            (NotificationStatus.SENT, 400),
+        ]
+        with Session(engine) as session:
+            for index, (notification_status, end_to_end_ms) in enumerate(outcomes):
+                session.add(NotificationTiming(
+                    notification_id=index + 1,
+                    type=NotificationType.TELEGRAM,
+                    status=notification_status,
+                    dispatch_started_at=now,
+                    completed_at=now + timedelta(seconds=index),
+                    queue_wait_ms=index,
+                    end_to_end_ms=end_to_end_ms
+                ))
+            session.commit()
+
+            summary = TimingService.latency_summary(
+                session, now - timedelta(minutes=1), threshold_ms=250, sample_size=2
+            )
+
+        telegram = summary["telegram"]
+        assert (telegram["count"], telegram["sent"], telegram["failed"]) == (5, 4, 1)
+        assert telegram["within_threshold"] == 2 / 5
+        # Выборка - две последние записи
+        assert telegram["sample_size"] == 2
+        assert telegram["end_to_end_ms"]["p50"] == 300
+        assert telegram["queue_wait_ms"]["max"] == 4
+
+
+class TestLatencyEndpoint:
+    """Тесты эндпоинта перцентилей времени доставки"""
+
+    def test_latency_after_delivery(self, client):
+        """Тест, что отправленное уведомление попадает в перцентили канала"""
+        response = client.post("/api/notifications", json={
+            "user_id": TEST_USER_ID,
+            "message": f"Ваш код: {TEST_MESSAGE_CODE}",
+            "type": "telegram"
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = client.get("/api/metrics/latency?threshold_ms=60000")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["threshold_ms"] == 60000
+
+        telegram = data["channels"]["telegram"]
+        assert telegram["count"] >= 1
+        assert telegram["count"] == telegram["sent"] + telegram["failed"]
+        assert telegram["end_to_end_ms"]["p50"] >= telegram["queue_wait_ms"]["p50"]
+        assert 0 < telegram["within_threshold"] <= 1